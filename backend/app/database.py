@@ -1,25 +1,85 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.utils.db_pool import InstrumentedQueuePool, instrument_engine
+from app.utils.metrics import DB_READ_ROUTES
+from app.utils.query_stats import track_queries
+from app.utils.read_replicas import ReadYourWritesWindow, ReplicaSet, bearer_user_id
+
+def _create_engine(url: str, name: str):
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        # Replace connections before the server or a proxy drops them as idle,
+        # instead of pinging on every checkout; a connection that died anyway
+        # fails its query and the pool discards every older connection
+        pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING
+    )
+    instrument_engine(engine, name)
+    track_queries(engine)
+    return engine
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+engine = _create_engine(settings.DATABASE_URL, "primary")
+
+# Read replicas for read-only endpoints (none configured: everything uses the primary)
+replica_set = ReplicaSet(
+    [
+        _create_engine(url, f"replica-{i}")
+        for i, url in enumerate(u.strip() for u in settings.DATABASE_REPLICA_URLS.split(",") if u.strip())
+    ],
+    selection=settings.DATABASE_REPLICA_SELECTION,
+    max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_seconds=settings.DATABASE_REPLICA_CHECK_SECONDS
+)
+read_your_writes = ReadYourWritesWindow(
+    prefix="db:recent-write",
+    window_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_write(session, flush_context):
+    session.info["wrote"] = True
+
 # Create base class for models
 Base = declarative_base()
 
 # Dependency to get database session
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    try:
+        yield db
+    finally:
+        # ReadYourWritesMiddleware keeps this user's reads on the primary for a while
+        if db.info.get("wrote"):
+            request.state.db_wrote = True
+        db.close()
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only endpoints
+
+    Uses a replica when one is configured and current enough, except for
+    users who wrote within DATABASE_READ_YOUR_WRITES_SECONDS, whose reads
+    go to the primary so they see their own changes.
+    """
+    bind = None
+    if replica_set.engines:
+        user_id = bearer_user_id(request.headers.get("authorization"))
+        if not (user_id and await read_your_writes.is_recent(user_id)):
+            bind = replica_set.choose()
+    DB_READ_ROUTES.labels(target="replica" if bind is not None else "primary").inc()
+
+    db = SessionLocal(bind=bind) if bind is not None else SessionLocal()
     try:
         yield db
     finally:
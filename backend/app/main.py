@@ -1,28 +1,108 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, users, points, stores, chatbot, reviews, oauth
-from app.database import engine, Base
+from app.routers import auth, users, points, stores, chatbot, reviews, oauth, admin
+from app.database import engine, replica_set
+from app.config import settings
+from app.middleware.rate_limit import LoginRateLimitMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.utils.redis_client import redis_connector
+from app.utils.schema_version import check_schema_version
+from app.services.http_client import provider_http
+from app.services.google_id_token import google_jwks
+from app.services.oauth_providers import GOOGLE_CLIENT_IDS
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.models.user import User  # Import all models here
 from app.models.review import Review, ReviewReply, ReviewHelpful  # Import review models
+from app.models.sheets_outbox import SheetsOutbox
+from app.models.sheets_row_index import SheetsRowIndex
+from app.services.sheets_outbox import sheets_outbox_worker
+from app.services.google_sheets import sheets_service
+from app.services.chatbot import get_chatbot
 
 app = FastAPI(
     title="OMNIPASS API",
     description="Universal Points Platform for Tourists in South Korea",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Create database tables on startup
 @app.on_event("startup")
 async def startup_event():
-    Base.metadata.create_all(bind=engine)
+    # Tables are created by migrations at deploy time; only check the revision here
+    await asyncio.to_thread(check_schema_version, engine, settings.DATABASE_REQUIRE_CURRENT_SCHEMA)
+    await provider_http.start()
+    # Warm the Google signing keys so the first ID token login skips the fetch
+    if GOOGLE_CLIENT_IDS:
+        asyncio.create_task(google_jwks.refresh())
+    sheets_outbox_worker.start()
+    replica_set.start()
+    # Build slow-to-import clients in the background instead of at import time
+    if sheets_service.enabled:
+        asyncio.create_task(_warm_up("Google Sheets", sheets_service.ensure_initialized))
+    if settings.CHATBOT_CACHE_PREWARM:
+        asyncio.create_task(_prewarm_chatbot_cache())
+    else:
+        asyncio.create_task(_warm_up("Chatbot", get_chatbot))
+
+async def _warm_up(name: str, initialize):
+    try:
+        await asyncio.to_thread(initialize)
+    except Exception as e:
+        print(f"[Startup] {name} warm-up failed: {e}")
+
+async def _prewarm_chatbot_cache():
+    try:
+        chatbot = await asyncio.to_thread(get_chatbot)
+        await chatbot.prewarm()
+    except Exception as e:
+        print(f"[Startup] Chatbot cache pre-warm failed: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await sheets_outbox_worker.stop()
+    await replica_set.stop()
+    await provider_http.close()
+    await redis_connector.close()
+
+# Login rate limiting - runs before the request reaches the database
+if settings.LOGIN_RATE_LIMIT_ENABLED:
+    app.add_middleware(LoginRateLimitMiddleware)
+
+# Keep a user's reads on the primary right after their writes
+if replica_set.engines:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-request SQL count and time (Server-Timing header, slow-query log, query budgets)
+app.add_middleware(QueryStatsMiddleware)
+
+# Opt-in profiling of single requests (X-Profile: 1 with the admin key)
+if settings.ADMIN_API_KEY:
+    app.add_middleware(ProfilingMiddleware)
+
+# gzip/brotli for JSON responses above COMPRESSION_MIN_BYTES
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Request count, latency and size per route template (wraps everything but CORS)
+if settings.HTTP_METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # CORS middleware - Allow all origins in development
+# Added last so it is outermost and responses from the other middleware
+# (such as the login limiter's 429) carry CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins in development
     allow_credentials=False,  # Must be False when allow_origins is ["*"]
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 # Include routers
@@ -33,6 +113,7 @@ app.include_router(points.router, prefix="/api/points", tags=["Points"])
 app.include_router(stores.router, prefix="/api/stores", tags=["Stores"])
 app.include_router(chatbot.router, prefix="/api/chatbot", tags=["Chatbot"])
 app.include_router(reviews.router, prefix="/api/reviews", tags=["Reviews"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"], include_in_schema=False)
 
 @app.get("/")
 async def root():
@@ -45,3 +126,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this worker"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
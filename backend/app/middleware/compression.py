@@ -0,0 +1,92 @@
+"""
+Response compression middleware
+Compresses JSON responses above COMPRESSION_MIN_BYTES with the best
+encoding the client accepts, reusing cached compressed bodies
+"""
+import asyncio
+from starlette.datastructures import MutableHeaders
+from app.config import settings
+from app.utils.compression import choose_encoding, compressed_bodies
+from app.utils.metrics import (
+    HTTP_COMPRESSION_CACHE, HTTP_COMPRESSION_CPU_SECONDS,
+    HTTP_COMPRESSION_INPUT_BYTES, HTTP_COMPRESSION_SAVED_BYTES
+)
+from app.middleware.metrics import UNMATCHED_ROUTE
+
+# Bodies at least this large are compressed in a worker thread, off the event loop
+OFFLOAD_MIN_BYTES = 256 * 1024
+
+def _is_json(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing complete JSON response bodies
+
+    Only single-message bodies are compressed: streaming responses (the
+    chatbot SSE stream) pass through untouched, as do responses that are
+    already encoded and HEAD requests. Eligible JSON responses always get
+    "Vary: Accept-Encoding" so shared caches keep the variants apart.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            if "content-encoding" in headers or not _is_json(headers.get("content-type", "")):
+                await send(start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if encoding is None or message.get("more_body", False) or len(body) < settings.COMPRESSION_MIN_BYTES:
+                await send({**start, "headers": headers.raw})
+                await send(message)
+                return
+
+            if len(body) >= OFFLOAD_MIN_BYTES:
+                compressed, hit, cpu_seconds = await asyncio.to_thread(compressed_bodies.compress, body, encoding)
+            else:
+                compressed, hit, cpu_seconds = compressed_bodies.compress(body, encoding)
+
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            HTTP_COMPRESSION_CACHE.labels(result="hit" if hit else "miss").inc()
+            HTTP_COMPRESSION_CPU_SECONDS.labels(route=route, encoding=encoding).inc(cpu_seconds)
+            if len(compressed) >= len(body):
+                await send({**start, "headers": headers.raw})
+                await send(message)
+                return
+
+            HTTP_COMPRESSION_INPUT_BYTES.labels(route=route, encoding=encoding).inc(len(body))
+            HTTP_COMPRESSION_SAVED_BYTES.labels(route=route, encoding=encoding).inc(len(body) - len(compressed))
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            await send({**start, "headers": headers.raw})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
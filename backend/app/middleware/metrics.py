@@ -0,0 +1,75 @@
+"""
+HTTP metrics middleware
+Records request count, latency, response size and in-flight requests per
+route template for the /metrics endpoint
+"""
+import time
+from typing import Dict, Tuple
+from app.utils.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_LATENCY, HTTP_REQUESTS, HTTP_RESPONSE_SIZE
+
+# Label for requests that matched no route, so unknown paths cannot grow the label set
+UNMATCHED_ROUTE = "unmatched"
+# Methods recorded under their own name; anything else a client sends is "other"
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+OTHER_METHOD = "other"
+
+# labels() validates and locks on every call; the children are looked up once per label set
+_children: Dict[Tuple[str, str, int], tuple] = {}
+_in_flight: Dict[str, object] = {}
+
+def _route_children(method: str, route: str, status: int) -> tuple:
+    key = (method, route, status)
+    children = _children.get(key)
+    if children is None:
+        children = _children[key] = (
+            HTTP_REQUESTS.labels(method=method, route=route, status=str(status)),
+            HTTP_REQUEST_LATENCY.labels(method=method, route=route),
+            HTTP_RESPONSE_SIZE.labels(method=method, route=route),
+        )
+    return children
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware labelling metrics by route template
+
+    The template (e.g. /api/reviews/{review_id}) is read from the route the
+    router stored in the scope, so IDs never become label values. Latency
+    runs until the last body chunk is sent, which for streaming responses is
+    the end of the stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else OTHER_METHOD
+        status = 500
+        size = 0
+        in_flight = _in_flight.get(method)
+        if in_flight is None:
+            in_flight = _in_flight[method] = HTTP_IN_FLIGHT.labels(method=method)
+        in_flight.inc()
+        start = time.perf_counter()
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            in_flight.dec()
+            requests, latency, response_size = _route_children(
+                method, getattr(scope.get("route"), "path", UNMATCHED_ROUTE), status
+            )
+            requests.inc()
+            latency.observe(time.perf_counter() - start)
+            response_size.observe(size)
@@ -0,0 +1,54 @@
+"""
+Per-request profiling middleware
+Profiles a single request when it carries "X-Profile: 1" together with a
+valid X-Admin-Key, and stores the result for /api/admin/profiles/{id}
+"""
+import asyncio
+from app.config import settings
+from app.utils.auth import verify_admin_key
+from app.utils.profiler import ProfilerBusy, SamplingProfiler, profile_store
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware sampling the worker while one request runs
+
+    The response gets an X-Profile-Id header naming the stored profile. The
+    whole worker is sampled, so concurrent requests on the same event loop
+    show up too. Requests without a valid key, or arriving while another
+    profile is running, are served unprofiled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") != b"1" or not verify_admin_key(headers.get(b"x-admin-key", b"").decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            profiler = SamplingProfiler.acquire(settings.PROFILER_INTERVAL_MS / 1000)
+        except ProfilerBusy:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profile_store.new_id()
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile = await asyncio.to_thread(profiler.stop)
+            profile["name"] = f"{scope['method']} {scope['path']}"
+            profile_store.add(profile, profile_id)
+            print(f"[Profiler] Profiled {profile['name']} for {profiler.duration * 1000:.0f}ms (profile {profile_id})")
@@ -0,0 +1,43 @@
+"""
+Query statistics middleware
+Collects per-request SQL statistics and reports them in a Server-Timing header
+to admin callers (or to everyone when SERVER_TIMING_ENABLED is set, e.g. locally)
+"""
+from app.config import settings
+from app.utils.auth import verify_admin_key
+from app.utils.query_stats import current_stats, end_request, start_request
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware scoping QueryStats to each HTTP request
+
+    The header carries the statements issued before the response started;
+    for streaming responses, later queries are not included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_request(scope)
+        stats = current_stats()
+        # Query counts and DB time describe our internals; only show them to operators
+        report = settings.SERVER_TIMING_ENABLED or verify_admin_key(
+            dict(scope["headers"]).get(b"x-admin-key", b"").decode("latin-1")
+        )
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and report:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token)
@@ -0,0 +1,72 @@
+"""
+Login rate limiting middleware
+Rejects excess login attempts before any database lookup or password hashing
+"""
+import json
+from starlette.responses import JSONResponse
+from app.utils.rate_limit import email_limit_key, login_limiter
+
+# Login bodies are tiny; anything larger is not worth parsing for an email
+MAX_BODY_BYTES = 4096
+
+class LoginRateLimitMiddleware:
+    """
+    Pure ASGI middleware limiting POST requests to the login endpoint
+    per client IP, per email and globally
+    """
+
+    def __init__(self, app, path: str = "/api/auth/login"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        # Buffer the body so the email can be read, then replay it downstream
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        client = scope.get("client")
+        retry_after = await login_limiter.hit({
+            "ip": client[0] if client else "",
+            "email": _extract_email(body),
+            "global": "all",
+        })
+
+        if retry_after is not None:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many login attempts. Please try again later."},
+                headers={"Retry-After": str(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        replayed = False
+
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+def _extract_email(body: bytes) -> str:
+    """Best-effort email extraction; malformed bodies are left to request validation"""
+    if len(body) > MAX_BODY_BYTES:
+        return ""
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return ""
+    if not isinstance(email, str):
+        return ""
+    return email_limit_key(email)
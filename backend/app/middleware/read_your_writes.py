@@ -0,0 +1,34 @@
+"""
+Read-your-writes middleware
+After a request that wrote to the primary, keeps the user's reads off the
+replicas for a short window so they see their own changes
+"""
+from app.database import read_your_writes
+from app.utils.read_replicas import bearer_user_id
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware marking the caller as a recent writer
+
+    get_db flags requests whose session flushed changes; the mark is
+    recorded before the response starts so the client's next request
+    already sees it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        async def mark_writer(message):
+            if message["type"] == "http.response.start" and scope.get("state", {}).get("db_wrote"):
+                headers = dict(scope["headers"])
+                user_id = bearer_user_id(headers.get(b"authorization", b"").decode("latin-1"))
+                if user_id:
+                    await read_your_writes.mark(user_id)
+            await send(message)
+
+        await self.app(scope, receive, mark_writer)
@@ -1,10 +1,21 @@
 from app.models.user import User
 from app.models.point import PointTransaction, PointBalance
 from app.models.store import Store
+from app.models.mission import EcoMission, UserMission
+from app.models.review import Review, ReviewReply, ReviewHelpful
+from app.models.sheets_outbox import SheetsOutbox
+from app.models.sheets_row_index import SheetsRowIndex
 
 __all__ = [
     "User",
     "PointTransaction",
     "PointBalance",
     "Store",
+    "EcoMission",
+    "UserMission",
+    "Review",
+    "ReviewReply",
+    "ReviewHelpful",
+    "SheetsOutbox",
+    "SheetsRowIndex",
 ]
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Enum, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+import enum
+from app.database import Base
+
+class MissionType(str, enum.Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    SPECIAL = "special"
+
+class MissionStatus(str, enum.Enum):
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    EXPIRED = "expired"
+
+class EcoMission(Base):
+    __tablename__ = "eco_missions"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=False)
+    points = Column(Integer, nullable=False)
+    type = Column(Enum(MissionType), nullable=False)
+    requirements = Column(Text)  # JSON string for SQLite compatibility
+    expires_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class UserMission(Base):
+    __tablename__ = "user_missions"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    mission_id = Column(String, ForeignKey("eco_missions.id", ondelete="CASCADE"), nullable=False)
+    status = Column(Enum(MissionStatus), default=MissionStatus.ACTIVE, nullable=False)
+    progress = Column(Integer, default=0)
+    completed_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    mission = relationship("EcoMission")
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'mission_id', name='unique_user_mission'),
+        Index('idx_user_missions_user_id', 'user_id'),
+        Index('idx_user_missions_status', 'status'),
+    )
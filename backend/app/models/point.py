@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum, CheckConstraint, Index
 from datetime import datetime
 import uuid
 import enum
@@ -19,17 +18,26 @@ class TransactionSource(str, enum.Enum):
 class PointTransaction(Base):
     __tablename__ = "point_transactions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     amount = Column(Integer, nullable=False)
     type = Column(Enum(TransactionType), nullable=False)
     source = Column(Enum(TransactionSource), nullable=False)
     description = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('idx_point_transactions_user_id', 'user_id'),
+        Index('idx_point_transactions_created_at', created_at.desc()),
+    )
+
 class PointBalance(Base):
     __tablename__ = "point_balances"
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     balance = Column(Integer, default=0, nullable=False)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        CheckConstraint('balance >= 0', name='check_balance_non_negative'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Enum
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -30,6 +30,9 @@ class Review(Base):
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
         UniqueConstraint('user_id', 'entity_type', 'entity_id', name='unique_user_entity_review'),
+        Index('idx_reviews_entity', 'entity_type', 'entity_id'),
+        Index('idx_reviews_user_id', 'user_id'),
+        Index('idx_reviews_created_at', created_at.desc()),
     )
 
 class ReviewReply(Base):
@@ -48,6 +51,11 @@ class ReviewReply(Base):
     user = relationship("User", backref="review_replies")
     parent = relationship("ReviewReply", remote_side=[id], backref="child_replies")
 
+    __table_args__ = (
+        Index('idx_review_replies_review_id', 'review_id'),
+        Index('idx_review_replies_parent', 'parent_reply_id'),
+    )
+
 class ReviewHelpful(Base):
     __tablename__ = "review_helpful"
 
@@ -62,4 +70,5 @@ class ReviewHelpful(Base):
 
     __table_args__ = (
         UniqueConstraint('user_id', 'review_id', name='unique_user_review_helpful'),
+        Index('idx_review_helpful_review_id', 'review_id'),
     )
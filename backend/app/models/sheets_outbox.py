@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, Enum, Index
+from datetime import datetime
+import enum
+from app.database import Base
+
+class OutboxOperation(str, enum.Enum):
+    SYNC = "sync"  # Append a new user row
+    UPDATE = "update"  # Rewrite an existing user row (appends if missing)
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    DEAD = "dead"  # Gave up after too many attempts
+
+class SheetsOutbox(Base):
+    """Pending Google Sheets writes, committed together with the user change"""
+    __tablename__ = "sheets_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False, index=True)
+    operation = Column(Enum(OutboxOperation), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON user row data
+    status = Column(Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text)
+    claimed_until = Column(DateTime)  # Lease held by the worker sending this row
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_sheets_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
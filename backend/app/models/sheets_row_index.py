@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from datetime import datetime
+from app.database import Base
+
+class SheetsRowIndex(Base):
+    """Row number of each user in the Google Sheets user sheet"""
+    __tablename__ = "sheets_row_index"
+
+    user_id = Column(String, primary_key=True)
+    row_number = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Text, Enum
+from sqlalchemy import Column, String, Float, Text, Enum, Index
 import uuid
 import enum
 from app.database import Base
@@ -24,3 +24,8 @@ class Store(Base):
     images = Column(Text)  # JSON string for SQLite compatibility
     opening_hours = Column(String)
     contact = Column(String)
+
+    __table_args__ = (
+        Index('idx_stores_category', 'category'),
+        Index('idx_stores_location', 'latitude', 'longitude'),
+    )
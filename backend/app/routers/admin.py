@@ -0,0 +1,61 @@
+"""
+Admin endpoints (require ADMIN_API_KEY in the X-Admin-Key header)
+"""
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.utils.dependencies import require_admin
+from app.utils.profiler import ProfilerBusy, SamplingProfiler, profile_store
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+def _speedscope_response(profile: dict, profile_id: str) -> JSONResponse:
+    return JSONResponse(
+        profile,
+        headers={
+            "X-Profile-Id": profile_id,
+            "Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"',
+        },
+    )
+
+@router.post("/profile")
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(None, ge=1, le=1000),
+):
+    """
+    Sample every thread of this worker for `seconds` and return a speedscope profile
+
+    Only the worker that receives the request is profiled. Open the result
+    at https://www.speedscope.app.
+    """
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"seconds must be at most {settings.PROFILER_MAX_SECONDS:g}",
+        )
+    interval = (interval_ms or settings.PROFILER_INTERVAL_MS) / 1000
+
+    try:
+        profiler = SamplingProfiler.acquire(interval)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = await asyncio.to_thread(profiler.stop)
+
+    profile_id = profile_store.add(profile)
+    print(f"[Profiler] Sampled worker for {profiler.duration:.1f}s (profile {profile_id})")
+    return _speedscope_response(profile, profile_id)
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """A stored profile, including ones recorded through the X-Profile request header"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return _speedscope_response(profile, profile_id)
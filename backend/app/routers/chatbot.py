@@ -1,55 +1,208 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import time
+from contextlib import aclosing
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.database import get_db
-from app.services.chatbot import chatbot
+from app.services.chatbot import HELP_PROMPT, get_chatbot
+from app.services.conversation_store import conversation_store
+from app.utils.admission import (
+    PRIORITY_ANONYMOUS, PRIORITY_AUTHENTICATED, AdmissionRejected, chatbot_admission
+)
+from app.utils.dependencies import get_optional_user_id
+from app.utils.metrics import CHATBOT_STREAMS, CHATBOT_TIME_TO_FIRST_TOKEN
 
 router = APIRouter()
 
+async def _admit(request: Request, user_id: Optional[str]):
+    """
+    Wait for a chatbot slot; signed-in users go ahead of anonymous ones
+
+    Raises:
+        HTTPException: 429 with Retry-After if the request is shed
+    """
+    if user_id:
+        caller, priority = f"user:{user_id}", PRIORITY_AUTHENTICATED
+    else:
+        caller, priority = f"ip:{request.client.host if request.client else ''}", PRIORITY_ANONYMOUS
+    try:
+        await chatbot_admission.acquire(caller, priority)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail="The assistant is busy right now. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    return time.monotonic()
+
+async def chatbot_slot(request: Request, user_id: Optional[str] = Depends(get_optional_user_id)):
+    """Holds an admission slot until the endpoint returns"""
+    start = await _admit(request, user_id)
+    try:
+        yield
+    finally:
+        chatbot_admission.release(time.monotonic() - start)
+
+class _AdmittedStreamingResponse(StreamingResponse):
+    """Streaming response that frees its admission slot once sent, even if sending fails"""
+
+    def __init__(self, *args, admitted_at: float, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.admitted_at = admitted_at
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            chatbot_admission.release(time.monotonic() - self.admitted_at)
+
 class ChatRequest(BaseModel):
     message: str
     language: Optional[str] = "en"
+    # Continue a stored conversation; omit to start a new one
+    conversation_id: Optional[str] = None
+    # Deprecated: client-held history, used only without conversation_id
     conversation_history: Optional[List[dict]] = None
 
 class ChatResponse(BaseModel):
     response: str
-    conversation_history: List[dict]
+    conversation_id: str
+    # Only returned to clients that sent conversation_history
+    conversation_history: Optional[List[dict]] = None
 
 class TourismRequest(BaseModel):
     query: str
     language: Optional[str] = "en"
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat_with_bot(request: ChatRequest, db: Session = Depends(get_db)):
+@router.post("/chat", response_model=ChatResponse, dependencies=[Depends(chatbot_slot)])
+async def chat_with_bot(request: ChatRequest, db: Session = Depends(get_db),
+                        user_id: Optional[str] = Depends(get_optional_user_id)):
     """
     General chat with the AI assistant
     """
+    conversation_id, history = await _load_conversation(request, user_id)
     try:
-        result = await chatbot.chat(
+        result = await get_chatbot().chat(
             user_message=request.message,
             language=request.language,
-            conversation_history=request.conversation_history
+            conversation_history=history
         )
 
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
 
+        history = await _save_turn(conversation_id, user_id, history, request.message, result["response"])
         return ChatResponse(
             response=result["response"],
-            conversation_history=result["conversation_history"]
+            conversation_id=conversation_id,
+            conversation_history=history if request.conversation_history is not None else None
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/tourism-info")
+async def _load_conversation(request: ChatRequest, user_id: Optional[str]):
+    """
+    Resolve the conversation a message belongs to
+
+    Returns:
+        (conversation_id, history before this message)
+
+    Raises:
+        HTTPException: 404 if conversation_id is unknown, expired or was
+            started by another user (or anonymously, for a signed-in caller)
+    """
+    if request.conversation_id:
+        history = await conversation_store.load(request.conversation_id, user_id)
+        if history is None:
+            raise HTTPException(status_code=404, detail="Conversation not found or expired")
+        return request.conversation_id, history
+    return conversation_store.new_id(), list(request.conversation_history or [])
+
+async def _save_turn(conversation_id: str, user_id: Optional[str], history: List[dict],
+                     message: str, response: str) -> List[dict]:
+    history = history + [
+        {"role": "user", "content": message},
+        {"role": "assistant", "content": response}
+    ]
+    await conversation_store.save(conversation_id, user_id, history)
+    return history
+
+@router.post("/chat/stream")
+async def stream_chat_with_bot(request: ChatRequest, http_request: Request,
+                               user_id: Optional[str] = Depends(get_optional_user_id)):
+    """
+    Chat with the AI assistant, streaming the reply as Server-Sent Events
+
+    Emits `token` events ({"text": ...}) as the provider generates the reply,
+    then a `done` event with the full response and the conversation ID, or
+    an `error` event. Tokens are pulled from the provider only as fast as the client
+    reads them, and the provider stream is closed if the client disconnects.
+    """
+    conversation_id, history = await _load_conversation(request, user_id)
+    # The slot is held until the stream ends (or the client disconnects)
+    return _AdmittedStreamingResponse(
+        _chat_events(request, user_id, conversation_id, history),
+        admitted_at=await _admit(http_request, user_id),
+        media_type="text/event-stream",
+        # Stop proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _chat_events(request: ChatRequest, user_id: Optional[str], conversation_id: str, history: List[dict]):
+    chatbot = get_chatbot()
+    start = time.perf_counter()
+    chunks = []
+    outcome = "cancelled"
+    try:
+        stream = chatbot.stream_chat(
+            user_message=request.message,
+            language=request.language,
+            conversation_history=history
+        )
+        async with aclosing(stream):
+            async for text in stream:
+                if not chunks:
+                    CHATBOT_TIME_TO_FIRST_TOKEN.labels(provider=chatbot.provider).observe(
+                        time.perf_counter() - start
+                    )
+                chunks.append(text)
+                yield _sse_event("token", {"text": text})
+
+        outcome = "completed"
+        response = "".join(chunks)
+        history = await _save_turn(conversation_id, user_id, history, request.message, response)
+        done = {"response": response, "conversation_id": conversation_id}
+        if request.conversation_history is not None:
+            done["conversation_history"] = history
+        yield _sse_event("done", done)
+
+    except Exception as e:
+        outcome = "error"
+        print(f"[Chatbot] Stream failed: {e}")
+        yield _sse_event("error", {
+            "detail": "I apologize, but I'm having trouble responding right now. Please try again."
+        })
+
+    finally:
+        # Client disconnects surface as cancellation and leave outcome as "cancelled"
+        CHATBOT_STREAMS.labels(provider=chatbot.provider, outcome=outcome).inc()
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/tourism-info", dependencies=[Depends(chatbot_slot)])
 async def get_tourism_information(request: TourismRequest, db: Session = Depends(get_db)):
     """
     Get tourism information about South Korea
     """
     try:
-        result = await chatbot.get_tourism_info(
+        result = await get_chatbot().get_tourism_info(
             query=request.query,
             language=request.language
         )
@@ -64,13 +217,13 @@ async def get_tourism_information(request: TourismRequest, db: Session = Depends
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/points-info")
+@router.get("/points-info", dependencies=[Depends(chatbot_slot)])
 async def get_points_information(language: str = "en", db: Session = Depends(get_db)):
     """
     Get information about the OMNI Points system
     """
     try:
-        result = await chatbot.explain_points_system(language=language)
+        result = await get_chatbot().explain_points_system(language=language)
 
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
@@ -82,7 +235,7 @@ async def get_points_information(language: str = "en", db: Session = Depends(get
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/help")
+@router.get("/help", dependencies=[Depends(chatbot_slot)])
 async def get_help(topic: Optional[str] = None, language: str = "en", db: Session = Depends(get_db)):
     """
     Get help on various topics
@@ -91,10 +244,10 @@ async def get_help(topic: Optional[str] = None, language: str = "en", db: Sessio
         if topic:
             prompt = f"Help me with: {topic}"
         else:
-            prompt = "What features does OMNIPASS offer?"
+            prompt = HELP_PROMPT
 
-        result = await chatbot.chat(
-            user_message=prompt,
+        result = await get_chatbot().ask(
+            prompt=prompt,
             language=language
         )
 
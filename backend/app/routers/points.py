@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 
 router = APIRouter()
 
 @router.get("/balance")
-async def get_balance(db: Session = Depends(get_db)):
+async def get_balance(db: Session = Depends(get_read_db)):
     """Get user's point balance"""
     return {"message": "Get balance endpoint"}
 
 @router.get("/transactions")
-async def get_transactions(db: Session = Depends(get_db)):
+async def get_transactions(db: Session = Depends(get_read_db)):
     """Get user's transaction history"""
     return {"message": "Get transactions endpoint"}
 
@@ -2,10 +2,11 @@
 Review system router
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional
-from app.database import get_db
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import case, func
+from typing import List, Optional
+from app.database import get_db, get_read_db
 from app.models.review import Review, ReviewReply, ReviewHelpful, EntityType
 from app.models.user import User
 from app.schemas.review import (
@@ -13,6 +14,7 @@ from app.schemas.review import (
     ReplyCreate, ReplyUpdate, ReplyResponse, ReviewWithRepliesResponse
 )
 from app.utils.dependencies import get_current_user
+from app.utils.query_stats import query_budget
 
 router = APIRouter()
 
@@ -58,39 +60,32 @@ async def create_review(
     return _build_review_response(new_review, current_user.id, db)
 
 @router.get("/", response_model=ReviewListResponse)
+@query_budget(5)
 async def get_reviews(
     entity_type: EntityType = Query(...),
     entity_id: str = Query(...),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     sort_by: str = Query("recent", pattern="^(recent|helpful|rating_high|rating_low)$"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get reviews for a specific entity with pagination and sorting
     - No authentication required for reading
     """
-    query = db.query(Review).filter(
+    query = db.query(Review).options(selectinload(Review.user)).filter(
         Review.entity_type == entity_type,
         Review.entity_id == entity_id
     )
 
-    # Calculate statistics
-    total = query.count()
-    avg_rating = db.query(func.avg(Review.rating)).filter(
+    # Total, average and rating distribution from one grouped count
+    rating_counts = dict(db.query(Review.rating, func.count(Review.id)).filter(
         Review.entity_type == entity_type,
         Review.entity_id == entity_id
-    ).scalar() or 0.0
-
-    # Rating distribution
-    rating_dist = {}
-    for i in range(1, 6):
-        count = db.query(Review).filter(
-            Review.entity_type == entity_type,
-            Review.entity_id == entity_id,
-            Review.rating == i
-        ).count()
-        rating_dist[str(i)] = count
+    ).group_by(Review.rating).all())
+    total = sum(rating_counts.values())
+    avg_rating = sum(rating * count for rating, count in rating_counts.items()) / total if total else 0.0
+    rating_dist = {str(i): rating_counts.get(i, 0) for i in range(1, 6)}
 
     # Sorting
     if sort_by == "recent":
@@ -108,42 +103,31 @@ async def get_reviews(
     offset = (page - 1) * page_size
     reviews = query.offset(offset).limit(page_size).all()
 
-    # Build responses (no user authentication, so user_id is None)
-    review_responses = [_build_review_response(r, None, db) for r in reviews]
-
-    return ReviewListResponse(
-        reviews=review_responses,
-        total=total,
-        page=page,
-        page_size=page_size,
-        average_rating=round(float(avg_rating), 1),
-        rating_distribution=rating_dist
-    )
+    # Payloads are built from trusted rows, so skip response_model validation
+    # (no user authentication, so user_id is None)
+    return ORJSONResponse({
+        "reviews": _review_payloads(reviews, None, db),
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "average_rating": round(float(avg_rating), 1),
+        "rating_distribution": rating_dist
+    })
 
 @router.get("/{review_id}", response_model=ReviewWithRepliesResponse)
+@query_budget(5)
 async def get_review_with_replies(
     review_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a single review with all replies"""
     review = db.query(Review).filter(Review.id == review_id).first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
 
-    review_data = _build_review_response(review, None, db)
-
-    # Get top-level replies only
-    replies = db.query(ReviewReply).filter(
-        ReviewReply.review_id == review_id,
-        ReviewReply.parent_reply_id.is_(None)
-    ).order_by(ReviewReply.created_at.asc()).all()
-
-    reply_responses = [_build_reply_response(r, db) for r in replies]
-
-    return ReviewWithRepliesResponse(
-        **dict(review_data),
-        replies=reply_responses
-    )
+    payload = _review_payloads([review], None, db)[0]
+    payload["replies"] = _reply_tree_payloads(review_id, db)
+    return ORJSONResponse(payload)
 
 @router.put("/{review_id}", response_model=ReviewResponse)
 async def update_review(
@@ -282,22 +266,17 @@ async def create_reply(
     return _build_reply_response(new_reply, db)
 
 @router.get("/{review_id}/replies", response_model=list[ReplyResponse])
+@query_budget(2)
 async def get_replies(
     review_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all replies for a review"""
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = db.query(Review.id).filter(Review.id == review_id).first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
 
-    # Get top-level replies only
-    replies = db.query(ReviewReply).filter(
-        ReviewReply.review_id == review_id,
-        ReviewReply.parent_reply_id.is_(None)
-    ).order_by(ReviewReply.created_at.asc()).all()
-
-    return [_build_reply_response(r, db) for r in replies]
+    return ORJSONResponse(_reply_tree_payloads(review_id, db))
 
 @router.put("/replies/{reply_id}", response_model=ReplyResponse)
 async def update_reply(
@@ -348,39 +327,7 @@ async def delete_reply(
 
 def _build_review_response(review: Review, user_id: Optional[str], db: Session) -> ReviewResponse:
     """Build review response with aggregated data"""
-    helpful_count = db.query(func.count(ReviewHelpful.id)).filter(
-        ReviewHelpful.review_id == review.id
-    ).scalar() or 0
-
-    user_has_marked_helpful = False
-    if user_id:
-        user_has_marked_helpful = db.query(ReviewHelpful).filter(
-            ReviewHelpful.review_id == review.id,
-            ReviewHelpful.user_id == user_id
-        ).first() is not None
-
-    reply_count = db.query(func.count(ReviewReply.id)).filter(
-        ReviewReply.review_id == review.id
-    ).scalar() or 0
-
-    return ReviewResponse(
-        id=review.id,
-        user_id=review.user_id,
-        user={
-            "id": review.user.id,
-            "name": review.user.name,
-            "email": review.user.email
-        },
-        entity_type=review.entity_type,
-        entity_id=review.entity_id,
-        rating=review.rating,
-        comment=review.comment,
-        helpful_count=helpful_count,
-        user_has_marked_helpful=user_has_marked_helpful,
-        reply_count=reply_count,
-        created_at=review.created_at,
-        updated_at=review.updated_at
-    )
+    return ReviewResponse(**_review_payloads([review], user_id, db)[0])
 
 def _build_reply_response(reply: ReviewReply, db: Session) -> ReplyResponse:
     """Build reply response with nested children"""
@@ -405,3 +352,78 @@ def _build_reply_response(reply: ReviewReply, db: Session) -> ReplyResponse:
         updated_at=reply.updated_at,
         child_replies=child_responses
     )
+
+def _review_payloads(reviews: List[Review], user_id: Optional[str], db: Session) -> List[dict]:
+    """
+    ReviewResponse fields for a page of reviews as plain dicts
+
+    Helpful votes and reply counts are loaded with one query each for the
+    whole page rather than per review; load authors with
+    selectinload(Review.user) (or have them in the session already).
+    """
+    if not reviews:
+        return []
+    review_ids = [review.id for review in reviews]
+
+    # Helpful count and whether user_id is among the voters, per review
+    helpful = {
+        row.review_id: (row.count, bool(row.marked))
+        for row in db.query(
+            ReviewHelpful.review_id,
+            func.count(ReviewHelpful.id).label("count"),
+            func.max(case((ReviewHelpful.user_id == user_id, 1), else_=0)).label("marked")
+        ).filter(ReviewHelpful.review_id.in_(review_ids)).group_by(ReviewHelpful.review_id)
+    }
+    reply_counts = dict(db.query(ReviewReply.review_id, func.count(ReviewReply.id)).filter(
+        ReviewReply.review_id.in_(review_ids)
+    ).group_by(ReviewReply.review_id).all())
+
+    return [
+        {
+            "id": review.id,
+            "user_id": review.user_id,
+            "user": {"id": review.user.id, "name": review.user.name, "email": review.user.email},
+            "entity_type": review.entity_type,
+            "entity_id": review.entity_id,
+            "rating": review.rating,
+            "comment": review.comment,
+            "helpful_count": helpful.get(review.id, (0, False))[0],
+            "user_has_marked_helpful": helpful.get(review.id, (0, False))[1],
+            "reply_count": reply_counts.get(review.id, 0),
+            "created_at": review.created_at,
+            "updated_at": review.updated_at
+        }
+        for review in reviews
+    ]
+
+def _reply_tree_payloads(review_id: str, db: Session) -> List[dict]:
+    """Top-level ReplyResponse trees of a review as plain dicts, from one query for all its replies"""
+    rows = db.query(
+        ReviewReply.id, ReviewReply.review_id, ReviewReply.user_id, ReviewReply.parent_reply_id,
+        ReviewReply.comment, ReviewReply.created_at, ReviewReply.updated_at, User.name, User.email
+    ).join(User, User.id == ReviewReply.user_id).filter(
+        ReviewReply.review_id == review_id
+    ).order_by(ReviewReply.created_at.asc()).all()
+
+    replies = {}
+    top_level = []
+    for row in rows:
+        replies[row.id] = {
+            "id": row.id,
+            "review_id": row.review_id,
+            "user_id": row.user_id,
+            "user": {"id": row.user_id, "name": row.name, "email": row.email},
+            "parent_reply_id": row.parent_reply_id,
+            "comment": row.comment,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+            "child_replies": []
+        }
+    # Rows are in creation order, so children stay sorted oldest first
+    for reply in replies.values():
+        parent = replies.get(reply["parent_reply_id"])
+        if parent is not None:
+            parent["child_replies"].append(reply)
+        elif reply["parent_reply_id"] is None:
+            top_level.append(reply)
+    return top_level
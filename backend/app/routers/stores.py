@@ -2,13 +2,15 @@
 Partner stores endpoints
 """
 from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import json
 import math
-from app.database import get_db
+from app.database import get_read_db
 from app.models.store import Store, StoreCategory
 from app.schemas.store import StoreResponse, StoreListResponse
+from app.utils.query_stats import query_budget
 
 router = APIRouter()
 
@@ -29,8 +31,8 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
 
     return R * c
 
-def build_store_response(store: Store, user_lat: Optional[float] = None, user_lon: Optional[float] = None) -> StoreResponse:
-    """Build store response with parsed images and calculated distance"""
+def store_payload(store: Store, user_lat: Optional[float] = None, user_lon: Optional[float] = None) -> dict:
+    """StoreResponse fields as a plain dict, with parsed images and calculated distance"""
     # Parse images JSON string
     images = None
     if store.images:
@@ -44,22 +46,27 @@ def build_store_response(store: Store, user_lat: Optional[float] = None, user_lo
     if user_lat is not None and user_lon is not None:
         distance = round(calculate_distance(user_lat, user_lon, store.latitude, store.longitude), 2)
 
-    return StoreResponse(
-        id=store.id,
-        name=store.name,
-        category=store.category,
-        description=store.description,
-        address=store.address,
-        latitude=store.latitude,
-        longitude=store.longitude,
-        point_rate=store.point_rate,
-        images=images,
-        opening_hours=store.opening_hours,
-        contact=store.contact,
-        distance=distance
-    )
+    return {
+        "id": store.id,
+        "name": store.name,
+        "category": store.category,
+        "description": store.description,
+        "address": store.address,
+        "latitude": store.latitude,
+        "longitude": store.longitude,
+        "point_rate": store.point_rate,
+        "images": images,
+        "opening_hours": store.opening_hours,
+        "contact": store.contact,
+        "distance": distance
+    }
+
+def build_store_response(store: Store, user_lat: Optional[float] = None, user_lon: Optional[float] = None) -> StoreResponse:
+    """Build store response with parsed images and calculated distance"""
+    return StoreResponse(**store_payload(store, user_lat, user_lon))
 
 @router.get("/", response_model=StoreListResponse)
+@query_budget(1)
 async def get_stores(
     category: Optional[StoreCategory] = Query(None),
     latitude: Optional[float] = Query(None),
@@ -67,7 +74,7 @@ async def get_stores(
     radius: float = Query(50.0, description="Search radius in kilometers"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get list of partner stores with optional filters
@@ -102,24 +109,23 @@ async def get_stores(
     offset = (page - 1) * page_size
     stores = all_stores[offset:offset + page_size]
 
-    # Build responses
-    store_responses = [build_store_response(s, latitude, longitude) for s in stores]
-
-    return StoreListResponse(
-        stores=store_responses,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    # Payloads are built from trusted rows, so skip response_model validation
+    return ORJSONResponse({
+        "stores": [store_payload(s, latitude, longitude) for s in stores],
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    })
 
 @router.get("/nearby", response_model=List[StoreResponse])
+@query_budget(1)
 async def get_nearby_stores(
     latitude: float = Query(...),
     longitude: float = Query(...),
     radius: float = Query(5.0, description="Search radius in kilometers"),
     category: Optional[StoreCategory] = Query(None),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get nearby stores based on location
@@ -146,15 +152,16 @@ async def get_nearby_stores(
     stores_with_distance.sort(key=lambda x: x[1])
     nearby_stores = [s[0] for s in stores_with_distance[:limit]]
 
-    # Build responses
-    return [build_store_response(s, latitude, longitude) for s in nearby_stores]
+    # Payloads are built from trusted rows, so skip response_model validation
+    return ORJSONResponse([store_payload(s, latitude, longitude) for s in nearby_stores])
 
 @router.get("/{store_id}", response_model=StoreResponse)
+@query_budget(1)
 async def get_store_details(
     store_id: str,
     latitude: Optional[float] = Query(None),
     longitude: Optional[float] = Query(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get detailed information about a specific store
@@ -8,7 +8,8 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserProfileResponse, UserProfileUpdate, LanguageUpdate
 from app.utils.dependencies import get_current_user
-from app.services.google_sheets import sheets_service
+from app.models.sheets_outbox import OutboxOperation
+from app.services.sheets_outbox import enqueue_user_sync
 
 router = APIRouter()
 
@@ -41,33 +42,10 @@ async def update_profile(
         setattr(current_user, field, value)
 
     current_user.updated_at = datetime.utcnow()
+    enqueue_user_sync(db, current_user, OutboxOperation.UPDATE)
     db.commit()
     db.refresh(current_user)
 
-    # Sync to Google Sheets
-    try:
-        sheets_service.sync_user({
-            'id': current_user.id,
-            'customer_id': current_user.customer_id,
-            'name': current_user.name,
-            'email': current_user.email,
-            'country': current_user.country,
-            'nationality': current_user.nationality,
-            'phone': current_user.phone,
-            'preferred_language': current_user.preferred_language,
-            'passport_number': current_user.passport_number,
-            'date_of_birth': current_user.date_of_birth,
-            'passport_expiry': current_user.passport_expiry,
-            'provider': current_user.provider,
-            'provider_id': current_user.provider_id,
-            'profile_picture': current_user.profile_picture,
-            'last_login': str(current_user.last_login) if current_user.last_login else None,
-            'created_at': str(current_user.created_at),
-            'updated_at': str(current_user.updated_at) if current_user.updated_at else None
-        })
-    except Exception as e:
-        print(f"[Google Sheets] Failed to sync user profile update: {e}")
-
     return current_user
 
 @router.put("/me/language", response_model=UserProfileResponse)
@@ -83,31 +61,8 @@ async def update_language(
     """
     current_user.preferred_language = language_data.preferred_language
     current_user.updated_at = datetime.utcnow()
+    enqueue_user_sync(db, current_user, OutboxOperation.UPDATE)
     db.commit()
     db.refresh(current_user)
 
-    # Sync to Google Sheets
-    try:
-        sheets_service.sync_user({
-            'id': current_user.id,
-            'customer_id': current_user.customer_id,
-            'name': current_user.name,
-            'email': current_user.email,
-            'country': current_user.country,
-            'nationality': current_user.nationality,
-            'phone': current_user.phone,
-            'preferred_language': current_user.preferred_language,
-            'passport_number': current_user.passport_number,
-            'date_of_birth': current_user.date_of_birth,
-            'passport_expiry': current_user.passport_expiry,
-            'provider': current_user.provider,
-            'provider_id': current_user.provider_id,
-            'profile_picture': current_user.profile_picture,
-            'last_login': str(current_user.last_login) if current_user.last_login else None,
-            'created_at': str(current_user.created_at),
-            'updated_at': str(current_user.updated_at) if current_user.updated_at else None
-        })
-    except Exception as e:
-        print(f"[Google Sheets] Failed to sync language update: {e}")
-
     return current_user
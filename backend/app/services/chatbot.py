@@ -1,9 +1,22 @@
 """
 Unified Chatbot Service
 Supports multiple AI providers: OpenAI, Claude, Gemini
+The provider module (and its SDK) is imported on first use, not at app import
 """
 from enum import Enum
+from functools import lru_cache
+from typing import AsyncIterator, Iterable
 from app.config import settings
+from app.services.chatbot_router import create_chatbot_router
+from app.services.chatbot_cache import ChatbotResponseCache, chatbot_response_cache, record_saved_tokens
+from app.services.conversation_store import trim_history
+from app.services.semantic_cache import SemanticCache, semantic_cache
+from app.utils.metrics import CHATBOT_SEMANTIC_CACHE_REQUESTS
+
+# Languages users can choose (see preferred_language in the user schemas)
+SUPPORTED_LANGUAGES = ("en", "ko", "ja", "zh", "es", "fr", "id", "vi", "th", "ru")
+
+HELP_PROMPT = "What features does OMNIPASS offer?"
 
 class ChatbotProvider(str, Enum):
     OPENAI = "openai"
@@ -20,8 +33,13 @@ class ChatbotService:
         """
         Returns the configured chatbot instance
         """
-        provider = settings.CHATBOT_PROVIDER
+        return ChatbotService.get_provider(settings.CHATBOT_PROVIDER)
 
+    @staticmethod
+    def get_provider(provider: str):
+        """
+        Returns the chatbot instance for a provider, importing its SDK on first use
+        """
         if provider == ChatbotProvider.CLAUDE:
             from app.services.chatbot_claude import chatbot
             return chatbot
@@ -39,5 +57,121 @@ class ChatbotService:
             from app.services.chatbot_claude import chatbot
             return chatbot
 
-# Get the configured chatbot
-chatbot = ChatbotService.get_chatbot()
+    @staticmethod
+    def get_chatbots() -> list:
+        """
+        Returns the configured chatbot followed by every other provider that
+        has an API key (the failover order)
+        """
+        primary = ChatbotService.get_chatbot()
+        chatbots = [primary]
+        if not settings.CHATBOT_FAILOVER_ENABLED:
+            return chatbots
+
+        api_keys = {
+            ChatbotProvider.CLAUDE: settings.ANTHROPIC_API_KEY,
+            ChatbotProvider.OPENAI: settings.OPENAI_API_KEY,
+            ChatbotProvider.GEMINI: settings.GOOGLE_API_KEY,
+        }
+        for provider, api_key in api_keys.items():
+            if api_key and provider.value != primary.provider:
+                chatbots.append(ChatbotService.get_provider(provider))
+        return chatbots
+
+class CachedChatbot:
+    """
+    Response cache in front of the provider chatbot (or router)
+
+    Single-turn prompts (points explanation, tourism info, help) are served
+    from the exact-match cache. Tourism queries and the first message of a
+    chat also go through the semantic cache, which answers reworded
+    questions. Later chat turns always go to the provider.
+    """
+
+    def __init__(self, chatbot, cache: ChatbotResponseCache, semantic: SemanticCache):
+        self.chatbot = chatbot
+        self.cache = cache
+        self.semantic = semantic
+        self.provider = chatbot.provider
+        self.model = getattr(chatbot, "model_name", chatbot.model)
+
+    async def chat(self, user_message: str, language: str = "en", conversation_history: list = None):
+        if conversation_history:
+            return await self.chatbot.chat(user_message, language, _trimmed(conversation_history))
+        return await self._semantic("chat", user_message, language, lambda: self.chatbot.chat(user_message, language))
+
+    def stream_chat(self, user_message: str, language: str = "en",
+                    conversation_history: list = None) -> AsyncIterator[str]:
+        return self.chatbot.stream_chat(user_message, language, _trimmed(conversation_history or []))
+
+    async def ask(self, prompt: str, language: str = "en", kind: str = "help"):
+        """Single-turn chat, served from the cache when possible"""
+        return await self._cached(kind, prompt, language, lambda: self.chatbot.chat(prompt, language))
+
+    async def get_tourism_info(self, query: str, language: str = "en"):
+        return await self._cached("tourism", query, language, lambda: self._semantic(
+            "tourism", query, language, lambda: self.chatbot.get_tourism_info(query, language)
+        ))
+
+    async def explain_points_system(self, language: str = "en"):
+        return await self._cached(
+            "points", "", language, lambda: self.chatbot.explain_points_system(language)
+        )
+
+    async def prewarm(self, languages: Iterable[str] = SUPPORTED_LANGUAGES):
+        """Fill the cache with the points explanation and general help for each language"""
+        if not await self.cache.acquire_prewarm_lock():
+            return
+
+        for language in languages:
+            for result in (await self.explain_points_system(language), await self.ask(HELP_PROMPT, language)):
+                if "error" in result:
+                    print(f"[Chatbot] Cache pre-warm failed for {language}: {result['error']}")
+                    return
+        print("[Chatbot] Response cache pre-warmed")
+
+    async def _cached(self, kind: str, prompt: str, language: str, generate):
+        if not settings.CHATBOT_CACHE_ENABLED:
+            return await generate()
+        key = self.cache.key(self.provider, self.model, f"{kind}:{prompt}", language)
+        return await self.cache.get_or_generate(key, kind, generate)
+
+    async def _semantic(self, kind: str, question: str, language: str, generate):
+        if not settings.CHATBOT_SEMANTIC_CACHE_ENABLED:
+            return await generate()
+
+        namespace = f"{self.provider}:{self.model}:{kind}"
+        entry, _ = self.semantic.lookup(namespace, language, question)
+        if entry is not None:
+            CHATBOT_SEMANTIC_CACHE_REQUESTS.labels(kind=kind, result="hit").inc()
+            record_saved_tokens(entry.get("usage"))
+            return {
+                "response": entry["response"],
+                "conversation_history": [
+                    {"role": "user", "content": question},
+                    {"role": "assistant", "content": entry["response"]}
+                ],
+                "usage": entry.get("usage"),
+                "cached": True
+            }
+
+        CHATBOT_SEMANTIC_CACHE_REQUESTS.labels(kind=kind, result="miss").inc()
+        result = await generate()
+        if "error" not in result:
+            self.semantic.add(namespace, language, question, {
+                "response": result["response"],
+                "usage": result.get("usage")
+            })
+        return result
+
+def _trimmed(history: list) -> list:
+    return trim_history(history, settings.CHATBOT_HISTORY_TOKEN_BUDGET)
+
+@lru_cache()
+def get_chatbot() -> CachedChatbot:
+    """Get the configured chatbot, creating its provider client on first call"""
+    return CachedChatbot(
+        create_chatbot_router(ChatbotService.get_chatbots()),
+        chatbot_response_cache,
+        semantic_cache
+    )
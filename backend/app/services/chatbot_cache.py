@@ -0,0 +1,133 @@
+"""
+Chatbot response cache
+Single-turn prompts (points explanation, tourism info, help) get the same
+answer every time, so replies are cached per provider, model, prompt and
+language in Redis, with a bounded in-memory LRU in front of it
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+from redis.exceptions import RedisError
+from app.config import settings
+from app.utils.metrics import CACHE_ENTRIES, CHATBOT_CACHE_REQUESTS, CHATBOT_CACHE_SAVED_TOKENS
+from app.utils.redis_client import redis_connector
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace and case so trivially different prompts share an entry"""
+    return " ".join(prompt.split()).casefold()
+
+def record_saved_tokens(usage: Optional[dict]):
+    """Count the tokens a cache hit saved, from the usage of the original call"""
+    usage = usage or {}
+    CHATBOT_CACHE_SAVED_TOKENS.labels(type="input").inc(usage.get("input_tokens", 0))
+    CHATBOT_CACHE_SAVED_TOKENS.labels(type="output").inc(usage.get("output_tokens", 0))
+
+class ChatbotResponseCache:
+    """
+    Two-level cache of chatbot replies
+
+    Lookups check the per-worker LRU first, then Redis (shared by all
+    workers). Entries expire after `ttl_seconds` in both. Only successful
+    replies are stored; the token usage of the original call is kept so
+    hits can be counted as saved tokens.
+    """
+
+    def __init__(self, prefix: str, ttl_seconds: int, max_local_entries: int = 1000):
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.max_local_entries = max_local_entries
+        # key -> (expires_at, entry)
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def key(self, provider: str, model: str, prompt: str, language: str) -> str:
+        digest = hashlib.sha256(
+            "\x1f".join((provider, model, language, normalize_prompt(prompt))).encode()
+        ).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+    async def get_or_generate(self, key: str, kind: str, generate: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Return the cached reply for `key`, or call `generate` and cache its result
+
+        Args:
+            key: Cache key from key()
+            kind: Metric label for the kind of prompt (e.g. "points")
+            generate: Coroutine function returning a chatbot result dict
+
+        Returns:
+            The chatbot result dict ("response", and "error" on failure)
+        """
+        entry = await self.get(key)
+        if entry is not None:
+            CHATBOT_CACHE_REQUESTS.labels(kind=kind, result="hit").inc()
+            record_saved_tokens(entry.get("usage"))
+            return {"response": entry["response"], "usage": entry.get("usage"), "cached": True}
+
+        CHATBOT_CACHE_REQUESTS.labels(kind=kind, result="miss").inc()
+        result = await generate()
+        if "error" not in result:
+            await self.set(key, {"response": result["response"], "usage": result.get("usage")})
+        return result
+
+    async def get(self, key: str) -> Optional[dict]:
+        local = self._local.get(key)
+        if local is not None:
+            expires_at, entry = local
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                return entry
+            del self._local[key]
+
+        client = redis_connector.get()
+        if client is None:
+            return None
+
+        try:
+            raw, ttl = await client.pipeline(transaction=False).get(key).ttl(key).execute()
+        except (RedisError, OSError) as e:
+            redis_connector.mark_unavailable(e)
+            return None
+
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        self._store_local(key, entry, ttl if ttl > 0 else self.ttl_seconds)
+        return entry
+
+    async def set(self, key: str, entry: dict):
+        self._store_local(key, entry, self.ttl_seconds)
+
+        client = redis_connector.get()
+        if client is None:
+            return
+        try:
+            await client.set(key, json.dumps(entry, ensure_ascii=False), ex=self.ttl_seconds)
+        except (RedisError, OSError) as e:
+            redis_connector.mark_unavailable(e)
+
+    def _store_local(self, key: str, entry: dict, ttl_seconds: int):
+        self._local[key] = (time.monotonic() + ttl_seconds, entry)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    async def acquire_prewarm_lock(self) -> bool:
+        """Let one worker per deploy pre-warm the cache (always True without Redis)"""
+        client = redis_connector.get()
+        if client is None:
+            return True
+        try:
+            return bool(await client.set(f"{self.prefix}:prewarm", "1", nx=True, ex=600))
+        except (RedisError, OSError) as e:
+            redis_connector.mark_unavailable(e)
+            return True
+
+# Global instance
+chatbot_response_cache = ChatbotResponseCache(
+    prefix="chatbot:cache",
+    ttl_seconds=settings.CHATBOT_CACHE_TTL_SECONDS,
+    max_local_entries=settings.CHATBOT_CACHE_MAX_ENTRIES
+)
+CACHE_ENTRIES.labels(cache="chatbot_response").set_function(lambda: len(chatbot_response_cache._local))
@@ -1,12 +1,22 @@
 """
 Claude API Chatbot Service
 """
-from anthropic import Anthropic
+from typing import AsyncIterator
+from anthropic import AsyncAnthropic
 from app.config import settings
+from app.services.chatbot_http import chat_slots, chatbot_timeout, create_http_client
 
 class ClaudeChatbot:
+    provider = "claude"
+
     def __init__(self):
-        self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL or None,
+            timeout=chatbot_timeout(),
+            max_retries=settings.CHATBOT_MAX_RETRIES,
+            http_client=create_http_client()
+        )
         self.model = "claude-3-5-sonnet-20241022"
 
         self.system_prompt = """
@@ -38,19 +48,16 @@ Respond in the user's preferred language.
         """
         try:
             # Build conversation history
-            messages = conversation_history or []
-            messages.append({
-                "role": "user",
-                "content": user_message
-            })
+            messages = self._build_messages(user_message, conversation_history)
 
             # Call Claude API
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                system=self.system_prompt + f"\n\nRespond in {language}.",
-                messages=messages
-            )
+            async with chat_slots:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=1024,
+                    system=self.system_prompt + f"\n\nRespond in {language}.",
+                    messages=messages
+                )
 
             # Extract response text
             assistant_message = response.content[0].text
@@ -60,7 +67,11 @@ Respond in the user's preferred language.
                 "conversation_history": messages + [{
                     "role": "assistant",
                     "content": assistant_message
-                }]
+                }],
+                "usage": {
+                    "input_tokens": response.usage.input_tokens,
+                    "output_tokens": response.usage.output_tokens
+                }
             }
 
         except Exception as e:
@@ -69,6 +80,34 @@ Respond in the user's preferred language.
                 "error": str(e)
             }
 
+    async def stream_chat(self, user_message: str, language: str = "en",
+                          conversation_history: list = None) -> AsyncIterator[str]:
+        """
+        Stream Claude's response as it is generated
+
+        Closing the generator (e.g. when the client disconnects) closes the
+        upstream stream, so Claude stops generating tokens nobody reads.
+
+        Yields:
+            str: Text deltas of the response
+        """
+        async with chat_slots:
+            async with self.client.messages.stream(
+                model=self.model,
+                max_tokens=1024,
+                system=self.system_prompt + f"\n\nRespond in {language}.",
+                messages=self._build_messages(user_message, conversation_history)
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+    def _build_messages(self, user_message: str, conversation_history: list = None) -> list:
+        """Previous messages plus the new user message (the history passed in is not modified)"""
+        return list(conversation_history or []) + [{
+            "role": "user",
+            "content": user_message
+        }]
+
     async def get_tourism_info(self, query: str, language: str = "en"):
         """
         Get tourism information about South Korea
@@ -1,13 +1,19 @@
 """
 Google Gemini Chatbot Service
 """
+from typing import AsyncIterator
 import google.generativeai as genai
 from app.config import settings
+from app.services.chatbot_http import chat_slots
 
 class GeminiChatbot:
+    provider = "gemini"
+
     def __init__(self):
         genai.configure(api_key=settings.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model_name = 'gemini-1.5-flash'
+        self.model = genai.GenerativeModel(self.model_name)
+        self.request_options = {"timeout": settings.CHATBOT_TIMEOUT_SECONDS}
 
         self.system_instruction = """
 You are a helpful customer service assistant for OMNIPASS,
@@ -38,30 +44,25 @@ Respond in the user's preferred language.
         """
         try:
             # Start or continue chat
-            if conversation_history:
-                # Convert history to Gemini format
-                history = []
-                for msg in conversation_history:
-                    history.append({
-                        'role': 'user' if msg['role'] == 'user' else 'model',
-                        'parts': [msg['content']]
-                    })
-                chat = self.model.start_chat(history=history)
-            else:
-                chat = self.model.start_chat(history=[])
+            chat = self.model.start_chat(history=self._build_history(conversation_history))
 
             # Add language instruction
             prompt = f"{user_message}\n\n[Respond in {language}]"
 
-            # Send message
-            response = chat.send_message(prompt)
+            # Send message (async API; the sync call would block the event loop)
+            async with chat_slots:
+                response = await chat.send_message_async(prompt, request_options=self.request_options)
 
             return {
                 "response": response.text,
-                "conversation_history": conversation_history or [] + [
+                "conversation_history": (conversation_history or []) + [
                     {"role": "user", "content": user_message},
                     {"role": "assistant", "content": response.text}
-                ]
+                ],
+                "usage": {
+                    "input_tokens": response.usage_metadata.prompt_token_count,
+                    "output_tokens": response.usage_metadata.candidates_token_count
+                }
             }
 
         except Exception as e:
@@ -70,6 +71,39 @@ Respond in the user's preferred language.
                 "error": str(e)
             }
 
+    async def stream_chat(self, user_message: str, language: str = "en",
+                          conversation_history: list = None) -> AsyncIterator[str]:
+        """
+        Stream Gemini's response as it is generated
+
+        Chunks are requested from Gemini only as they are consumed; closing
+        the generator (e.g. when the client disconnects) abandons the
+        upstream stream.
+
+        Yields:
+            str: Text chunks of the response
+        """
+        chat = self.model.start_chat(history=self._build_history(conversation_history))
+        async with chat_slots:
+            response = await chat.send_message_async(
+                f"{user_message}\n\n[Respond in {language}]",
+                stream=True,
+                request_options=self.request_options
+            )
+            async for chunk in response:
+                if chunk.parts:
+                    yield chunk.text
+
+    def _build_history(self, conversation_history: list = None) -> list:
+        """Convert history to Gemini format"""
+        history = []
+        for msg in conversation_history or []:
+            history.append({
+                'role': 'user' if msg['role'] == 'user' else 'model',
+                'parts': [msg['content']]
+            })
+        return history
+
     async def get_tourism_info(self, query: str, language: str = "en"):
         """
         Get tourism information about South Korea
@@ -0,0 +1,26 @@
+"""
+Shared transport for the chatbot provider SDKs
+One connection pool per worker and a cap on concurrent provider calls
+"""
+import asyncio
+import httpx
+from app.config import settings
+
+def chatbot_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.CHATBOT_TIMEOUT_SECONDS,
+        connect=settings.CHATBOT_CONNECT_TIMEOUT_SECONDS
+    )
+
+def create_http_client() -> httpx.AsyncClient:
+    """Connection pool handed to the provider SDK, shared by every chat in this worker"""
+    return httpx.AsyncClient(
+        timeout=chatbot_timeout(),
+        limits=httpx.Limits(
+            max_connections=settings.CHATBOT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CHATBOT_MAX_CONNECTIONS
+        )
+    )
+
+# Caps in-flight provider calls per worker; further chats wait for a slot
+chat_slots = asyncio.Semaphore(settings.CHATBOT_MAX_CONCURRENCY)
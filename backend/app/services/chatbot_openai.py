@@ -1,12 +1,22 @@
 """
 OpenAI Chatbot Service
 """
+from typing import AsyncIterator
 from openai import AsyncOpenAI
 from app.config import settings
+from app.services.chatbot_http import chat_slots, chatbot_timeout, create_http_client
 
 class OpenAIChatbot:
+    provider = "openai"
+
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            timeout=chatbot_timeout(),
+            max_retries=settings.CHATBOT_MAX_RETRIES,
+            http_client=create_http_client()
+        )
         self.model = "gpt-4o-mini"
 
         self.system_prompt = """
@@ -38,33 +48,30 @@ Respond in the user's preferred language.
         """
         try:
             # Build conversation history
-            messages = [{"role": "system", "content": self.system_prompt + f"\n\nRespond in {language}."}]
-
-            if conversation_history:
-                messages.extend(conversation_history)
-
-            messages.append({
-                "role": "user",
-                "content": user_message
-            })
+            messages = self._build_messages(user_message, language, conversation_history)
 
             # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=1024,
-                temperature=0.7
-            )
+            async with chat_slots:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=1024,
+                    temperature=0.7
+                )
 
             # Extract response text
             assistant_message = response.choices[0].message.content
 
             return {
                 "response": assistant_message,
-                "conversation_history": conversation_history or [] + [
+                "conversation_history": (conversation_history or []) + [
                     {"role": "user", "content": user_message},
                     {"role": "assistant", "content": assistant_message}
-                ]
+                ],
+                "usage": {
+                    "input_tokens": response.usage.prompt_tokens if response.usage else 0,
+                    "output_tokens": response.usage.completion_tokens if response.usage else 0
+                }
             }
 
         except Exception as e:
@@ -73,6 +80,44 @@ Respond in the user's preferred language.
                 "error": str(e)
             }
 
+    async def stream_chat(self, user_message: str, language: str = "en",
+                          conversation_history: list = None) -> AsyncIterator[str]:
+        """
+        Stream OpenAI's response as it is generated
+
+        Closing the generator (e.g. when the client disconnects) closes the
+        upstream stream, so OpenAI stops generating tokens nobody reads.
+
+        Yields:
+            str: Text deltas of the response
+        """
+        async with chat_slots:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(user_message, language, conversation_history),
+                max_tokens=1024,
+                temperature=0.7,
+                stream=True
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+
+    def _build_messages(self, user_message: str, language: str, conversation_history: list = None) -> list:
+        messages = [{"role": "system", "content": self.system_prompt + f"\n\nRespond in {language}."}]
+
+        if conversation_history:
+            messages.extend(conversation_history)
+
+        messages.append({
+            "role": "user",
+            "content": user_message
+        })
+        return messages
+
     async def get_tourism_info(self, query: str, language: str = "en"):
         """
         Get tourism information about South Korea
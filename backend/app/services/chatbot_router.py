@@ -0,0 +1,202 @@
+"""
+Chatbot provider routing
+Holds every configured provider, tracks rolling latency and error rates,
+fails over to the next provider on error or timeout and can hedge slow
+calls with a second provider
+"""
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Optional
+from app.config import settings
+from app.utils.metrics import CHATBOT_HEDGES, CHATBOT_PROVIDER_CALLS, CHATBOT_PROVIDER_LATENCY
+
+class ProviderStats:
+    """
+    Rolling latency and error rate of one provider
+
+    Keeps the last `window` calls. When at least half of the calls in the
+    window failed (with `min_samples` or more calls), the provider is
+    skipped for `cooldown_seconds` unless every other provider is also
+    unavailable.
+    """
+
+    def __init__(self, window: int = 100, min_samples: int = 5, cooldown_seconds: float = 30.0):
+        self.calls = deque(maxlen=window)  # (latency_seconds or None, ok)
+        self.min_samples = min_samples
+        self.cooldown_seconds = cooldown_seconds
+        self.unavailable_until = 0.0
+
+    def record(self, latency: Optional[float], ok: bool):
+        self.calls.append((latency, ok))
+        if not ok and len(self.calls) >= self.min_samples and self.error_rate() >= 0.5:
+            self.unavailable_until = time.monotonic() + self.cooldown_seconds
+            # Judge the provider afresh once the cool-down is over
+            self.calls.clear()
+
+    def error_rate(self) -> float:
+        if not self.calls:
+            return 0.0
+        return sum(1 for _, ok in self.calls if not ok) / len(self.calls)
+
+    def p95(self) -> Optional[float]:
+        """95th percentile latency of successful calls, or None with too few samples"""
+        latencies = sorted(latency for latency, ok in self.calls if ok and latency is not None)
+        if len(latencies) < self.min_samples:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.unavailable_until
+
+class ChatbotRouter:
+    """
+    Routes chatbot calls across providers
+
+    Providers are tried in configured order, skipping those in cool-down.
+    A call that returns an error or exceeds `attempt_timeout` moves on to
+    the next provider. With hedging on, if the first provider has not
+    answered after its p95 latency, the next provider is called as well
+    and the first successful answer wins.
+    """
+
+    def __init__(self, providers: list, attempt_timeout: float, hedge: bool = False,
+                 hedge_min_delay: float = 1.0):
+        if not providers:
+            raise ValueError("ChatbotRouter needs at least one provider")
+        self.providers = providers
+        self.stats = {p.provider: ProviderStats() for p in providers}
+        self.attempt_timeout = attempt_timeout
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        # Caches and metrics see the primary provider
+        self.provider = providers[0].provider
+        self.model = getattr(providers[0], "model_name", providers[0].model)
+
+    async def chat(self, user_message: str, language: str = "en", conversation_history: list = None):
+        return await self._route("chat", user_message, language, conversation_history)
+
+    async def get_tourism_info(self, query: str, language: str = "en"):
+        return await self._route("get_tourism_info", query, language)
+
+    async def explain_points_system(self, language: str = "en"):
+        return await self._route("explain_points_system", language)
+
+    async def stream_chat(self, user_message: str, language: str = "en",
+                          conversation_history: list = None) -> AsyncIterator[str]:
+        """
+        Stream from the first provider that produces a first token in time
+
+        Failover happens only before the first token; an error after that
+        ends the stream.
+        """
+        error = None
+        for provider in self._ordered():
+            start = time.perf_counter()
+            stream = provider.stream_chat(user_message, language, conversation_history)
+            try:
+                first = await asyncio.wait_for(anext(stream), self.attempt_timeout)
+            except StopAsyncIteration:
+                self._record(provider, start, "ok", timed=False)
+                return
+            except asyncio.CancelledError:
+                await stream.aclose()
+                raise
+            except Exception as e:
+                await stream.aclose()
+                self._record(provider, start, "timeout" if isinstance(e, asyncio.TimeoutError) else "error")
+                error = e
+                continue
+
+            # Stream durations depend on reply length; keep them out of the p95
+            self._record(provider, start, "ok", timed=False)
+            try:
+                yield first
+                async for text in stream:
+                    yield text
+            finally:
+                await stream.aclose()
+            return
+
+        raise error
+
+    def _ordered(self) -> list:
+        """Providers in configured order, those in cool-down last"""
+        return sorted(self.providers, key=lambda p: not self.stats[p.provider].available)
+
+    async def _route(self, method: str, *args) -> dict:
+        providers = self._ordered()
+        result = None
+        i = 0
+        while i < len(providers):
+            if self.hedge and i + 1 < len(providers):
+                result = await self._hedged(providers[i], providers[i + 1], method, *args)
+                i += 2
+            else:
+                result = await self._attempt(providers[i], method, *args)
+                i += 1
+            if "error" not in result:
+                return result
+        return result
+
+    async def _attempt(self, provider, method: str, *args) -> dict:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(getattr(provider, method)(*args), self.attempt_timeout)
+        except asyncio.TimeoutError:
+            self._record(provider, start, "timeout")
+            return {"response": "", "error": f"{provider.provider} timed out"}
+        except asyncio.CancelledError:
+            self._record(provider, start, "cancelled")
+            raise
+
+        self._record(provider, start, "error" if "error" in result else "ok")
+        return result
+
+    async def _hedged(self, primary, backup, method: str, *args) -> dict:
+        """Call `primary`; if it is slower than its p95, also call `backup` and take the first success"""
+        p95 = self.stats[primary.provider].p95()
+        delay = max(self.hedge_min_delay, p95 if p95 is not None else self.hedge_min_delay)
+
+        first = asyncio.create_task(self._attempt(primary, method, *args))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                result = first.result()
+                if "error" not in result:
+                    return result
+                return await self._attempt(backup, method, *args)
+
+            tasks.append(asyncio.create_task(self._attempt(backup, method, *args)))
+            pending = set(tasks)
+            result = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if "error" not in result:
+                        CHATBOT_HEDGES.labels(winner="primary" if task is first else "backup").inc()
+                        return result
+            return result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _record(self, provider, start: float, outcome: str, timed: bool = True):
+        latency = time.perf_counter() - start if timed else None
+        if outcome != "cancelled":
+            self.stats[provider.provider].record(latency, outcome == "ok")
+        CHATBOT_PROVIDER_CALLS.labels(provider=provider.provider, outcome=outcome).inc()
+        if outcome == "ok" and timed:
+            CHATBOT_PROVIDER_LATENCY.labels(provider=provider.provider).observe(latency)
+
+def create_chatbot_router(providers: list) -> ChatbotRouter:
+    return ChatbotRouter(
+        providers,
+        attempt_timeout=settings.CHATBOT_ATTEMPT_TIMEOUT_SECONDS,
+        hedge=settings.CHATBOT_HEDGE_ENABLED,
+        hedge_min_delay=settings.CHATBOT_HEDGE_MIN_DELAY_SECONDS
+    )
@@ -0,0 +1,124 @@
+"""
+Chatbot conversation store
+Conversations are kept server-side (Redis, with an in-memory fallback) and
+referenced by ID, so clients send only the new message each turn; the
+history sent to the provider is trimmed to a token budget
+"""
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+from redis.exceptions import RedisError
+from app.config import settings
+from app.utils.metrics import CACHE_ENTRIES
+from app.utils.redis_client import redis_connector
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer
+
+    About four bytes per token for English and one token per character for
+    Korean, Japanese and Chinese (three UTF-8 bytes each); dividing the UTF-8
+    length by three errs on the high side for both.
+    """
+    return len(text.encode("utf-8")) // 3 + 1
+
+def trim_history(history: List[dict], token_budget: int) -> List[dict]:
+    """
+    Most recent messages that fit in the token budget
+
+    Whole messages are dropped from the start, and the result always starts
+    with a user message (Claude rejects histories that do not).
+    """
+    kept = []
+    used = 0
+    for message in reversed(history):
+        used += estimate_tokens(message.get("content", ""))
+        if used > token_budget:
+            break
+        kept.append(message)
+    kept.reverse()
+
+    while kept and kept[0].get("role") != "user":
+        kept.pop(0)
+    return kept
+
+class ConversationStore:
+    """
+    Conversation histories keyed by a random ID, expiring after `ttl_seconds`
+    of inactivity
+
+    Each conversation belongs to the user who started it (None for anonymous
+    callers) and is only returned to that same user. At most `max_messages`
+    of the latest messages are kept per conversation. While Redis is
+    unavailable conversations live in a bounded per-worker dict, so they
+    survive only on the worker that served them.
+    """
+
+    def __init__(self, prefix: str, ttl_seconds: int, max_messages: int, max_local_conversations: int = 10_000):
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        self.max_local_conversations = max_local_conversations
+        # conversation_id -> (expires_at, owner user_id, history)
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    async def load(self, conversation_id: str, user_id: Optional[str]) -> Optional[List[dict]]:
+        """Return the stored history, or None if the conversation is unknown, expired or someone else's"""
+        client = redis_connector.get()
+        if client is not None:
+            try:
+                raw = await client.get(f"{self.prefix}:{conversation_id}")
+                if raw is not None:
+                    stored = json.loads(raw)
+                    # Entries without an owner (stored before ownership was recorded) are not returned
+                    if not isinstance(stored, dict) or stored.get("user_id") != user_id:
+                        return None
+                    return stored["history"]
+            except (RedisError, OSError) as e:
+                redis_connector.mark_unavailable(e)
+
+        local = self._local.get(conversation_id)
+        if local is None:
+            return None
+        expires_at, owner, history = local
+        if expires_at < time.monotonic():
+            del self._local[conversation_id]
+            return None
+        return history if owner == user_id else None
+
+    async def save(self, conversation_id: str, user_id: Optional[str], history: List[dict]):
+        history = history[-self.max_messages:]
+        while history and history[0].get("role") != "user":
+            history = history[1:]
+
+        client = redis_connector.get()
+        if client is not None:
+            try:
+                await client.set(
+                    f"{self.prefix}:{conversation_id}",
+                    json.dumps({"user_id": user_id, "history": history}, ensure_ascii=False),
+                    ex=self.ttl_seconds
+                )
+                self._local.pop(conversation_id, None)
+                return
+            except (RedisError, OSError) as e:
+                redis_connector.mark_unavailable(e)
+
+        self._local[conversation_id] = (time.monotonic() + self.ttl_seconds, user_id, history)
+        self._local.move_to_end(conversation_id)
+        while len(self._local) > self.max_local_conversations:
+            self._local.popitem(last=False)
+
+# Global instance
+conversation_store = ConversationStore(
+    prefix="chatbot:conversation",
+    ttl_seconds=settings.CHATBOT_CONVERSATION_TTL_SECONDS,
+    max_messages=settings.CHATBOT_CONVERSATION_MAX_MESSAGES
+)
+CACHE_ENTRIES.labels(cache="chatbot_conversation").set_function(lambda: len(conversation_store._local))
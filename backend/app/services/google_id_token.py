@@ -0,0 +1,149 @@
+"""
+Google ID token verification
+Verifies ID tokens locally against Google's published signing keys (JWKS),
+cached per the response's Cache-Control header and refreshed in the background
+"""
+import asyncio
+import os
+import re
+import time
+from typing import Dict, List, Optional
+import httpx
+from jose import jwt, JWTError
+from app.services.http_client import provider_http
+
+GOOGLE_JWKS_URL = os.getenv('GOOGLE_JWKS_URL', 'https://www.googleapis.com/oauth2/v3/certs')
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Used when the JWKS response carries no max-age
+DEFAULT_MAX_AGE_SECONDS = 3600
+# Start a background refresh this long before the cached keys expire
+REFRESH_AHEAD_SECONDS = 300
+# Minimum spacing between refreshes forced by an unknown key id
+UNKNOWN_KID_REFRESH_INTERVAL_SECONDS = 30
+# After a failed fetch, serve the last good keys this long before trying again
+FAILED_REFRESH_BACKOFF_SECONDS = 30
+
+class InvalidIdToken(Exception):
+    """Raised when an ID token cannot be verified"""
+
+class JWKSCache:
+    """
+    Signing keys keyed by `kid`
+
+    Keys are refreshed when the cache expires, ahead of expiry in a background
+    task, and on demand when a token references an unknown key id (Google
+    rotates keys by publishing the new key before signing with it). If a
+    refresh fails or returns no keys, the previous keys stay in use and no fetch is attempted
+    for FAILED_REFRESH_BACKOFF_SECONDS, so an outage of the certs endpoint
+    does not queue every login behind the request timeout.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.keys: Dict[str, dict] = {}
+        self.expires_at = 0.0
+        self.last_forced_refresh = 0.0
+        self.retry_at = 0.0
+        self._lock = asyncio.Lock()
+        self._background_refresh: Optional[asyncio.Task] = None
+
+    async def get_key(self, kid: str) -> Optional[dict]:
+        now = time.monotonic()
+        if not self.keys or now >= self.expires_at:
+            await self.refresh()
+        elif now >= self.expires_at - REFRESH_AHEAD_SECONDS:
+            self._schedule_refresh()
+
+        key = self.keys.get(kid)
+        if key is None and now - self.last_forced_refresh >= UNKNOWN_KID_REFRESH_INTERVAL_SECONDS:
+            self.last_forced_refresh = now
+            await self.refresh(force=True)
+            key = self.keys.get(kid)
+        return key
+
+    async def refresh(self, force: bool = False):
+        """Fetch the key set unless another caller refreshed it meanwhile"""
+        async with self._lock:
+            now = time.monotonic()
+            if now < self.retry_at:
+                return
+            if not force and self.keys and now < self.expires_at - REFRESH_AHEAD_SECONDS:
+                return
+            try:
+                response = await provider_http.get(self.url)
+                response.raise_for_status()
+                keys = {key['kid']: key for key in response.json().get('keys', []) if 'kid' in key}
+                if not keys:
+                    # An empty set would leave nothing to verify with and refetch on every login
+                    raise ValueError("response contains no signing keys")
+            except (httpx.HTTPError, ValueError) as e:
+                print(f"[Google JWKS] Failed to refresh signing keys, retrying in {FAILED_REFRESH_BACKOFF_SECONDS}s: {e}")
+                self.retry_at = time.monotonic() + FAILED_REFRESH_BACKOFF_SECONDS
+                return
+
+            self.keys = keys
+            self.expires_at = time.monotonic() + _max_age(response.headers.get('cache-control', ''))
+
+    def _schedule_refresh(self):
+        if self._background_refresh is None or self._background_refresh.done():
+            self._background_refresh = asyncio.create_task(self.refresh())
+
+def _max_age(cache_control: str) -> int:
+    match = re.search(r'max-age=(\d+)', cache_control)
+    return int(match.group(1)) if match else DEFAULT_MAX_AGE_SECONDS
+
+def looks_like_id_token(token: str) -> bool:
+    """ID tokens are JWTs (three segments); OAuth access tokens are opaque"""
+    if token.count('.') != 2:
+        return False
+    try:
+        return 'kid' in jwt.get_unverified_header(token)
+    except JWTError:
+        return False
+
+async def verify_google_id_token(token: str, client_ids: List[str]) -> dict:
+    """
+    Verify a Google ID token's signature and claims
+
+    Args:
+        token: The ID token (JWT) issued by Google
+        client_ids: OAuth client IDs the token may be issued for
+
+    Returns:
+        The token claims
+
+    Raises:
+        InvalidIdToken: If the token is malformed, unsigned by Google,
+            expired, or issued for another client
+    """
+    if not client_ids:
+        raise InvalidIdToken("GOOGLE_CLIENT_ID is not configured")
+
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as e:
+        raise InvalidIdToken(str(e))
+
+    key = await google_jwks.get_key(header.get('kid', ''))
+    if key is None:
+        raise InvalidIdToken("Unknown signing key")
+
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=['RS256'],
+            issuer=GOOGLE_ISSUERS,
+            options={'verify_aud': False, 'verify_at_hash': False}
+        )
+    except JWTError as e:
+        raise InvalidIdToken(str(e))
+
+    if claims.get('aud') not in client_ids:
+        raise InvalidIdToken("Token was issued for another client")
+
+    return claims
+
+# Global instance
+google_jwks = JWKSCache(GOOGLE_JWKS_URL)
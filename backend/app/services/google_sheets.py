@@ -1,24 +1,166 @@
 """
 Google Sheets integration service
-Syncs user data to Google Sheets when users register
+Syncs user data to Google Sheets when users register or change their profile.
+Request handlers enqueue writes in the outbox (services/sheets_outbox.py);
+the outbox worker calls the batch methods here. The Google API client is
+imported and built on first use (or by the startup warm-up), not at import.
 """
 import os
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import re
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy.dialects import postgresql, sqlite
+from app.config import settings
+from app.database import SessionLocal
+from app.models.sheets_row_index import SheetsRowIndex
+from app.utils.metrics import SHEETS_API_REQUESTS
 
 # Google Sheets API setup
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 SPREADSHEET_ID = os.getenv('GOOGLE_SHEETS_ID', '')  # Set in .env file
 CREDENTIALS_FILE = os.getenv('GOOGLE_CREDENTIALS_FILE', 'google-credentials.json')
+# Wait before retrying a failed client initialization
+INIT_RETRY_SECONDS = 60
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for the Sheets API per-minute quota
+
+    acquire() blocks the calling (worker) thread until a token is available,
+    so bursts are smoothed instead of failing with 429 responses. The bucket
+    is per process; see sheets_quota_per_worker() for how the project quota
+    is split between processes.
+    """
+
+    def __init__(self, per_minute: float):
+        if per_minute <= 0:
+            raise ValueError(f"Sheets API quota must be positive, got {per_minute} requests per minute")
+        self.rate = per_minute / 60.0
+        # Hold at least one token, or a quota share below 1/minute would never be granted
+        self.capacity = max(1.0, float(per_minute))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def sheets_quota_per_worker() -> float:
+    """
+    This process's share of SHEETS_API_REQUESTS_PER_MINUTE
+
+    Every worker process runs its own outbox worker and token bucket, so
+    the project-wide quota is divided by SHEETS_OUTBOX_WORKERS.
+
+    Raises:
+        ValueError: If either setting is below 1
+    """
+    if settings.SHEETS_API_REQUESTS_PER_MINUTE < 1:
+        raise ValueError("SHEETS_API_REQUESTS_PER_MINUTE must be at least 1")
+    if settings.SHEETS_OUTBOX_WORKERS < 1:
+        raise ValueError("SHEETS_OUTBOX_WORKERS must be at least 1")
+    return settings.SHEETS_API_REQUESTS_PER_MINUTE / settings.SHEETS_OUTBOX_WORKERS
+
+class DatabaseRowIndex:
+    """
+    Persisted user_id -> sheet row number mapping
+
+    Maintained on append and rebuilt by periodic reconciliation, so updates
+    can address a user's row directly instead of scanning the ID column.
+    Writes are upserts, so workers recording or rebuilding at the same time
+    never conflict on the primary key.
+    """
+
+    # Rows per INSERT statement (SQLite caps the number of bound parameters)
+    UPSERT_CHUNK_SIZE = 1000
+
+    def lookup(self, user_ids: Iterable[str]) -> Dict[str, int]:
+        db = SessionLocal()
+        try:
+            rows = db.query(SheetsRowIndex).filter(SheetsRowIndex.user_id.in_(list(user_ids))).all()
+            return {row.user_id: row.row_number for row in rows}
+        finally:
+            db.close()
+
+    def record(self, row_numbers: Dict[str, int]):
+        db = SessionLocal()
+        try:
+            self._upsert(db, row_numbers, datetime.utcnow())
+            db.commit()
+        finally:
+            db.close()
+
+    def replace(self, row_numbers: Dict[str, int]):
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            self._upsert(db, row_numbers, now)
+            # Users no longer in the sheet are the entries this rebuild did not touch
+            db.query(SheetsRowIndex).filter(SheetsRowIndex.updated_at < now).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _upsert(self, db, row_numbers: Dict[str, int], now: datetime):
+        dialect = postgresql if db.get_bind().dialect.name == 'postgresql' else sqlite
+        items = list(row_numbers.items())
+        for start in range(0, len(items), self.UPSERT_CHUNK_SIZE):
+            stmt = dialect.insert(SheetsRowIndex).values([
+                {'user_id': user_id, 'row_number': row_number, 'updated_at': now}
+                for user_id, row_number in items[start:start + self.UPSERT_CHUNK_SIZE]
+            ])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[SheetsRowIndex.user_id],
+                set_={'row_number': stmt.excluded.row_number, 'updated_at': stmt.excluded.updated_at}
+            ))
 
 class GoogleSheetsService:
-    def __init__(self):
-        self.service = None
-        self.initialized = False
-        self._initialize()
+    def __init__(self, service=None, row_index=None):
+        """
+        Args:
+            service: Pre-built Sheets API client (e.g. a fake for tests);
+                when omitted the client is built from the service account file
+            row_index: user_id -> row number store (defaults to the database)
+        """
+        self.service = service
+        self.row_index = row_index if row_index is not None else DatabaseRowIndex()
+        self.index_reconciled_at = None
+        self.quota = TokenBucket(sheets_quota_per_worker())
+        self.initialized = service is not None
+        # Whether sync is configured at all; writes are not queued otherwise
+        self.enabled = self.initialized or (bool(SPREADSHEET_ID) and os.path.exists(CREDENTIALS_FILE))
+        self._init_lock = threading.Lock()
+        self._next_init_attempt = 0.0
+
+    def ensure_initialized(self) -> bool:
+        """
+        Build the API client on first use
+
+        Safe to call from several threads; a failed attempt is retried
+        after INIT_RETRY_SECONDS.
+
+        Returns:
+            Whether the service is ready to make API calls
+        """
+        if self.initialized or not self.enabled:
+            return self.initialized
+
+        with self._init_lock:
+            if not self.initialized and time.monotonic() >= self._next_init_attempt:
+                self._next_init_attempt = time.monotonic() + INIT_RETRY_SECONDS
+                self._initialize()
+        return self.initialized
 
     def _initialize(self):
         """Initialize Google Sheets API client"""
@@ -33,6 +175,10 @@ class GoogleSheetsService:
                 print("[Google Sheets] Skipping initialization.")
                 return
 
+            # Imported here: the Google client libraries are slow to import
+            from google.oauth2.service_account import Credentials
+            from googleapiclient.discovery import build
+
             creds = Credentials.from_service_account_file(
                 CREDENTIALS_FILE,
                 scopes=SCOPES
@@ -50,6 +196,8 @@ class GoogleSheetsService:
 
     def _ensure_headers(self):
         """Ensure the spreadsheet has proper headers"""
+        from googleapiclient.errors import HttpError
+
         if not self.initialized:
             return
 
@@ -62,24 +210,163 @@ class GoogleSheetsService:
 
         try:
             # Check if headers already exist
-            result = self.service.spreadsheets().values().get(
+            result = self._execute('get', self.service.spreadsheets().values().get(
                 spreadsheetId=SPREADSHEET_ID,
                 range='Sheet1!A1:R1'
-            ).execute()
+            ))
 
             if 'values' not in result:
                 # Add headers if they don't exist
-                self.service.spreadsheets().values().update(
+                self._execute('update', self.service.spreadsheets().values().update(
                     spreadsheetId=SPREADSHEET_ID,
                     range='Sheet1!A1:R1',
                     valueInputOption='RAW',
                     body={'values': headers}
-                ).execute()
+                ))
                 print("[Google Sheets] Headers initialized")
 
         except HttpError as e:
             print(f"[Google Sheets] Error ensuring headers: {e}")
 
+    def append_users(self, users: List[dict]) -> int:
+        """
+        Append one row per user in a single API call
+
+        Args:
+            users: User data dictionaries (see user_sheet_data)
+
+        Returns:
+            Number of rows appended
+
+        Raises:
+            HttpError: If the Sheets API call fails
+        """
+        if not users:
+            return 0
+        self._require_initialized()
+
+        registration_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        result = self._execute('append', self.service.spreadsheets().values().append(
+            spreadsheetId=SPREADSHEET_ID,
+            range='Sheet1!A:R',
+            valueInputOption='RAW',
+            insertDataOption='INSERT_ROWS',
+            body={'values': [_user_row(user, registration_date) for user in users]}
+        ))
+
+        # Record where the rows landed, e.g. "Sheet1!A120:R122". The rows are
+        # already written, so an index failure must not fail the batch (a retry
+        # would append them again); the next update reconciles the index instead.
+        updated_range = result.get('updates', {}).get('updatedRange', '')
+        match = re.search(r'![A-Z]+(\d+)', updated_range)
+        if not match:
+            print(f"[Google Sheets] Unexpected append range {updated_range!r}, row index will be rebuilt")
+            self.index_reconciled_at = None
+            return len(users)
+        first_row = int(match.group(1))
+        try:
+            self.row_index.record({
+                str(user.get('id', '')): first_row + offset
+                for offset, user in enumerate(users)
+            })
+        except Exception as e:
+            print(f"[Google Sheets] Failed to record appended rows, row index will be rebuilt: {e}")
+            self.index_reconciled_at = None
+        return len(users)
+
+    def reconcile_row_index(self):
+        """Rebuild the row index from a full scan of the user ID column"""
+        result = self._execute('get', self.service.spreadsheets().values().get(
+            spreadsheetId=SPREADSHEET_ID,
+            range='Sheet1!A:A'
+        ))
+        self.row_index.replace({
+            row[0]: idx + 1
+            for idx, row in enumerate(result.get('values', []))
+            if row and idx > 0  # Skip the header row
+        })
+        self.index_reconciled_at = time.monotonic()
+
+    def _verified_rows(self, row_numbers: Dict[str, int]) -> Dict[str, int]:
+        """
+        Drop index entries whose row no longer holds that user
+
+        Reads only the ID cell of each indexed row, so the check stays
+        cheap however large the sheet grows. Guards against overwriting
+        another user's row after rows were moved by hand.
+        """
+        if not row_numbers:
+            return {}
+
+        user_ids = list(row_numbers)
+        result = self._execute('batchGet', self.service.spreadsheets().values().batchGet(
+            spreadsheetId=SPREADSHEET_ID,
+            ranges=[f'Sheet1!A{row_numbers[user_id]}' for user_id in user_ids]
+        ))
+
+        verified = {}
+        for user_id, value_range in zip(user_ids, result.get('valueRanges', [])):
+            values = value_range.get('values', [])
+            if values and values[0] and values[0][0] == user_id:
+                verified[user_id] = row_numbers[user_id]
+        return verified
+
+    def update_users(self, users: List[dict]) -> int:
+        """
+        Rewrite the rows of existing users with one values.batchUpdate
+
+        The registration date column is left untouched. Users without a
+        row yet are appended instead.
+
+        Returns:
+            Number of users written
+
+        Raises:
+            HttpError: If a Sheets API call fails
+        """
+        if not users:
+            return 0
+        self._require_initialized()
+
+        # Find the rows of these users via the row index
+        user_ids = {str(user.get('id', '')) for user in users}
+        reconciled = False
+        if (self.index_reconciled_at is None
+                or time.monotonic() - self.index_reconciled_at > settings.SHEETS_ROW_INDEX_RECONCILE_SECONDS):
+            self.reconcile_row_index()
+            reconciled = True
+
+        row_numbers = self.row_index.lookup(user_ids)
+        if not reconciled:
+            row_numbers = self._verified_rows(row_numbers)
+        if len(row_numbers) < len(user_ids) and not reconciled:
+            # Unindexed or moved rows: rebuild the index from the sheet once
+            self.reconcile_row_index()
+            row_numbers = self.row_index.lookup(user_ids)
+
+        data = []
+        missing = []
+        for user in users:
+            row_number = row_numbers.get(str(user.get('id', '')))
+            if row_number is None:
+                missing.append(user)
+                continue
+            row = _user_row(user, '')
+            data.append({'range': f'Sheet1!A{row_number}:N{row_number}', 'values': [row[:14]]})
+            data.append({'range': f'Sheet1!P{row_number}:R{row_number}', 'values': [row[15:]]})
+
+        if data:
+            self._execute('batchUpdate', self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=SPREADSHEET_ID,
+                body={'valueInputOption': 'RAW', 'data': data}
+            ))
+
+        if missing:
+            print(f"[Google Sheets] {len(missing)} user(s) not found, creating new entries")
+            self.append_users(missing)
+
+        return len(users)
+
     def sync_user(self, user_data: dict):
         """
         Sync user data to Google Sheets
@@ -87,45 +374,16 @@ class GoogleSheetsService:
         Args:
             user_data: Dictionary containing user information
         """
-        if not self.initialized:
+        from googleapiclient.errors import HttpError
+
+        if not self.ensure_initialized():
             print("[Google Sheets] Not initialized, skipping sync")
             return False
 
         try:
-            # Prepare row data
-            row = [
-                user_data.get('id', ''),
-                user_data.get('customer_id', ''),
-                user_data.get('name', ''),
-                user_data.get('email', ''),
-                user_data.get('country', ''),
-                user_data.get('nationality', ''),
-                user_data.get('phone', ''),
-                user_data.get('preferred_language', 'en'),
-                user_data.get('passport_number', ''),
-                user_data.get('date_of_birth', ''),
-                user_data.get('passport_expiry', ''),
-                user_data.get('provider', 'email'),
-                user_data.get('provider_id', ''),
-                user_data.get('profile_picture', ''),
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # Registration date
-                user_data.get('last_login', ''),
-                user_data.get('created_at', ''),
-                user_data.get('updated_at', '')
-            ]
-
-            # Append to spreadsheet
-            self.service.spreadsheets().values().append(
-                spreadsheetId=SPREADSHEET_ID,
-                range='Sheet1!A:R',
-                valueInputOption='RAW',
-                insertDataOption='INSERT_ROWS',
-                body={'values': [row]}
-            ).execute()
-
+            self.append_users([user_data])
             print(f"[Google Sheets] Successfully synced user: {user_data.get('email')}")
             return True
-
         except HttpError as e:
             print(f"[Google Sheets] Error syncing user: {e}")
             return False
@@ -141,61 +399,16 @@ class GoogleSheetsService:
             user_id: User ID to find
             user_data: Updated user information
         """
-        if not self.initialized:
+        from googleapiclient.errors import HttpError
+
+        if not self.ensure_initialized():
             print("[Google Sheets] Not initialized, skipping update")
             return False
 
         try:
-            # Find the row with this user_id
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=SPREADSHEET_ID,
-                range='Sheet1!A:A'
-            ).execute()
-
-            values = result.get('values', [])
-            row_number = None
-
-            for idx, row in enumerate(values):
-                if row and row[0] == user_id:
-                    row_number = idx + 1
-                    break
-
-            if row_number is None:
-                print(f"[Google Sheets] User {user_id} not found, creating new entry")
-                return self.sync_user(user_data)
-
-            # Update the row
-            row = [
-                user_data.get('id', ''),
-                user_data.get('customer_id', ''),
-                user_data.get('name', ''),
-                user_data.get('email', ''),
-                user_data.get('country', ''),
-                user_data.get('nationality', ''),
-                user_data.get('phone', ''),
-                user_data.get('preferred_language', 'en'),
-                user_data.get('passport_number', ''),
-                user_data.get('date_of_birth', ''),
-                user_data.get('passport_expiry', ''),
-                user_data.get('provider', 'email'),
-                user_data.get('provider_id', ''),
-                user_data.get('profile_picture', ''),
-                values[row_number - 1][14] if len(values[row_number - 1]) > 14 else '',  # Keep registration date
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # Update last login
-                user_data.get('created_at', ''),
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # Updated at
-            ]
-
-            self.service.spreadsheets().values().update(
-                spreadsheetId=SPREADSHEET_ID,
-                range=f'Sheet1!A{row_number}:R{row_number}',
-                valueInputOption='RAW',
-                body={'values': [row]}
-            ).execute()
-
+            self.update_users([{**user_data, 'id': user_id}])
             print(f"[Google Sheets] Successfully updated user: {user_data.get('email')}")
             return True
-
         except HttpError as e:
             print(f"[Google Sheets] Error updating user: {e}")
             return False
@@ -203,5 +416,103 @@ class GoogleSheetsService:
             print(f"[Google Sheets] Unexpected error: {e}")
             return False
 
+    def _execute(self, method: str, request):
+        """Run an API request once the per-minute quota allows it"""
+        self.quota.acquire()
+        SHEETS_API_REQUESTS.labels(method=method).inc()
+        return request.execute()
+
+    def _require_initialized(self):
+        if not self.ensure_initialized():
+            raise RuntimeError("Google Sheets service is not initialized")
+
+def _user_row(user_data: dict, registration_date: str) -> list:
+    """Spreadsheet row (columns A-R) for a user"""
+    return [
+        user_data.get('id', ''),
+        user_data.get('customer_id', ''),
+        user_data.get('name', ''),
+        user_data.get('email', ''),
+        user_data.get('country', ''),
+        user_data.get('nationality', ''),
+        user_data.get('phone', ''),
+        user_data.get('preferred_language', 'en'),
+        user_data.get('passport_number', ''),
+        user_data.get('date_of_birth', ''),
+        user_data.get('passport_expiry', ''),
+        user_data.get('provider', 'email'),
+        user_data.get('provider_id', ''),
+        user_data.get('profile_picture', ''),
+        registration_date,
+        user_data.get('last_login', ''),
+        user_data.get('created_at', ''),
+        user_data.get('updated_at', '')
+    ]
+
+class SheetsWriteBuffer:
+    """
+    Write-behind buffer that coalesces pending writes per user
+
+    Several changes to one user (login, language switch, profile edit)
+    collapse into a single row write carrying the latest data, and all
+    buffered users go out as one append plus one batchUpdate.
+    """
+
+    def __init__(self, sheets: "GoogleSheetsService"):
+        self.sheets = sheets
+        # user_id -> (needs a new row, latest user data)
+        self._pending: Dict[str, Tuple[bool, dict]] = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, user_id: str, user_data: dict, is_new: bool = False):
+        """Buffer a write; later data for the same user replaces earlier data"""
+        previous = self._pending.get(user_id)
+        self._pending[user_id] = ((previous is not None and previous[0]) or is_new, user_data)
+
+    def flush(self) -> Dict[str, Exception]:
+        """
+        Send all buffered writes and clear the buffer
+
+        Returns:
+            Mapping of user_id to the error for writes that failed
+        """
+        appends = {uid: data for uid, (is_new, data) in self._pending.items() if is_new}
+        updates = {uid: data for uid, (is_new, data) in self._pending.items() if not is_new}
+        self._pending = {}
+
+        failures = {}
+        for batch, send in ((appends, self.sheets.append_users), (updates, self.sheets.update_users)):
+            if not batch:
+                continue
+            try:
+                send(list(batch.values()))
+            except Exception as e:
+                failures.update({user_id: e for user_id in batch})
+        return failures
+
+def user_sheet_data(user) -> dict:
+    """Build the sheet payload for a User"""
+    return {
+        'id': user.id,
+        'customer_id': user.customer_id,
+        'name': user.name,
+        'email': user.email,
+        'country': user.country,
+        'nationality': user.nationality,
+        'phone': user.phone,
+        'preferred_language': user.preferred_language,
+        'passport_number': user.passport_number,
+        'date_of_birth': user.date_of_birth,
+        'passport_expiry': user.passport_expiry,
+        'provider': user.provider,
+        'provider_id': user.provider_id,
+        'profile_picture': user.profile_picture,
+        'last_login': str(user.last_login) if user.last_login else '',
+        'created_at': str(user.created_at),
+        'updated_at': str(user.updated_at) if user.updated_at else ''
+    }
+
 # Global instance
 sheets_service = GoogleSheetsService()
@@ -0,0 +1,96 @@
+"""
+Shared async HTTP client for outbound provider calls
+One connection pool per worker, opened at startup and closed at shutdown
+"""
+import asyncio
+import httpx
+from app.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent traffic
+
+    Every request deposits `ratio` tokens and every retry withdraws one,
+    so a failing provider cannot multiply our outbound load beyond
+    (1 + ratio) plus a small fixed reserve.
+    """
+
+    def __init__(self, ratio: float = 0.1, reserve: float = 10.0):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = reserve
+
+    def record_request(self):
+        self.tokens = min(self.tokens + self.ratio, self.reserve)
+
+    def try_withdraw(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+class ProviderHTTPClient:
+    def __init__(self):
+        self.client: httpx.AsyncClient = None
+        self.retry_budget = RetryBudget(ratio=settings.PROVIDER_HTTP_RETRY_RATIO)
+        self.max_retries = settings.PROVIDER_HTTP_MAX_RETRIES
+
+    async def start(self):
+        """Open the connection pool (called from the app startup hook)"""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(
+                    settings.PROVIDER_HTTP_TIMEOUT_SECONDS,
+                    connect=settings.PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.PROVIDER_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.PROVIDER_HTTP_MAX_KEEPALIVE
+                )
+            )
+
+    async def close(self):
+        """Close the connection pool (called from the app shutdown hook)"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET with retries on transport errors and 5xx responses
+
+        Retries back off exponentially and are only attempted while the
+        retry budget allows it.
+
+        Raises:
+            httpx.HTTPError: If the request could not be completed
+        """
+        if self.client is None:
+            await self.start()
+
+        attempt = 0
+        while True:
+            self.retry_budget.record_request()
+            try:
+                response = await self.client.get(url, **kwargs)
+                if response.status_code < 500 or not self._can_retry(attempt):
+                    return response
+            except httpx.TransportError:
+                if not self._can_retry(attempt):
+                    raise
+
+            await asyncio.sleep(0.05 * (2 ** attempt))
+            attempt += 1
+
+    def _can_retry(self, attempt: int) -> bool:
+        return attempt < self.max_retries and self.retry_budget.try_withdraw()
+
+# Global instance
+provider_http = ProviderHTTPClient()
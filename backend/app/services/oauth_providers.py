@@ -0,0 +1,223 @@
+"""
+OAuth provider framework
+Each provider turns a frontend-supplied token into a normalised profile;
+the shared upsert then creates or updates the user in a single statement
+"""
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.user import User, generate_customer_id
+from app.services.http_client import provider_http
+from app.services.google_id_token import InvalidIdToken, looks_like_id_token, verify_google_id_token
+from app.utils.metrics import OAUTH_PROVIDER_LATENCY
+
+# OAuth Configuration
+GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID', '')
+GOOGLE_CLIENT_SECRET = os.getenv('GOOGLE_CLIENT_SECRET', '')
+GOOGLE_REDIRECT_URI = os.getenv('GOOGLE_REDIRECT_URI', 'http://localhost:3000/auth/callback/google')
+# ID tokens may be issued for any of our clients (web, iOS, Android), comma-separated
+GOOGLE_CLIENT_IDS = [c.strip() for c in GOOGLE_CLIENT_ID.split(',') if c.strip()]
+
+FACEBOOK_APP_ID = os.getenv('FACEBOOK_APP_ID', '')
+FACEBOOK_APP_SECRET = os.getenv('FACEBOOK_APP_SECRET', '')
+FACEBOOK_REDIRECT_URI = os.getenv('FACEBOOK_REDIRECT_URI', 'http://localhost:3000/auth/callback/facebook')
+
+KAKAO_CLIENT_ID = os.getenv('KAKAO_CLIENT_ID', '')
+KAKAO_CLIENT_SECRET = os.getenv('KAKAO_CLIENT_SECRET', '')
+KAKAO_REDIRECT_URI = os.getenv('KAKAO_REDIRECT_URI', 'http://localhost:3000/auth/callback/kakao')
+
+# Provider profile endpoints (overridable to point at a local stub server)
+GOOGLE_USERINFO_URL = os.getenv('GOOGLE_USERINFO_URL', 'https://www.googleapis.com/oauth2/v3/userinfo')
+FACEBOOK_ME_URL = os.getenv('FACEBOOK_ME_URL', 'https://graph.facebook.com/me')
+KAKAO_ME_URL = os.getenv('KAKAO_ME_URL', 'https://kapi.kakao.com/v2/user/me')
+
+class OAuthProviderError(Exception):
+    """Raised when a provider rejects the token or returns an unusable profile"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+@dataclass
+class OAuthProfile:
+    """User profile as reported by an OAuth provider"""
+    provider: str
+    provider_id: str
+    email: Optional[str]
+    name: str = ''
+    picture: str = ''
+
+class OAuthProvider:
+    """Base class for social login providers"""
+    name = ''
+    display_name = ''
+
+    async def fetch_profile(self, token: str) -> OAuthProfile:
+        """
+        Resolve a token to a profile, recording provider latency
+
+        Raises:
+            OAuthProviderError: If the token is invalid or no email is available
+            httpx.HTTPError: If the provider could not be reached
+        """
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            profile = await self._fetch_profile(token)
+            if not profile.email:
+                raise OAuthProviderError(400, self.missing_email_detail())
+            outcome = 'ok'
+            return profile
+        except OAuthProviderError:
+            outcome = 'rejected'
+            raise
+        finally:
+            OAUTH_PROVIDER_LATENCY.labels(provider=self.name, outcome=outcome).observe(
+                time.perf_counter() - start
+            )
+
+    async def _fetch_profile(self, token: str) -> OAuthProfile:
+        raise NotImplementedError
+
+    def missing_email_detail(self) -> str:
+        return f"Email not provided by {self.display_name}"
+
+    def invalid_token_error(self) -> OAuthProviderError:
+        return OAuthProviderError(401, f"Invalid {self.display_name} access token")
+
+class GoogleProvider(OAuthProvider):
+    name = 'google'
+    display_name = 'Google'
+
+    async def _fetch_profile(self, token: str) -> OAuthProfile:
+        if looks_like_id_token(token):
+            # ID tokens are verified locally against Google's cached signing keys
+            try:
+                google_user = await verify_google_id_token(token, GOOGLE_CLIENT_IDS)
+            except InvalidIdToken as e:
+                raise OAuthProviderError(401, f"Invalid Google ID token: {e}")
+
+            if not google_user.get('email_verified'):
+                raise OAuthProviderError(400, "Email not verified by Google")
+        else:
+            # Access tokens are checked with the userinfo endpoint
+            response = await provider_http.get(
+                GOOGLE_USERINFO_URL,
+                headers={'Authorization': f'Bearer {token}'}
+            )
+            if response.status_code != 200:
+                raise self.invalid_token_error()
+            google_user = response.json()
+
+        return OAuthProfile(
+            provider=self.name,
+            provider_id=google_user.get('sub'),
+            email=google_user.get('email'),
+            name=google_user.get('name', ''),
+            picture=google_user.get('picture', '')
+        )
+
+class FacebookProvider(OAuthProvider):
+    name = 'facebook'
+    display_name = 'Facebook'
+
+    async def _fetch_profile(self, token: str) -> OAuthProfile:
+        response = await provider_http.get(
+            FACEBOOK_ME_URL,
+            params={'fields': 'id,name,email,picture', 'access_token': token}
+        )
+        if response.status_code != 200:
+            raise self.invalid_token_error()
+
+        fb_user = response.json()
+        return OAuthProfile(
+            provider=self.name,
+            provider_id=fb_user.get('id'),
+            email=fb_user.get('email'),
+            name=fb_user.get('name', ''),
+            picture=fb_user.get('picture', {}).get('data', {}).get('url', '')
+        )
+
+class KakaoProvider(OAuthProvider):
+    name = 'kakao'
+    display_name = 'Kakao'
+
+    async def _fetch_profile(self, token: str) -> OAuthProfile:
+        response = await provider_http.get(
+            KAKAO_ME_URL,
+            headers={'Authorization': f'Bearer {token}'}
+        )
+        if response.status_code != 200:
+            raise self.invalid_token_error()
+
+        kakao_user = response.json()
+        kakao_account = kakao_user.get('kakao_account', {})
+        profile = kakao_account.get('profile', {})
+        return OAuthProfile(
+            provider=self.name,
+            provider_id=str(kakao_user.get('id')),
+            email=kakao_account.get('email'),
+            name=profile.get('nickname', ''),
+            picture=profile.get('profile_image_url', '')
+        )
+
+    def missing_email_detail(self) -> str:
+        return "Email not provided by Kakao. Please allow email access."
+
+OAUTH_PROVIDERS: Dict[str, OAuthProvider] = {
+    provider.name: provider
+    for provider in (GoogleProvider(), FacebookProvider(), KakaoProvider())
+}
+
+def upsert_oauth_user(db: Session, profile: OAuthProfile) -> Tuple[User, bool]:
+    """
+    Create or update the user for an OAuth profile in one statement
+
+    Uses INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING, so two
+    simultaneous first logins with the same email cannot collide on the
+    unique constraint. Existing users keep their name and country; only
+    the provider link, picture and login time are refreshed. The caller
+    commits, after reading what it needs from the returned user (commit
+    expires it).
+
+    Returns:
+        (user, created) where created is True if the row was inserted
+    """
+    now = datetime.utcnow()
+    new_id = str(uuid.uuid4())
+    dialect = postgresql if db.get_bind().dialect.name == 'postgresql' else sqlite
+
+    stmt = dialect.insert(User).values(
+        id=new_id,
+        customer_id=generate_customer_id(),
+        email=profile.email,
+        name=profile.name,
+        country='Unknown',  # Can be updated later in profile
+        provider=profile.provider,
+        provider_id=profile.provider_id,
+        profile_picture=profile.picture,
+        last_login=now,
+        created_at=now,
+        updated_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={
+            'provider': stmt.excluded.provider,
+            'provider_id': stmt.excluded.provider_id,
+            'profile_picture': stmt.excluded.profile_picture,
+            'last_login': stmt.excluded.last_login,
+            'updated_at': stmt.excluded.updated_at,
+        }
+    ).returning(User)
+
+    user = db.scalars(stmt, execution_options={'populate_existing': True}).one()
+
+    # Conflicting rows keep their original id
+    return user, user.id == new_id
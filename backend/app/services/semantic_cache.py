@@ -0,0 +1,204 @@
+"""
+Semantic chatbot cache
+Answers first-turn questions that are worded differently but mean the same
+("How do I earn OMNI Points?" / "how to earn omni points") from earlier replies.
+Questions are embedded with a hashed character n-gram vectorizer (CPU only,
+no model download) and matched by cosine similarity against a per-language
+NumPy index. Run benchmarks/semantic_cache_eval.py after changing the
+vectorizer or the threshold.
+"""
+import re
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.utils.metrics import CACHE_ENTRIES
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Han, Hangul syllables and kana: scripts whose words are too short (or not
+# space-separated) to compare as words, so they are compared per character
+_CJK = "\u3040-\u30ff\u4e00-\u9fff\uac00-\ud7a3"
+_CJK_CHAR = re.compile(f"[{_CJK}]")
+_UNIT = re.compile(f"[{_CJK}]|[^\\W{_CJK}]+")
+
+# Words that carry no intent; ignored as whole-word features
+STOP_WORDS = frozenset(
+    "a an the i me my we you your it is are am be do does did can could would should "
+    "will to of in on at for with about how what where when which who please tell "
+    "there any some this that and or".split()
+)
+
+class HashedNgramVectorizer:
+    """
+    Maps text to a fixed-size, L2-normalised vector
+
+    Features are whole words (minus stop words) and character n-grams
+    within each word, hashed into `dim` buckets with a random sign so
+    collisions cancel out rather than accumulate. Character n-grams make
+    it work for languages without spaces (ko, ja, zh) and tolerate typos
+    and inflections.
+    """
+
+    def __init__(self, dim: int = 2048, ngram_range: Tuple[int, int] = (2, 4)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def features(self, text: str) -> List[str]:
+        features = []
+        for word in _WORD.findall(text.casefold()):
+            if word not in STOP_WORDS:
+                features.append(f"w:{word}")
+                # Whole words count more than their n-grams
+                features.append(f"w:{word}")
+            padded = f"<{word}>"
+            for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+                features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def transform(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self.features(text):
+            # crc32 rather than hash(): stable across processes
+            h = zlib.crc32(feature.encode())
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+def content_units(text: str) -> List[str]:
+    """
+    Words that carry the meaning of a question
+
+    Han, Hangul and kana characters count individually: Korean words are
+    mostly two syllables and zh/ja text has no spaces, so "서울" / "부산" or
+    "ソウル" / "プサン" would otherwise leave no words to compare. Other words
+    count if they are not stop words and have three or more letters.
+    """
+    units = []
+    for unit in _UNIT.findall(text.casefold()):
+        if _CJK_CHAR.match(unit) or (unit not in STOP_WORDS and len(unit) >= 3):
+            units.append(unit)
+    return units
+
+def _trigrams(word: str) -> set:
+    padded = f"<{word}>"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def count_unmatched(question: List[str], cached: List[str]) -> int:
+    """
+    Number of content words in `question` with no counterpart in `cached`
+
+    Words match on trigram overlap (Dice >= 0.5) so inflections still
+    match; Han, Hangul and kana characters match exactly.
+    """
+    cached_trigrams = [_trigrams(word) for word in cached if not _CJK_CHAR.match(word)]
+    unmatched = 0
+    for word in question:
+        if _CJK_CHAR.match(word):
+            unmatched += word not in cached
+            continue
+        trigrams = _trigrams(word)
+        if not any(2 * len(trigrams & other) >= len(trigrams) + len(other) for other in cached_trigrams):
+            unmatched += 1
+    return unmatched
+
+class _LanguageIndex:
+    """Fixed-capacity ring buffer of question vectors and their answers"""
+
+    def __init__(self, dim: int, capacity: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.answers: List[Optional[dict]] = [None] * capacity
+        self.questions: List[List[str]] = [[] for _ in range(capacity)]
+        self.expires_at = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+        self.next_slot = 0
+
+    def add(self, vector: np.ndarray, question: List[str], answer: dict, expires_at: float):
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.questions[slot] = question
+        self.answers[slot] = answer
+        self.expires_at[slot] = expires_at
+        self.next_slot = (slot + 1) % len(self.answers)
+        self.size = min(self.size + 1, len(self.answers))
+
+    def best_match(self, vector: np.ndarray, now: float) -> Tuple[int, float]:
+        if not self.size:
+            return -1, 0.0
+        scores = self.vectors[:self.size] @ vector
+        scores[self.expires_at[:self.size] <= now] = -1.0
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+
+class SemanticCache:
+    """
+    Per-language index of past first-turn questions and their answers
+
+    A lookup returns the answer of the most similar cached question if its
+    cosine similarity is at least `threshold` and the two questions have
+    exactly the same content words (see lookup()). Each language keeps at most
+    `max_entries` questions (oldest replaced first); entries expire after
+    `ttl_seconds`. The index is per worker and lives in memory; a brute-force
+    matrix product over a few thousand vectors takes well under a millisecond.
+    """
+
+    def __init__(self, threshold: float, ttl_seconds: int, max_entries: int = 2000,
+                 vectorizer: HashedNgramVectorizer = None):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+        self._indexes: Dict[Tuple[str, str], _LanguageIndex] = {}
+
+    def lookup(self, namespace: str, language: str, question: str) -> Tuple[Optional[dict], float]:
+        """
+        Find a cached answer for a question
+
+        Args:
+            namespace: Keeps unrelated caches apart (e.g. provider, model and endpoint)
+            language: Response language
+            question: The user's question
+
+        Returns:
+            (answer, similarity); answer is None below the threshold
+        """
+        index = self._indexes.get((namespace, language))
+        if index is None:
+            return None, 0.0
+        slot, score = index.best_match(self.vectorizer.transform(question), time.monotonic())
+        if slot < 0 or score < self.threshold:
+            return None, score
+        # Similarity alone scores questions that differ in one entity too high
+        # ("attractions in Busan" vs "in Seoul", "spend" vs "earn"), so both
+        # questions must have the same content words. A single extra word in
+        # the cached question is enough to make its answer wrong here: a name
+        # ("Hi, I am Minsu") gets another user's personalised reply.
+        units = content_units(question)
+        cached = index.questions[slot]
+        if count_unmatched(units, cached) > 0 or count_unmatched(cached, units) > 0:
+            return None, score
+        return index.answers[slot], score
+
+    def entry_count(self) -> int:
+        return sum(index.size for index in self._indexes.values())
+
+    def add(self, namespace: str, language: str, question: str, answer: dict):
+        index = self._indexes.get((namespace, language))
+        if index is None:
+            index = self._indexes[(namespace, language)] = _LanguageIndex(
+                self.vectorizer.dim, self.max_entries
+            )
+        index.add(
+            self.vectorizer.transform(question),
+            content_units(question),
+            answer,
+            time.monotonic() + self.ttl_seconds
+        )
+
+# Global instance
+semantic_cache = SemanticCache(
+    threshold=settings.CHATBOT_SEMANTIC_CACHE_THRESHOLD,
+    ttl_seconds=settings.CHATBOT_CACHE_TTL_SECONDS,
+    max_entries=settings.CHATBOT_SEMANTIC_CACHE_MAX_ENTRIES
+)
+CACHE_ENTRIES.labels(cache="chatbot_semantic").set_function(semantic_cache.entry_count)
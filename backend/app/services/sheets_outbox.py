@@ -0,0 +1,206 @@
+"""
+Google Sheets outbox
+User changes enqueue a Sheets write in the same DB transaction; a background
+worker drains the queue in batches so request latency never depends on Google
+"""
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.sheets_outbox import SheetsOutbox, OutboxOperation, OutboxStatus
+from app.services.google_sheets import SheetsWriteBuffer, sheets_service, user_sheet_data
+from app.utils.metrics import SHEETS_OUTBOX_BACKLOG, SHEETS_OUTBOX_EVENTS
+
+def enqueue_user_sync(db: Session, user, operation: OutboxOperation):
+    """
+    Queue a Sheets write for a user as part of the caller's transaction
+
+    Call after the user has been flushed (so defaults such as id are set)
+    and before commit. Nothing is queued when Sheets sync is not configured.
+    """
+    if not sheets_service.enabled:
+        return
+
+    db.add(SheetsOutbox(
+        user_id=str(user.id),
+        operation=operation,
+        payload=json.dumps(user_sheet_data(user), default=str),
+        # Hold the write briefly so follow-up changes coalesce into it
+        next_attempt_at=datetime.utcnow() + timedelta(seconds=settings.SHEETS_WRITE_COALESCE_SECONDS)
+    ))
+
+class SheetsOutboxWorker:
+    """
+    Polls the outbox and sends pending writes as batched Sheets API calls
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED and leased for
+    SHEETS_OUTBOX_CLAIM_SECONDS (claimed_until), so several workers can
+    drain concurrently without keeping a transaction open while they talk
+    to Google; rows of a worker that dies are picked up once the lease
+    runs out. When a user's oldest write falls due, all of that
+    user's pending writes are coalesced into one row write through
+    SheetsWriteBuffer. Successful rows are deleted; failed rows are
+    retried with exponential backoff and marked dead after
+    SHEETS_OUTBOX_MAX_ATTEMPTS.
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task = None
+
+    def start(self):
+        if self._task is None and sheets_service.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                sent = await asyncio.to_thread(self.drain_once)
+            except Exception as e:
+                print(f"[Sheets Outbox] Drain failed: {e}")
+                sent = 0
+            # Keep draining while there is a backlog
+            if sent < settings.SHEETS_OUTBOX_BATCH_SIZE:
+                try:
+                    await asyncio.to_thread(self.record_backlog)
+                except Exception as e:
+                    print(f"[Sheets Outbox] Backlog check failed: {e}")
+                await asyncio.sleep(settings.SHEETS_OUTBOX_POLL_SECONDS)
+
+    def drain_once(self) -> int:
+        """
+        Send one batch of due outbox rows
+
+        Rows are claimed in one short transaction and settled in another;
+        the Sheets API calls (and quota waits) in between hold no
+        connection or row lock.
+
+        Returns:
+            Number of rows sent successfully
+        """
+        if not sheets_service.ensure_initialized():
+            return 0
+
+        lease = datetime.utcnow() + timedelta(seconds=settings.SHEETS_OUTBOX_CLAIM_SECONDS)
+        claimed = self._claim(lease)
+        if not claimed:
+            return 0
+
+        buffer = SheetsWriteBuffer(sheets_service)
+        for _, user_id, operation, payload in claimed:
+            buffer.add(user_id, json.loads(payload), is_new=operation == OutboxOperation.SYNC)
+        failures = buffer.flush()
+        if failures:
+            print(f"[Sheets Outbox] Failed to send writes for {len(failures)} user(s): "
+                  f"{next(iter(failures.values()))}")
+
+        return self._settle([row_id for row_id, *_ in claimed], lease, failures)
+
+    def _claim(self, lease: datetime) -> list:
+        """
+        Lease a batch of due rows and commit
+
+        Returns:
+            (id, user_id, operation, payload) of the claimed rows, oldest first
+        """
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            # Users with a batch in flight on another worker wait for it, so their writes stay in order
+            in_flight = db.query(SheetsOutbox.user_id).filter(SheetsOutbox.claimed_until > now)
+            rows = db.query(SheetsOutbox).filter(
+                SheetsOutbox.status == OutboxStatus.PENDING,
+                SheetsOutbox.next_attempt_at <= now,
+                SheetsOutbox.user_id.notin_(in_flight)
+            ).order_by(SheetsOutbox.id).limit(
+                settings.SHEETS_OUTBOX_BATCH_SIZE
+            ).with_for_update(skip_locked=True).all()
+
+            if not rows:
+                return []
+
+            # Pull in later writes for the same users so they go out together
+            due_ids = {row.id for row in rows}
+            rows += db.query(SheetsOutbox).filter(
+                SheetsOutbox.status == OutboxStatus.PENDING,
+                SheetsOutbox.user_id.in_({row.user_id for row in rows}),
+                SheetsOutbox.id.notin_(due_ids)
+            ).with_for_update(skip_locked=True).all()
+            rows.sort(key=lambda row: row.id)
+
+            claimed = []
+            for row in rows:
+                row.claimed_until = lease
+                claimed.append((row.id, row.user_id, row.operation, row.payload))
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+    def _settle(self, row_ids: list, lease: datetime, failures: dict) -> int:
+        """Delete the sent rows and reschedule the failed ones, if the lease is still ours"""
+        db = SessionLocal()
+        try:
+            rows = db.query(SheetsOutbox).filter(
+                SheetsOutbox.id.in_(row_ids),
+                SheetsOutbox.claimed_until == lease
+            ).all()
+            if len(rows) < len(row_ids):
+                print(f"[Sheets Outbox] Claim expired on {len(row_ids) - len(rows)} row(s) before the batch "
+                      f"finished; raise SHEETS_OUTBOX_CLAIM_SECONDS if this repeats")
+
+            sent = 0
+            for row in rows:
+                error = failures.get(row.user_id)
+                if error is not None:
+                    row.claimed_until = None
+                    self._schedule_retry(row, error)
+                else:
+                    db.delete(row)
+                    sent += 1
+            SHEETS_OUTBOX_EVENTS.labels(result="sent").inc(sent)
+
+            db.commit()
+            return sent
+        finally:
+            db.close()
+
+    def record_backlog(self):
+        """Export the number of pending and dead rows"""
+        db = SessionLocal()
+        try:
+            counts = dict(db.query(SheetsOutbox.status, func.count()).group_by(SheetsOutbox.status).all())
+        finally:
+            db.close()
+        for status in OutboxStatus:
+            SHEETS_OUTBOX_BACKLOG.labels(status=status.value).set(counts.get(status, 0))
+
+    def _schedule_retry(self, row: SheetsOutbox, error: Exception):
+        row.attempts += 1
+        row.last_error = str(error)[:1000]
+        if row.attempts >= settings.SHEETS_OUTBOX_MAX_ATTEMPTS:
+            row.status = OutboxStatus.DEAD
+            SHEETS_OUTBOX_EVENTS.labels(result="dead").inc()
+            print(f"[Sheets Outbox] Giving up on row {row.id} for user {row.user_id}: {error}")
+        else:
+            delay = min(
+                settings.SHEETS_OUTBOX_BACKOFF_SECONDS * (2 ** (row.attempts - 1)),
+                settings.SHEETS_OUTBOX_MAX_BACKOFF_SECONDS
+            )
+            row.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+            SHEETS_OUTBOX_EVENTS.labels(result="retry").inc()
+
+# Global instance
+sheets_outbox_worker = SheetsOutboxWorker()
@@ -0,0 +1,149 @@
+"""
+Admission control
+Bounds how many requests of a kind are served at once and how many may
+wait, with priority classes and per-user fairness among the waiters
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Dict
+from app.config import settings
+from app.utils.metrics import ADMISSION_ACTIVE, ADMISSION_QUEUED, ADMISSION_QUEUE_WAIT, ADMISSION_SHED
+
+# Priority classes, served in this order
+PRIORITY_AUTHENTICATED = 0
+PRIORITY_ANONYMOUS = 1
+PRIORITY_NAMES = {PRIORITY_AUTHENTICATED: "authenticated", PRIORITY_ANONYMOUS: "anonymous"}
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of queued"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded, fair wait queue
+
+    Up to `max_active` requests run at once. Further requests wait in a
+    queue of at most `max_queued` entries (and `max_queued_per_user` per
+    user); beyond that they are rejected immediately so the caller can
+    answer 429 with a Retry-After estimate. When a slot frees up, the
+    highest priority class with waiters is served, and within a class
+    users take turns, so one user's burst cannot starve everybody else.
+    Waiting longer than `queue_timeout` also rejects.
+    """
+
+    def __init__(self, name: str, max_active: int, max_queued: int,
+                 max_queued_per_user: int, queue_timeout: float):
+        self.name = name
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.max_queued_per_user = max_queued_per_user
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.queued = 0
+        # priority -> user -> waiters (oldest first); user order is the turn order
+        self._waiters: Dict[int, "OrderedDict[str, deque]"] = {}
+        # Moving average of how long a request holds its slot
+        self.service_seconds = 1.0
+
+    async def acquire(self, user: str, priority: int):
+        """
+        Wait for a slot
+
+        Raises:
+            AdmissionRejected: If the queue (or the user's share of it) is
+                full, or no slot freed up within queue_timeout
+        """
+        label = PRIORITY_NAMES.get(priority, str(priority))
+        if self.active < self.max_active and not self.queued:
+            self.active += 1
+            self._update_gauges()
+            ADMISSION_QUEUE_WAIT.labels(name=self.name, priority=label).observe(0)
+            return
+
+        if self.queued >= self.max_queued:
+            self._reject("queue_full")
+        users = self._waiters.setdefault(priority, OrderedDict())
+        waiters = users.setdefault(user, deque())
+        if len(waiters) >= self.max_queued_per_user:
+            if not waiters:
+                del users[user]
+            self._reject("user_limit")
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        self.queued += 1
+        self._update_gauges()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Granted a slot just as we gave up; hand it on
+                self.release()
+            else:
+                future.cancel()
+                self._remove(priority, user, future)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject("timeout")
+            raise
+        finally:
+            ADMISSION_QUEUE_WAIT.labels(name=self.name, priority=label).observe(time.monotonic() - start)
+
+    def release(self, service_seconds: float = None):
+        """Free a slot, passing it straight to the next waiter if there is one"""
+        if service_seconds is not None:
+            self.service_seconds += 0.1 * (service_seconds - self.service_seconds)
+
+        for priority in sorted(self._waiters):
+            users = self._waiters[priority]
+            while users:
+                user, waiters = next(iter(users.items()))
+                future = waiters.popleft()
+                self.queued -= 1
+                if waiters:
+                    users.move_to_end(user)
+                else:
+                    del users[user]
+                if not future.done():
+                    # The slot moves to the waiter; active stays the same
+                    future.set_result(None)
+                    self._update_gauges()
+                    return
+
+        self.active -= 1
+        self._update_gauges()
+
+    def _remove(self, priority: int, user: str, future: asyncio.Future):
+        users = self._waiters.get(priority, {})
+        waiters = users.get(user)
+        if waiters is not None and future in waiters:
+            waiters.remove(future)
+            self.queued -= 1
+            if not waiters:
+                del users[user]
+        self._update_gauges()
+
+    def _reject(self, reason: str):
+        ADMISSION_SHED.labels(name=self.name, reason=reason).inc()
+        # Time for the queue ahead to drain through the active slots
+        retry_after = math.ceil(self.service_seconds * (self.queued + 1) / max(self.max_active, 1))
+        raise AdmissionRejected(reason, max(1, retry_after))
+
+    def _update_gauges(self):
+        ADMISSION_ACTIVE.labels(name=self.name).set(self.active)
+        ADMISSION_QUEUED.labels(name=self.name).set(self.queued)
+
+# Global instance
+chatbot_admission = AdmissionController(
+    name="chatbot",
+    max_active=settings.CHATBOT_ADMISSION_MAX_ACTIVE,
+    max_queued=settings.CHATBOT_ADMISSION_MAX_QUEUED,
+    max_queued_per_user=settings.CHATBOT_ADMISSION_MAX_QUEUED_PER_USER,
+    queue_timeout=settings.CHATBOT_ADMISSION_QUEUE_TIMEOUT_SECONDS
+)
@@ -1,6 +1,7 @@
 """
 Authentication utilities
 """
+import hmac
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -64,3 +65,9 @@ def decode_access_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+def verify_admin_key(key: Optional[str]) -> bool:
+    """Check an X-Admin-Key value; always False when ADMIN_API_KEY is not set"""
+    if not settings.ADMIN_API_KEY or not key:
+        return False
+    return hmac.compare_digest(key.encode(), settings.ADMIN_API_KEY.encode())
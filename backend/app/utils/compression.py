@@ -0,0 +1,109 @@
+"""
+Response body compression
+Encoding negotiation, gzip/brotli compression and a cache of compressed
+bodies keyed by content hash, so an unchanged response (the same store
+page or review thread served again) is compressed once rather than per
+request
+"""
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.config import settings
+from app.utils.metrics import CACHE_ENTRIES
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Best supported encoding the client accepts: "br", "gzip" or None
+
+    Honours q=0 exclusions and the "*" wildcard; brotli is only offered when
+    the brotli package is installed.
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if BROTLI_AVAILABLE else ["gzip"]
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+class CompressedBodyCache:
+    """
+    LRU of compressed bodies keyed by (content hash, encoding)
+
+    Bounded by the total size of the compressed bodies it holds; bodies
+    larger than a quarter of the budget are not cached. Safe to use from
+    worker threads (large bodies are compressed off the event loop).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._bodies: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compress(self, body: bytes, encoding: str) -> Tuple[bytes, bool, float]:
+        """
+        Compressed body, served from the cache when this exact body was seen
+
+        Returns:
+            (compressed body, whether it was a cache hit, CPU seconds spent
+            hashing and compressing)
+        """
+        started = time.thread_time()
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        with self._lock:
+            compressed = self._bodies.get(key)
+            if compressed is not None:
+                self._bodies.move_to_end(key)
+                return compressed, True, time.thread_time() - started
+
+        compressed = compress(body, encoding)
+        if len(compressed) <= self.max_bytes // 4:
+            with self._lock:
+                if key not in self._bodies:
+                    self._bodies[key] = compressed
+                    self.size += len(compressed)
+                while self.size > self.max_bytes:
+                    _, evicted = self._bodies.popitem(last=False)
+                    self.size -= len(evicted)
+        return compressed, False, time.thread_time() - started
+
+    def entry_count(self) -> int:
+        return len(self._bodies)
+
+# Global instance
+compressed_bodies = CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+CACHE_ENTRIES.labels(cache="compressed_bodies").set_function(compressed_bodies.entry_count)
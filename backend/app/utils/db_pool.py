@@ -0,0 +1,59 @@
+"""
+Database connection pool instrumentation
+Times pool checkouts (waiting for a free connection and, when enabled, the
+liveness ping) and exports pool occupancy as Prometheus gauges
+"""
+import threading
+import time
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from app.utils.metrics import (
+    DB_POOL_CHECKOUT_WAIT, DB_POOL_IN_USE, DB_POOL_OVERFLOW, DB_POOL_PRE_PING, DB_POOL_SIZE
+)
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool recording checkout wait and pre-ping time
+
+    The wait covers taking a connection from the queue, blocking while
+    the pool is exhausted, or opening a new one. With pre_ping on, the
+    rest of the checkout is the ping round trip.
+    """
+
+    metrics_name = "primary"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait = threading.local()
+
+    def connect(self):
+        start = time.perf_counter()
+        self._wait.seconds = 0.0
+        connection = super().connect()
+        wait = self._wait.seconds
+        DB_POOL_CHECKOUT_WAIT.labels(pool=self.metrics_name).observe(wait)
+        if self._pre_ping:
+            DB_POOL_PRE_PING.labels(pool=self.metrics_name).observe(time.perf_counter() - start - wait)
+        return connection
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self._wait.seconds = time.perf_counter() - start
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+def instrument_engine(engine: Engine, name: str):
+    """Label the engine's pool metrics with `name` and export its occupancy gauges"""
+    if not isinstance(engine.pool, InstrumentedQueuePool):
+        return
+    engine.pool.metrics_name = name
+    # Read through the engine so the gauges follow a pool replaced by dispose()
+    DB_POOL_SIZE.labels(pool=name).set_function(lambda: engine.pool.size())
+    DB_POOL_IN_USE.labels(pool=name).set_function(lambda: engine.pool.checkedout())
+    DB_POOL_OVERFLOW.labels(pool=name).set_function(lambda: max(0, engine.pool.overflow()))
@@ -1,15 +1,18 @@
 """
 FastAPI dependencies for authentication
 """
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
-from app.utils.auth import decode_access_token
+from app.utils.auth import decode_access_token, verify_admin_key
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -43,3 +46,29 @@ async def get_current_user(
         raise credentials_exception
 
     return user
+
+async def get_optional_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[str]:
+    """
+    User ID from a valid bearer token, or None for anonymous callers
+
+    Only checks the token signature (no database lookup); use
+    get_current_user where the user must exist.
+    """
+    if credentials is None:
+        return None
+    payload = decode_access_token(credentials.credentials)
+    return payload.get("sub") if payload else None
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """
+    Allow only callers presenting ADMIN_API_KEY in the X-Admin-Key header
+
+    Raises:
+        HTTPException: 404 when admin endpoints are disabled, 403 for a wrong key
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not verify_admin_key(x_admin_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
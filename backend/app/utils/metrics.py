@@ -0,0 +1,205 @@
+"""
+Prometheus metrics
+Application metrics are declared here so the catalogue lives in one place
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ["method", "route", "status"]
+)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of the response",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Response body size",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+)
+
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served",
+    ["method"]
+)
+
+HTTP_COMPRESSION_INPUT_BYTES = Counter(
+    "http_compression_input_bytes_total",
+    "Response bytes before compression, for compressed responses",
+    ["route", "encoding"]
+)
+
+HTTP_COMPRESSION_SAVED_BYTES = Counter(
+    "http_compression_saved_bytes_total",
+    "Response bytes saved by compression",
+    ["route", "encoding"]
+)
+
+HTTP_COMPRESSION_CPU_SECONDS = Counter(
+    "http_compression_cpu_seconds_total",
+    "CPU time spent hashing and compressing response bodies",
+    ["route", "encoding"]
+)
+
+HTTP_COMPRESSION_CACHE = Counter(
+    "http_compression_cache_requests_total",
+    "Compressed body cache lookups",
+    ["result"]  # hit, miss
+)
+
+OAUTH_PROVIDER_LATENCY = Histogram(
+    "oauth_provider_request_seconds",
+    "Time to resolve an OAuth token to a user profile",
+    ["provider", "outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+SHEETS_OUTBOX_EVENTS = Counter(
+    "sheets_outbox_rows_total",
+    "Google Sheets outbox rows by result (sent, retry, dead)",
+    ["result"]
+)
+
+SHEETS_OUTBOX_BACKLOG = Gauge(
+    "sheets_outbox_backlog_rows",
+    "Google Sheets outbox rows waiting by status (pending, dead)",
+    ["status"]
+)
+
+SHEETS_API_REQUESTS = Counter(
+    "sheets_api_requests_total",
+    "Google Sheets API requests by method",
+    ["method"]
+)
+
+CHATBOT_TIME_TO_FIRST_TOKEN = Histogram(
+    "chatbot_time_to_first_token_seconds",
+    "Time from a streaming chat request to the first token from the provider",
+    ["provider"],
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+)
+
+CHATBOT_STREAMS = Counter(
+    "chatbot_streams_total",
+    "Streaming chat responses by outcome (completed, cancelled, error)",
+    ["provider", "outcome"]
+)
+
+CHATBOT_CACHE_REQUESTS = Counter(
+    "chatbot_cache_requests_total",
+    "Chatbot response cache lookups by prompt kind and result (hit, miss)",
+    ["kind", "result"]
+)
+
+CHATBOT_CACHE_SAVED_TOKENS = Counter(
+    "chatbot_cache_saved_tokens_total",
+    "Provider tokens not spent because the reply came from the cache",
+    ["type"]
+)
+
+CHATBOT_SEMANTIC_CACHE_REQUESTS = Counter(
+    "chatbot_semantic_cache_requests_total",
+    "Semantic (reworded question) cache lookups by prompt kind and result (hit, miss)",
+    ["kind", "result"]
+)
+
+CHATBOT_PROVIDER_CALLS = Counter(
+    "chatbot_provider_calls_total",
+    "Chatbot provider calls by outcome (ok, error, timeout, cancelled)",
+    ["provider", "outcome"]
+)
+
+CHATBOT_PROVIDER_LATENCY = Histogram(
+    "chatbot_provider_latency_seconds",
+    "Latency of successful non-streaming chatbot provider calls",
+    ["provider"],
+    buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0)
+)
+
+CHATBOT_HEDGES = Counter(
+    "chatbot_hedged_calls_total",
+    "Hedged chatbot calls by which provider answered first (primary, backup)",
+    ["winner"]
+)
+
+ADMISSION_ACTIVE = Gauge(
+    "admission_active_requests",
+    "Requests holding an admission slot",
+    ["name"]
+)
+
+ADMISSION_QUEUED = Gauge(
+    "admission_queued_requests",
+    "Requests waiting for an admission slot",
+    ["name"]
+)
+
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Time requests waited for an admission slot",
+    ["name", "priority"],
+    buckets=(0.0, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+ADMISSION_SHED = Counter(
+    "admission_shed_requests_total",
+    "Requests rejected by admission control by reason (queue_full, user_limit, timeout)",
+    ["name", "reason"]
+)
+
+DB_READ_ROUTES = Counter(
+    "db_read_sessions_total",
+    "Read-only database sessions by target (replica or primary)",
+    ["target"]
+)
+
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Last measured replication lag per replica (-1 when unreachable)",
+    ["replica"]
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool (waiting for a free one or opening one)",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+
+DB_POOL_PRE_PING = Histogram(
+    "db_pool_pre_ping_seconds",
+    "Time spent pinging connections at checkout (only with DATABASE_POOL_PRE_PING)",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured persistent connections per pool",
+    ["pool"]
+)
+
+DB_POOL_IN_USE = Gauge(
+    "db_pool_in_use_connections",
+    "Connections currently checked out",
+    ["pool"]
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond the pool size",
+    ["pool"]
+)
+
+CACHE_ENTRIES = Gauge(
+    "cache_local_entries",
+    "Entries held by per-worker in-memory caches",
+    ["cache"]
+)
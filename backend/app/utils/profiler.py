@@ -0,0 +1,157 @@
+"""
+In-process sampling profiler
+A background thread samples the Python stacks of the worker's threads at a
+fixed interval and builds speedscope-format profiles (https://speedscope.app),
+so a live worker can be profiled without restarting it or attaching py-spy
+"""
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.config import settings
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running"""
+
+class SamplingProfiler:
+    """
+    Samples every thread's stack every `interval` seconds until stopped
+
+    Overhead is one sys._current_frames() call and a stack walk per
+    interval, in a separate thread, and nothing while not running. Only one
+    profiler may run per worker at a time (see acquire()), and sampling
+    ends by itself after PROFILER_MAX_SECONDS even if stop() is never called.
+
+    The sampler can only look at other threads when it holds the GIL, which
+    it otherwise mostly gets when the event loop blocks in select(); the
+    GIL switch interval is lowered while sampling so busy coroutines are
+    not hidden behind it.
+    """
+
+    _running = threading.Lock()
+
+    def __init__(self, interval: float, thread_ids: Optional[set] = None):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.frames: List[dict] = []
+        self._frame_index: Dict[object, int] = {}
+        # thread id -> (stacks, weights)
+        self._samples: Dict[int, tuple] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._switch_interval = sys.getswitchinterval()
+
+    @classmethod
+    def acquire(cls, interval: float, thread_ids: Optional[set] = None) -> "SamplingProfiler":
+        """
+        Create a profiler, reserving the worker's single profiling slot
+
+        Raises:
+            ProfilerBusy: If another profile is running
+        """
+        if not cls._running.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running on this worker")
+        return cls(interval, thread_ids)
+
+    def start(self):
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 10))
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> dict:
+        """Stop sampling, release the slot and return the speedscope profile"""
+        try:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+            self.duration = time.perf_counter() - self.started_at
+            return self.to_speedscope()
+        finally:
+            sys.setswitchinterval(self._switch_interval)
+            self._running.release()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        deadline = self.started_at + settings.PROFILER_MAX_SECONDS
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            if now > deadline:
+                break
+            weight = now - last
+            last = now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                stacks, weights = self._samples.setdefault(thread_id, ([], []))
+                stacks.append(self._stack(frame))
+                weights.append(weight)
+
+    def _stack(self, frame) -> List[int]:
+        """Frame indexes from the outermost call to the innermost"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            index = self._frame_index.get(code)
+            if index is None:
+                index = self._frame_index[code] = len(self.frames)
+                self.frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def to_speedscope(self, name: str = "omnipass") -> dict:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        profiles = []
+        for thread_id, (stacks, weights) in self._samples.items():
+            profiles.append({
+                "type": "sampled",
+                "name": names.get(thread_id, f"thread {thread_id}"),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": stacks,
+                "weights": weights,
+            })
+        # Busiest thread first; speedscope opens the first profile
+        profiles.sort(key=lambda profile: len(profile["samples"]), reverse=True)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "omnipass-sampling-profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": self.frames},
+            "profiles": profiles,
+        }
+
+class ProfileStore:
+    """The most recent profiles of this worker, by ID"""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, dict]" = OrderedDict()
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def add(self, profile: dict, profile_id: str = None) -> str:
+        profile_id = profile_id or self.new_id()
+        self._profiles[profile_id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        return self._profiles.get(profile_id)
+
+# Global instance
+profile_store = ProfileStore(max_profiles=settings.PROFILER_MAX_STORED)
@@ -0,0 +1,108 @@
+"""
+Per-request SQL statistics
+Counts statements and database time for the current request through
+SQLAlchemy engine events, logs slow queries with their normalized SQL and
+endpoint, and checks endpoints against a declared query budget
+"""
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+# Quoted strings and bare numbers, then parameter lists, become placeholders
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMETER_LISTS = re.compile(r"\(\s*(?:\?|%\(\w+\)s)(?:\s*,\s*(?:\?|%\(\w+\)s))+\s*\)")
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when an endpoint issues more statements than its query budget (QUERY_BUDGET_ENFORCE)"""
+
+class QueryStats:
+    """Statement count and database time of one request"""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.budget_warned = False
+
+    @property
+    def endpoint(self) -> str:
+        """Method and route template, e.g. "GET /api/reviews/{review_id}" """
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}"
+
+    @property
+    def budget(self) -> Optional[int]:
+        return getattr(self.scope.get("endpoint"), "__query_budget__", None)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def start_request(scope: dict):
+    """Begin collecting statistics for a request; returns a token for end_request()"""
+    return _current.set(QueryStats(scope))
+
+def end_request(token):
+    _current.reset(token)
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+def normalize_sql(statement: str) -> str:
+    """One-line SQL with literals and parameter lists replaced, for grouping slow queries"""
+    statement = _LITERALS.sub("?", statement)
+    statement = _PARAMETER_LISTS.sub("(...)", statement)
+    return " ".join(statement.split())
+
+def query_budget(max_queries: int):
+    """
+    Declare the most SQL statements an endpoint may issue per request
+
+    Exceeding the budget is logged, or raises QueryBudgetExceeded when
+    QUERY_BUDGET_ENFORCE is set (for test and CI runs).
+
+    Example:
+        @router.get("/")
+        @query_budget(2)
+        async def get_stores(...):
+    """
+    def decorate(endpoint):
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorate
+
+def track_queries(engine: Engine):
+    """Count and time every statement the engine executes"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        endpoint = stats.endpoint if stats is not None else "background"
+        print(f"[Slow Query] {elapsed * 1000:.1f}ms {endpoint}: {normalize_sql(statement)[:1000]}")
+
+    if stats is None:
+        return
+    stats.count += 1
+    stats.seconds += elapsed
+
+    budget = stats.budget
+    if budget is not None and stats.count > budget:
+        message = f"{stats.endpoint} issued {stats.count} queries, over its budget of {budget}"
+        if settings.QUERY_BUDGET_ENFORCE:
+            raise QueryBudgetExceeded(message)
+        if not stats.budget_warned:
+            stats.budget_warned = True
+            print(f"[Query Budget] {message}")
@@ -0,0 +1,216 @@
+"""
+Rate limiting utilities
+Sliding-window counters backed by Redis with an in-memory fallback,
+plus a short-lived cache of emails that are known not to exist
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from redis.exceptions import RedisError
+from app.config import settings
+from app.utils.redis_client import redis_connector
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window counter limiter
+
+    Each scope keeps a counter for the current and the previous fixed window.
+    The estimated request count is the current count plus the previous count
+    weighted by how much of the previous window still overlaps the sliding one.
+    All scopes of one hit are checked in a single Redis round trip.
+    """
+
+    def __init__(self, prefix: str, rules: Dict[str, Tuple[int, int]], max_local_keys: int = 100_000):
+        """
+        Args:
+            prefix: Redis key prefix
+            rules: Mapping of scope name to (limit, window_seconds)
+            max_local_keys: Upper bound on keys held by the in-memory fallback
+        """
+        self.prefix = prefix
+        self.rules = rules
+        self.max_local_keys = max_local_keys
+        # key -> [window_index, current_count, previous_count]
+        self._local: Dict[str, List[int]] = {}
+
+    async def hit(self, identifiers: Dict[str, str]) -> Optional[int]:
+        """
+        Count one attempt for every scope
+
+        Args:
+            identifiers: Mapping of scope name to the identifier within that scope
+
+        Returns:
+            Seconds to wait if any scope is over its limit, otherwise None
+        """
+        now = time.time()
+        checks = []
+        for scope, identifier in identifiers.items():
+            if scope not in self.rules or not identifier:
+                continue
+            limit, window = self.rules[scope]
+            checks.append((f"{self.prefix}:{scope}:{identifier}", limit, window))
+
+        if not checks:
+            return None
+
+        counts = await self._count_redis(checks, now)
+        if counts is None:
+            counts = self._count_local(checks, now)
+
+        retry_after = None
+        for (key, limit, window), (current, previous) in zip(checks, counts):
+            elapsed = now % window
+            estimate = previous * (1 - elapsed / window) + current
+            if estimate > limit:
+                wait = max(1, math.ceil(window - elapsed))
+                retry_after = max(retry_after or 0, wait)
+
+        return retry_after
+
+    async def _count_redis(self, checks, now: float) -> Optional[List[Tuple[int, int]]]:
+        client = redis_connector.get()
+        if client is None:
+            return None
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, _, window in checks:
+                index = int(now // window)
+                pipe.incr(f"{key}:{index}")
+                pipe.expire(f"{key}:{index}", window * 2)
+                pipe.get(f"{key}:{index - 1}")
+            results = await pipe.execute()
+        except (RedisError, OSError) as e:
+            redis_connector.mark_unavailable(e)
+            return None
+
+        return [
+            (int(results[i * 3]), int(results[i * 3 + 2] or 0))
+            for i in range(len(checks))
+        ]
+
+    def _count_local(self, checks, now: float) -> List[Tuple[int, int]]:
+        if len(self._local) > self.max_local_keys:
+            self._prune(now)
+
+        counts = []
+        for key, _, window in checks:
+            index = int(now // window)
+            entry = self._local.get(key)
+            if entry is None or entry[0] < index - 1:
+                entry = [index, 0, 0]
+            elif entry[0] == index - 1:
+                entry = [index, 0, entry[1]]
+            entry[1] += 1
+            self._local[key] = entry
+            counts.append((entry[1], entry[2]))
+        return counts
+
+    def _prune(self, now: float):
+        """Drop keys whose windows no longer affect the estimate"""
+        longest = max(window for _, window in self.rules.values())
+        oldest = int(now // longest) - 1
+        self._local = {k: v for k, v in self._local.items() if v[0] >= oldest}
+        if len(self._local) > self.max_local_keys:
+            self._local.clear()
+
+def normalize_email(email: str) -> str:
+    """
+    Canonical form of a login email for unknown-email cache keys
+
+    Matches how EmailStr stores addresses: surrounding whitespace dropped and
+    the domain lowercased. The local part keeps its case, since accounts
+    differing only there are distinct users.
+    """
+    local, at, domain = email.strip()[:254].rpartition("@")
+    if not at:
+        return domain
+    return f"{local}@{domain.lower()}"
+
+def email_limit_key(email: str) -> str:
+    """
+    Per-email login limiter key
+
+    Casefolded as a whole, so Foo@x.com, foo@x.com and FOO@x.com share one
+    budget instead of each getting their own against the same account.
+    """
+    return normalize_email(email).casefold()
+
+class UnknownEmailCache:
+    """
+    TTL set of emails that did not match any user
+
+    Lets repeated login attempts for non-existent accounts be rejected
+    without a database lookup. Entries live in Redis so a registration on
+    one worker clears them for all; while Redis is unreachable a bounded
+    per-worker set is used instead.
+    """
+
+    def __init__(self, prefix: str, ttl_seconds: int, max_local_size: int = 50_000):
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.max_local_size = max_local_size
+        self._local: "OrderedDict[str, float]" = OrderedDict()
+
+    async def contains(self, email: str) -> bool:
+        if self.ttl_seconds <= 0:
+            return False
+        email = normalize_email(email)
+        client = redis_connector.get()
+        if client is not None:
+            try:
+                return bool(await client.exists(f"{self.prefix}:{email}"))
+            except (RedisError, OSError) as e:
+                redis_connector.mark_unavailable(e)
+
+        expires_at = self._local.get(email)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            self._local.pop(email, None)
+            return False
+        return True
+
+    async def add(self, email: str):
+        if self.ttl_seconds <= 0:
+            return
+        email = normalize_email(email)
+        client = redis_connector.get()
+        if client is not None:
+            try:
+                await client.set(f"{self.prefix}:{email}", "1", ex=self.ttl_seconds)
+                return
+            except (RedisError, OSError) as e:
+                redis_connector.mark_unavailable(e)
+
+        self._local[email] = time.monotonic() + self.ttl_seconds
+        self._local.move_to_end(email)
+        while len(self._local) > self.max_local_size:
+            self._local.popitem(last=False)
+
+    async def discard(self, email: str):
+        email = normalize_email(email)
+        self._local.pop(email, None)
+        client = redis_connector.get()
+        if client is None:
+            return
+        try:
+            await client.delete(f"{self.prefix}:{email}")
+        except (RedisError, OSError) as e:
+            redis_connector.mark_unavailable(e)
+
+# Global instances
+login_limiter = SlidingWindowLimiter(
+    prefix="ratelimit:login",
+    rules={
+        "ip": (settings.LOGIN_RATE_LIMIT_PER_IP, settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS),
+        "email": (settings.LOGIN_RATE_LIMIT_PER_EMAIL, settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS),
+        "global": (settings.LOGIN_RATE_LIMIT_GLOBAL, settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS),
+    }
+)
+unknown_email_cache = UnknownEmailCache(
+    prefix="login:unknown_email",
+    ttl_seconds=settings.UNKNOWN_EMAIL_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,150 @@
+"""
+Read replica routing
+Picks a replica engine for read-only sessions, skipping replicas that lag
+too far behind the primary, and tracks users who wrote recently so their
+reads stay on the primary until the replicas have caught up
+"""
+import asyncio
+import itertools
+import math
+import time
+from collections import OrderedDict
+from typing import List, Optional
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.utils.auth import decode_access_token
+from app.utils.metrics import DB_REPLICA_LAG
+from app.utils.redis_client import redis_connector
+
+# Seconds of replay lag; 0 when the replica has replayed everything it received
+POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+SELECTION_STRATEGIES = ("round_robin", "least_lag")
+
+def bearer_user_id(authorization: Optional[str]) -> Optional[str]:
+    """User ID from an `Authorization: Bearer` header value, or None"""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_access_token(token)
+    return payload.get("sub") if payload else None
+
+class ReplicaSet:
+    """
+    Read replicas with lag-aware selection
+
+    Replicas whose last measured lag exceeds `max_lag_seconds` (or that
+    could not be reached) are skipped; choose() returns None when no
+    replica is usable so the caller falls back to the primary. Lag is
+    measured by a background task every `check_seconds`; until the first
+    check, replicas are assumed to be current.
+    """
+
+    def __init__(self, engines: List[Engine], selection: str = "round_robin",
+                 max_lag_seconds: float = 5.0, check_seconds: float = 5.0):
+        if selection not in SELECTION_STRATEGIES:
+            raise ValueError(f"Unknown replica selection '{selection}', expected one of {SELECTION_STRATEGIES}")
+        self.engines = engines
+        self.selection = selection
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self.lags = [0.0] * len(engines)
+        self._turn = itertools.count()
+        self._task: asyncio.Task = None
+
+    def choose(self) -> Optional[Engine]:
+        healthy = [i for i, lag in enumerate(self.lags) if lag <= self.max_lag_seconds]
+        if not healthy:
+            return None
+        turn = next(self._turn)
+        if self.selection == "least_lag":
+            least = min(self.lags[i] for i in healthy)
+            healthy = [i for i in healthy if self.lags[i] == least]
+        return self.engines[healthy[turn % len(healthy)]]
+
+    def refresh_lag(self):
+        """Measure every replica's lag (blocking; run in a thread)"""
+        for i, engine in enumerate(self.engines):
+            self.lags[i] = self._measure_lag(engine)
+            DB_REPLICA_LAG.labels(replica=str(i)).set(self.lags[i] if math.isfinite(self.lags[i]) else -1)
+
+    @staticmethod
+    def _measure_lag(engine: Engine) -> float:
+        if engine.dialect.name != "postgresql":
+            # No replication to measure (e.g. SQLite copies in local testing)
+            return 0.0
+        try:
+            with engine.connect() as conn:
+                return float(conn.execute(POSTGRES_LAG_SQL).scalar() or 0.0)
+        except Exception as e:
+            print(f"[DB Replicas] Lag check failed for {engine.url.host}: {e}")
+            return math.inf
+
+    def start(self):
+        if self._task is None and self.engines:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.to_thread(self.refresh_lag)
+            await asyncio.sleep(self.check_seconds)
+
+class ReadYourWritesWindow:
+    """
+    Remembers users who wrote in the last `window_seconds`
+
+    Shared through Redis so any worker sends the user's next reads to the
+    primary, with a bounded per-worker dict while Redis is unavailable.
+    """
+
+    def __init__(self, prefix: str, window_seconds: float, max_local_users: int = 100_000):
+        self.prefix = prefix
+        self.window_seconds = window_seconds
+        self.max_local_users = max_local_users
+        # user_id -> expires_at
+        self._local: "OrderedDict[str, float]" = OrderedDict()
+
+    async def mark(self, user_id: str):
+        self._local[user_id] = time.monotonic() + self.window_seconds
+        self._local.move_to_end(user_id)
+        while len(self._local) > self.max_local_users:
+            self._local.popitem(last=False)
+
+        client = redis_connector.get()
+        if client is None:
+            return
+        try:
+            await client.set(f"{self.prefix}:{user_id}", "1", px=int(self.window_seconds * 1000))
+        except (RedisError, OSError) as e:
+            redis_connector.mark_unavailable(e)
+
+    async def is_recent(self, user_id: str) -> bool:
+        expires_at = self._local.get(user_id)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                return True
+            del self._local[user_id]
+
+        client = redis_connector.get()
+        if client is None:
+            return False
+        try:
+            return bool(await client.exists(f"{self.prefix}:{user_id}"))
+        except (RedisError, OSError) as e:
+            redis_connector.mark_unavailable(e)
+            return False
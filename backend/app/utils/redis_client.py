@@ -0,0 +1,45 @@
+"""
+Shared Redis client
+Returns None while Redis is unreachable so callers can fall back to in-memory state
+"""
+import time
+from typing import Optional
+import redis.asyncio as aioredis
+from app.config import settings
+
+# How long to stay on the in-memory fallback after a Redis failure
+REDIS_RETRY_SECONDS = 30
+
+class RedisConnector:
+    def __init__(self, url: str):
+        self.url = url
+        self.client: Optional[aioredis.Redis] = None
+        self.unavailable_until = 0.0
+
+    def get(self) -> Optional[aioredis.Redis]:
+        """Return the shared client, or None if Redis is disabled or recently failed"""
+        if not self.url or time.monotonic() < self.unavailable_until:
+            return None
+
+        if self.client is None:
+            self.client = aioredis.from_url(
+                self.url,
+                decode_responses=True,
+                socket_connect_timeout=0.05,
+                socket_timeout=0.05
+            )
+        return self.client
+
+    def mark_unavailable(self, error: Exception):
+        """Switch callers to their fallback for a while after a Redis error"""
+        if time.monotonic() >= self.unavailable_until:
+            print(f"[Redis] Unavailable, using in-memory fallback for {REDIS_RETRY_SECONDS}s: {error}")
+        self.unavailable_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+# Global instance
+redis_connector = RedisConnector(settings.REDIS_URL)
@@ -0,0 +1,47 @@
+"""
+Database schema version check
+Migrations run once per deploy (alembic upgrade head); workers only compare
+the database's Alembic revision with the migrations shipped with the code
+"""
+from pathlib import Path
+from sqlalchemy.engine import Engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+def expected_revisions() -> set:
+    """Head revision(s) of the migrations in this checkout"""
+    # Imported here so workers that skip the check never load Alembic
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    return set(ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_heads())
+
+def current_revisions(engine: Engine) -> set:
+    """Revision(s) recorded in the database (empty if never migrated)"""
+    from alembic.runtime.migration import MigrationContext
+    with engine.connect() as connection:
+        return set(MigrationContext.configure(connection).get_current_heads())
+
+def check_schema_version(engine: Engine, require_current: bool = False) -> bool:
+    """
+    Compare the database schema revision with the code's
+
+    One query against alembic_version, instead of creating tables on
+    every worker boot.
+
+    Returns:
+        True if the database is at the expected revision
+
+    Raises:
+        RuntimeError: If the schema is behind (or ahead) and require_current is set
+    """
+    current = current_revisions(engine)
+    expected = expected_revisions()
+    if current == expected:
+        return True
+
+    message = (f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+               f"code expects {', '.join(sorted(expected))}; run `alembic upgrade head`")
+    if require_current:
+        raise RuntimeError(message)
+    print(f"[Database] {message}")
+    return False
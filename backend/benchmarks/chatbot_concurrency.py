@@ -0,0 +1,110 @@
+"""
+Concurrent chatbot benchmark
+
+Starts a local fake LLM server (Anthropic and OpenAI compatible) and sends
+N chats at once through the configured chatbot service, while a ticker
+task measures how late the event loop wakes up. The baseline runs the
+same chats through the provider's synchronous SDK inside a coroutine (the
+previous behaviour), which serialises them and stalls the loop.
+
+Usage (from backend/):
+    python -m benchmarks.chatbot_concurrency --provider claude --chats 200 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+async def measure(label: str, chat, chats: int):
+    """Run `chats` calls of chat() concurrently while sampling event-loop lag"""
+    lags = []
+    running = True
+
+    async def ticker():
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    async def timed(i):
+        start = time.perf_counter()
+        result = await chat(f"Question {i}")
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        return time.perf_counter() - start
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(timed(i) for i in range(chats))))
+    elapsed = time.perf_counter() - start
+    running = False
+    await tick
+
+    print(f"{label:<10} {chats:>5} chats in {elapsed:6.2f}s  "
+          f"{chats / elapsed:7.1f} chats/s  "
+          f"p50 {statistics.median(latencies) * 1000:7.0f} ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.0f} ms  "
+          f"max loop lag {max(lags, default=0) * 1000:7.0f} ms")
+
+def blocking_chat(provider: str):
+    """The previous implementation: a synchronous SDK call inside an async def"""
+    from app.config import settings
+
+    if provider == "openai":
+        from openai import OpenAI
+        client = OpenAI(api_key="stub", base_url=settings.OPENAI_BASE_URL)
+
+        async def chat(message):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini", max_tokens=1024,
+                messages=[{"role": "user", "content": message}]
+            )
+            return {"response": response.choices[0].message.content}
+    else:
+        from anthropic import Anthropic
+        client = Anthropic(api_key="stub", base_url=settings.ANTHROPIC_BASE_URL)
+
+        async def chat(message):
+            response = client.messages.create(
+                model="claude-3-5-sonnet-20241022", max_tokens=1024,
+                messages=[{"role": "user", "content": message}]
+            )
+            return {"response": response.content[0].text}
+    return chat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=["claude", "openai"], default="claude")
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--baseline-chats", type=int, default=20,
+                        help="chats for the blocking baseline (it runs them one at a time)")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM latency in seconds")
+    args = parser.parse_args()
+
+    from benchmarks.stubs import create_llm_stub_app, free_port, serve_in_thread
+
+    port = free_port()
+    serve_in_thread(create_llm_stub_app(args.latency), port)
+    os.environ["CHATBOT_PROVIDER"] = args.provider
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("ANTHROPIC_API_KEY", "stub")
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    from app.config import settings
+    from app.services.chatbot import get_chatbot
+
+    print(f"provider={args.provider} latency={args.latency}s "
+          f"max concurrency per worker={settings.CHATBOT_MAX_CONCURRENCY}")
+
+    async def run():
+        chatbot = get_chatbot()
+        await measure("async", chatbot.chat, args.chats)
+        if args.baseline_chats:
+            await measure("blocking", blocking_chat(args.provider), args.baseline_chats)
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Chatbot failover and hedging scenarios
+
+Runs ChatbotRouter against fake providers with injected latency and
+errors and reports success rate and latency percentiles per scenario:
+
+- primary down: every primary call fails; failover should keep success at 100%
+- primary timing out: the primary hangs past the attempt timeout
+- slow tail: 10% of primary calls take 10x longer; hedging should cut p99
+
+Usage (from backend/):
+    python -m benchmarks.chatbot_failover --chats 300
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+class FakeProvider:
+    """Chatbot stand-in with configurable latency, tail latency and error rate"""
+
+    def __init__(self, name: str, latency: float, error_rate: float = 0.0,
+                 tail_rate: float = 0.0, tail_latency: float = 0.0, seed: int = 0):
+        self.provider = name
+        self.model = f"{name}-fake"
+        self.latency = latency
+        self.error_rate = error_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.calls = 0
+        self.random = random.Random(seed)
+
+    async def chat(self, user_message: str, language: str = "en", conversation_history: list = None):
+        self.calls += 1
+        slow = self.random.random() < self.tail_rate
+        await asyncio.sleep(self.tail_latency if slow else self.latency * self.random.uniform(0.8, 1.2))
+        if self.random.random() < self.error_rate:
+            return {"response": "", "error": f"{self.provider} failed"}
+        return {"response": f"answer from {self.provider}", "conversation_history": []}
+
+async def run_scenario(label: str, providers: list, chats: int, hedge: bool, attempt_timeout: float = 2.0):
+    from app.services.chatbot_router import ChatbotRouter
+
+    router = ChatbotRouter(providers, attempt_timeout=attempt_timeout, hedge=hedge, hedge_min_delay=0.05)
+
+    # Warm the rolling stats so the hedge delay reflects the primary's p95
+    for _ in range(20):
+        await router.chat("warm-up")
+    for provider in providers:
+        provider.calls = 0
+
+    async def one(i):
+        start = time.perf_counter()
+        result = await router.chat(f"question {i}")
+        return time.perf_counter() - start, "error" not in result
+
+    results = await asyncio.gather(*(one(i) for i in range(chats)))
+    latencies = sorted(latency for latency, _ in results)
+    ok = sum(1 for _, success in results if success)
+    calls = ", ".join(f"{p.provider}={p.calls}" for p in providers)
+    print(f"{label:<32} ok {ok / chats:6.1%}  "
+          f"p50 {statistics.median(latencies) * 1000:6.0f} ms  "
+          f"p99 {latencies[int(chats * 0.99) - 1] * 1000:6.0f} ms  calls: {calls}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=300)
+    args = parser.parse_args()
+
+    async def run():
+        await run_scenario("primary down, no failover",
+                           [FakeProvider("claude", 0.1, error_rate=1.0)], args.chats, hedge=False)
+        await run_scenario("primary down, failover",
+                           [FakeProvider("claude", 0.1, error_rate=1.0), FakeProvider("openai", 0.15)],
+                           args.chats, hedge=False)
+        await run_scenario("primary timing out, failover",
+                           [FakeProvider("claude", 5.0), FakeProvider("openai", 0.15)],
+                           args.chats, hedge=False, attempt_timeout=0.5)
+        await run_scenario("slow tail, no hedging",
+                           [FakeProvider("claude", 0.1, tail_rate=0.1, tail_latency=1.0, seed=1),
+                            FakeProvider("openai", 0.15, seed=2)], args.chats, hedge=False)
+        await run_scenario("slow tail, hedging",
+                           [FakeProvider("claude", 0.1, tail_rate=0.1, tail_latency=1.0, seed=1),
+                            FakeProvider("openai", 0.15, seed=2)], args.chats, hedge=True)
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Response compression benchmark
+
+Compresses two typical large JSON bodies (a 100-store page with image URLs
+and a 100-review page with nested replies) at several gzip levels and, when
+the brotli package is installed, brotli qualities. Reports the compressed
+size and CPU time per body, and the cost of a hit in the compressed body
+cache (hashing only).
+
+Usage (from backend/):
+    python -m benchmarks.compression
+"""
+import argparse
+import gzip
+import timeit
+
+def bodies() -> dict:
+    from fastapi.responses import ORJSONResponse
+    from app.routers.stores import store_payload
+    from benchmarks.micro import make_store
+    from benchmarks.response_serialization import make_rows, reply_fields, reply_tree, review_fields
+
+    stores = [store_payload(make_store(i), 37.56, 126.98) for i in range(100)]
+    review_rows, reply_rows = make_rows(100, 6)
+    reviews = [
+        {**review_fields(row), "replies": reply_tree(
+            reply_rows[row.id], lambda reply, children: {**reply_fields(reply), "child_replies": children})}
+        for row in review_rows
+    ]
+    return {
+        "stores x100": ORJSONResponse({"stores": stores, "total": 100, "page": 1, "page_size": 100}).body,
+        "reviews x100": ORJSONResponse(reviews).body,
+    }
+
+def per_call(function, rounds: int) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=rounds, number=number)) / number
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.utils.compression import BROTLI_AVAILABLE, CompressedBodyCache, brotli
+
+    codecs = {f"gzip -{level}": (lambda body, level=level: gzip.compress(body, compresslevel=level, mtime=0))
+              for level in (1, 6, 9)}
+    if BROTLI_AVAILABLE:
+        codecs.update({f"br q{quality}": (lambda body, quality=quality: brotli.compress(body, quality=quality))
+                       for quality in (4, 11)})
+    else:
+        print("brotli is not installed; gzip only")
+
+    for name, body in bodies().items():
+        print(f"\n{name}: {len(body) / 1024:.1f} KiB")
+        print(f"{'codec':<12}{'KiB':>8}{'ratio':>8}{'ms':>8}")
+        for codec, compress in codecs.items():
+            size = len(compress(body))
+            print(f"{codec:<12}{size / 1024:>8.1f}{size / len(body):>8.1%}{per_call(lambda: compress(body), args.rounds) * 1000:>8.2f}")
+
+        cache = CompressedBodyCache(64 * 1024 * 1024)
+        cache.compress(body, "gzip")
+        print(f"{'cache hit':<12}{'':>16}{per_call(lambda: cache.compress(body, 'gzip'), args.rounds) * 1000:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Connection pool liveness benchmark
+
+Runs the same short "request" (check out a session, run one query, close)
+with pool_pre_ping on and off and reports the per-request latency. A
+pre-ping costs one extra round trip to the database on every checkout,
+so the saving grows with network latency; --rtt-ms adds a simulated round
+trip to each ping and query when running against a local SQLite file.
+
+Usage (from backend/):
+    python -m benchmarks.db_pool --requests 5000
+    python -m benchmarks.db_pool --rtt-ms 0.5
+    DATABASE_URL=postgresql://... python -m benchmarks.db_pool --url-from-env
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+def run(url: str, pre_ping: bool, requests: int, rtt: float) -> list:
+    from sqlalchemy import create_engine, event, text
+    from sqlalchemy.orm import sessionmaker
+    from app.utils.db_pool import InstrumentedQueuePool, instrument_engine
+
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_size=5,
+                           pool_recycle=1800, pool_pre_ping=pre_ping)
+    instrument_engine(engine, f"bench-{'ping' if pre_ping else 'recycle'}")
+    if rtt:
+        ping = engine.dialect.do_ping
+
+        def slow_ping(dbapi_connection):
+            time.sleep(rtt)
+            return ping(dbapi_connection)
+
+        engine.dialect.do_ping = slow_ping
+        event.listen(engine, "before_cursor_execute", lambda *args: time.sleep(rtt))
+
+    Session = sessionmaker(bind=engine)
+    query = text("SELECT 1")
+    # Open the pooled connection(s) first so only checkouts are timed
+    with Session() as session:
+        session.execute(query)
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        with Session() as session:
+            session.execute(query).scalar()
+        latencies.append(time.perf_counter() - start)
+    engine.dispose()
+    return sorted(latencies)
+
+def report(label: str, latencies: list):
+    print(f"{label:<22} mean={statistics.fmean(latencies) * 1e6:8.1f}us "
+          f"p50={statistics.median(latencies) * 1e6:8.1f}us "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1e6:8.1f}us")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Simulated round trip per ping and query")
+    parser.add_argument("--url-from-env", action="store_true", help="Use DATABASE_URL instead of a temp SQLite file")
+    args = parser.parse_args()
+
+    if args.url_from_env:
+        url = os.environ["DATABASE_URL"]
+    else:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        os.environ.setdefault("DATABASE_URL", url)
+
+    rtt = args.rtt_ms / 1000
+    ping = run(url, True, args.requests, rtt)
+    recycle = run(url, False, args.requests, rtt)
+
+    print(f"requests={args.requests} simulated_rtt={args.rtt_ms}ms")
+    report("pre_ping (old)", ping)
+    report("pool_recycle (new)", recycle)
+    saved = statistics.fmean(ping) - statistics.fmean(recycle)
+    print(f"saved per request: {saved * 1e6:.1f}us ({saved / statistics.fmean(ping):.0%})")
+
+if __name__ == "__main__":
+    main()
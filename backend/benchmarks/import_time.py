@@ -0,0 +1,67 @@
+"""
+Import-time (cold start) benchmark
+
+Imports the application in fresh interpreters with `python -X importtime`
+and reports the total import time of app.main plus the slowest modules by
+cumulative time. Run before and after a change to see what it costs a
+worker (or a scale-from-zero instance) before it can serve a request.
+
+Usage (from backend/):
+    python -m benchmarks.import_time --runs 5 --top 15
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def import_once(module: str) -> dict:
+    """Import `module` in a new interpreter; returns {module: cumulative_us}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env={**os.environ, "PYTHONPATH": os.getcwd()}
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    samples = defaultdict(list)
+    for _ in range(args.runs):
+        for name, us in import_once(args.module).items():
+            samples[name].append(us)
+
+    totals = samples[args.module]
+    print(f"import {args.module}: median {statistics.median(totals) / 1000:.0f} ms, "
+          f"min {min(totals) / 1000:.0f} ms over {args.runs} runs")
+
+    print("\nSlowest modules (median cumulative ms):")
+    medians = sorted(
+        ((statistics.median(v), name) for name, v in samples.items() if name != args.module),
+        reverse=True
+    )
+    for us, name in medians[:args.top]:
+        print(f"  {us / 1000:8.1f}  {name}")
+
+    heavy = ("anthropic", "openai", "google.generativeai", "googleapiclient")
+    loaded = [name for name in heavy if name in samples]
+    print(f"\nProvider SDKs imported at startup: {', '.join(loaded) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+App entry point for load tests
+
+Imports the real app with Google Sheets replaced by the in-memory
+FakeSheets, so outbox syncs run end to end without network calls. The LLM
+and OAuth providers are pointed at stubs through environment variables by
+benchmarks.load_test, which starts this module with uvicorn:
+
+    uvicorn benchmarks.load_server:app --workers 4
+"""
+import os
+from benchmarks.stubs import FakeSheets
+from app.main import app  # noqa: F401
+from app.services.google_sheets import sheets_service
+
+sheets_service.service = FakeSheets(float(os.getenv("LOAD_TEST_SHEETS_LATENCY_SECONDS", "0.05")))
+sheets_service.initialized = True
+sheets_service.enabled = True
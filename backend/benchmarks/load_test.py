@@ -0,0 +1,329 @@
+"""
+Load test with a realistic request mix
+
+Closed-loop asyncio driver: --users virtual users, each logged in as a
+seeded user, repeatedly pick an operation from MIX and wait for its
+response (plus optional think time). Requests completed during the warm-up
+are not recorded. Seed the database first with benchmarks.seed_data at the
+same --scale.
+
+Unless --base-url is given, the app is started with uvicorn
+(benchmarks.load_server) on the DATABASE_URL database, with local stubs
+standing in for the LLM (Anthropic API), OAuth provider profile endpoints
+and Google Sheets. The driver shares the machine with the server, so give
+it spare cores or results measure the driver.
+
+Results (throughput and p50/p95/p99 per operation) are printed and
+written as JSON, by default to benchmarks/results/load-<commit>-<time>.json,
+for comparison across commits.
+
+Usage (from backend/):
+    DATABASE_URL=sqlite:////dev/shm/load.db python -m benchmarks.seed_data --scale 10k
+    DATABASE_URL=sqlite:////dev/shm/load.db python -m benchmarks.load_test --scale 10k --users 50 --duration 60
+    python -m benchmarks.load_test --base-url https://staging.example.com --scale 1m
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks import seed_data
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+CHAT_QUESTIONS = [
+    "How do I earn points?", "Where can I get a tax refund?", "What are the best places to shop in Myeongdong?",
+    "How do I get from Gimpo airport to Hongdae?", "Can I use my points at duty free shops?",
+    "What should I see in Haeundae?",
+]
+
+async def nearby_stores(client, user, rng):
+    _, latitude, longitude, _ = rng.choices(seed_data.DISTRICTS, [d[3] for d in seed_data.DISTRICTS])[0]
+    return await client.get("/api/stores/nearby", params={
+        "latitude": rng.gauss(latitude, 0.005), "longitude": rng.gauss(longitude, 0.005), "radius": 1.0,
+    })
+
+async def store_details(client, user, rng):
+    return await client.get(f"/api/stores/{user.store(rng)}")
+
+async def list_reviews(client, user, rng):
+    return await client.get("/api/reviews/", params={
+        "entity_type": "store", "entity_id": user.store(rng),
+        "sort_by": rng.choice(["recent", "recent", "helpful", "rating_high"]),
+    })
+
+async def review_details(client, user, rng):
+    return await client.get(f"/api/reviews/{user.review(rng)}")
+
+async def review_replies(client, user, rng):
+    return await client.get(f"/api/reviews/{user.review(rng)}/replies")
+
+async def create_review(client, user, rng):
+    return await client.post("/api/reviews/", headers=user.headers, json={
+        "entity_type": "store", "entity_id": user.store(rng),
+        "rating": rng.randint(1, 5), "comment": "Load test review. " + rng.choice(seed_data.COMMENT_PHRASES),
+    })
+
+async def mark_helpful(client, user, rng):
+    return await client.post(f"/api/reviews/{user.review(rng)}/helpful", headers=user.headers)
+
+async def create_reply(client, user, rng):
+    return await client.post(f"/api/reviews/{user.review(rng)}/replies", headers=user.headers,
+                             json={"comment": "Thanks for the tip!"})
+
+async def login(client, user, rng):
+    response = await client.post("/api/auth/login", json={"email": seed_data.user_email(user.index),
+                                                          "password": seed_data.PASSWORD})
+    if response.status_code == 200:
+        user.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return response
+
+async def oauth_login(client, user, rng):
+    # The stub derives the profile from the token; a few distinct users per virtual user
+    return await client.post("/api/oauth/google", params={"access_token": f"loadtest-{user.index}-{rng.randrange(5)}"})
+
+async def earn_points(client, user, rng):
+    return await client.post("/api/points/earn", headers=user.headers)
+
+async def spend_points(client, user, rng):
+    return await client.post("/api/points/spend", headers=user.headers)
+
+async def chat(client, user, rng):
+    # Half the questions repeat (answerable from the cache), half are unique
+    message = rng.choice(CHAT_QUESTIONS)
+    if rng.random() < 0.5:
+        message = f"{message} (visit {rng.randrange(10 ** 9)})"
+    return await client.post("/api/chatbot/chat", headers=user.headers, json={"message": message})
+
+# operation -> (share of requests, function, accepted statuses)
+MIX = {
+    "nearby_stores": (30, nearby_stores, {200}),
+    "store_details": (8, store_details, {200}),
+    "list_reviews": (20, list_reviews, {200}),
+    "review_details": (8, review_details, {200}),
+    "review_replies": (5, review_replies, {200}),
+    # 400: the user already reviewed the store / marked the review
+    "create_review": (3, create_review, {201, 400}),
+    "mark_helpful": (3, mark_helpful, {201, 400}),
+    "create_reply": (2, create_reply, {201}),
+    "login": (4, login, {200}),
+    "oauth_login": (2, oauth_login, {200}),
+    "earn_points": (6, earn_points, {200}),
+    "spend_points": (4, spend_points, {200}),
+    "chat": (5, chat, {200}),
+}
+
+class VirtualUser:
+    """A seeded user driving requests"""
+
+    def __init__(self, index: int, counts: dict, popularity: list):
+        self.index = index
+        self.headers = {}
+        self._counts = counts
+        self._popularity = popularity
+        self._stores = range(counts["stores"])
+
+    def store(self, rng) -> str:
+        """A store ID, popular stores more often (as seeded reviews are)"""
+        return seed_data.store_id(rng.choices(self._stores, cum_weights=self._popularity)[0])
+
+    def review(self, rng) -> str:
+        return seed_data.review_id(rng.randrange(self._counts["reviews"]))
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {name: [] for name in MIX}
+        self.statuses = {name: {} for name in MIX}
+        self.errors = {name: 0 for name in MIX}
+        self.recording = False
+
+    def record(self, name: str, seconds: float, status):
+        if not self.recording:
+            return
+        self.latencies[name].append(seconds)
+        self.statuses[name][str(status)] = self.statuses[name].get(str(status), 0) + 1
+        if status not in MIX[name][2]:
+            self.errors[name] += 1
+
+def percentile(ordered: list, fraction: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+def summarize(latencies: list, errors: int, seconds: float, statuses: dict = None) -> dict:
+    ordered = sorted(latencies)
+    summary = {"requests": len(ordered), "errors": errors, "throughput_rps": round(len(ordered) / seconds, 2)}
+    if ordered:
+        summary.update({
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        })
+    if statuses is not None:
+        summary["statuses"] = statuses
+    return summary
+
+async def drive(base_url: str, args, counts: dict) -> dict:
+    import httpx
+
+    popularity = seed_data.store_popularity(counts["stores"])
+    names = list(MIX)
+    weights = [MIX[name][0] for name in names]
+    recorder = Recorder()
+    # Spread virtual users over the seeded users
+    stride = max(counts["users"] // args.users, 1)
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        async def virtual_user(v: int, deadline: float):
+            rng = random.Random(args.seed * 100_003 + v)
+            user = VirtualUser((v * stride) % counts["users"], counts, popularity)
+            await login(client, user, rng)
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                start = time.perf_counter()
+                try:
+                    status = (await MIX[name][1](client, user, rng)).status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                recorder.record(name, time.perf_counter() - start, status)
+                if args.think_ms:
+                    await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+        deadline = time.perf_counter() + args.warmup + args.duration
+        tasks = [asyncio.create_task(virtual_user(v, deadline)) for v in range(args.users)]
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+        started = time.perf_counter()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    operations = {
+        name: summarize(recorder.latencies[name], recorder.errors[name], elapsed, recorder.statuses[name])
+        for name in names
+    }
+    total = summarize([s for name in names for s in recorder.latencies[name]], sum(recorder.errors.values()), elapsed)
+    return {"duration_seconds": round(elapsed, 2), "total": total, "operations": operations}
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def start_server(args) -> tuple:
+    """Start the stubs in this process and the app in a uvicorn subprocess; returns (base URL, process)"""
+    import httpx
+    from benchmarks.stubs import create_llm_stub_app, create_oauth_stub_app, free_port, serve_in_thread
+
+    llm_port, oauth_port, app_port = free_port(), free_port(), free_port()
+    serve_in_thread(create_llm_stub_app(args.llm_latency), llm_port)
+    serve_in_thread(create_oauth_stub_app(args.oauth_latency), oauth_port)
+
+    oauth = f"http://127.0.0.1:{oauth_port}"
+    env = {
+        **os.environ,
+        "CHATBOT_PROVIDER": "claude",
+        "ANTHROPIC_API_KEY": "stub",
+        "ANTHROPIC_BASE_URL": f"http://127.0.0.1:{llm_port}",
+        "OPENAI_API_KEY": "",
+        "GOOGLE_API_KEY": "",
+        "GOOGLE_USERINFO_URL": f"{oauth}/google/userinfo",
+        "FACEBOOK_ME_URL": f"{oauth}/facebook/me",
+        "KAKAO_ME_URL": f"{oauth}/kakao/me",
+        # Every virtual user logs in from 127.0.0.1
+        "LOGIN_RATE_LIMIT_ENABLED": "false",
+        "LOAD_TEST_SHEETS_LATENCY_SECONDS": str(args.sheets_latency),
+    }
+    log = open(args.server_log, "w") if args.server_log else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.load_server:app", "--host", "127.0.0.1",
+         "--port", str(app_port), "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=Path(__file__).resolve().parents[1], env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+
+    base_url = f"http://127.0.0.1:{app_port}"
+    deadline = time.monotonic() + 60
+    while True:
+        if process.poll() is not None:
+            raise SystemExit(f"[Load Test] Server exited with code {process.returncode} (see --server-log)")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return base_url, process
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            process.terminate()
+            raise SystemExit("[Load Test] Server did not become healthy within 60s")
+        time.sleep(0.2)
+
+def report(results: dict):
+    print(f"{'operation':<16}{'requests':>9}{'errors':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, summary in [*results["operations"].items(), ("TOTAL", results["total"])]:
+        print(f"{name:<16}{summary['requests']:>9}{summary['errors']:>8}{summary['throughput_rps']:>9.1f}"
+              f"{summary.get('p50_ms', 0):>9.1f}{summary.get('p95_ms', 0):>9.1f}{summary.get('p99_ms', 0):>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(seed_data.SCALES), default="10k",
+                        help="scale the database was seeded at")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unrecorded seconds before measuring")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a user's requests")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--base-url", help="test a running deployment instead of starting the app")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the started app")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="LLM stub latency in seconds")
+    parser.add_argument("--oauth-latency", type=float, default=0.1, help="OAuth stub latency in seconds")
+    parser.add_argument("--sheets-latency", type=float, default=0.05, help="Sheets stub latency in seconds")
+    parser.add_argument("--server-log", help="file for the started app's output (discarded by default)")
+    parser.add_argument("--output", help="results JSON path")
+    args = parser.parse_args()
+
+    counts = seed_data.SCALES[args.scale]
+    process = None
+    base_url = args.base_url
+    if base_url is None:
+        base_url, process = start_server(args)
+
+    commit = git_commit()
+    started_at = datetime.now(timezone.utc)
+    print(f"[Load Test] {base_url} scale={args.scale} users={args.users} "
+          f"duration={args.duration:g}s warmup={args.warmup:g}s commit={(commit or 'unknown')[:12]}")
+    try:
+        results = asyncio.run(drive(base_url, args, counts))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report(results)
+    document = {
+        "benchmark": "load_test",
+        "commit": commit,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "server_log")},
+        "mix": {name: share for name, (share, _, _) in MIX.items()},
+        **results,
+    }
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"load-{(commit or 'unknown')[:12]}-{started_at:%Y%m%dT%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"[Load Test] Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+HTTP metrics middleware overhead benchmark
+
+Calls a trivial FastAPI route directly through ASGI (no network, no
+client) with and without MetricsMiddleware and reports the added time per
+request. Route handling dominates real requests, so this is an upper
+bound on the relative cost.
+
+Usage (from backend/):
+    python -m benchmarks.metrics_overhead --requests 20000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+def create_app(with_metrics: bool):
+    from fastapi import FastAPI
+    from app.middleware.metrics import MetricsMiddleware
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+async def run(app, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i: int) -> dict:
+        return {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": f"/items/{i}", "raw_path": f"/items/{i}".encode(),
+            "root_path": "", "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("app", 80),
+        }
+
+    for i in range(200):  # warm up
+        await app(scope(i), receive, send)
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - start) / requests
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    plain, metered = create_app(False), create_app(True)
+    without, with_ = [], []
+    for _ in range(args.rounds):
+        without.append(asyncio.run(run(plain, args.requests)))
+        with_.append(asyncio.run(run(metered, args.requests)))
+
+    base, instrumented = statistics.median(without), statistics.median(with_)
+    print(f"requests={args.requests} rounds={args.rounds} (median per request)")
+    print(f"without middleware: {base * 1e6:.1f}us")
+    print(f"with middleware:    {instrumented * 1e6:.1f}us")
+    print(f"overhead:           {(instrumented - base) * 1e6:.1f}us ({(instrumented - base) / base:.1%})")
+
+    from prometheus_client import generate_latest
+    routes = {line.split('route="')[1].split('"')[0] for line in generate_latest().decode().splitlines()
+              if line.startswith("http_requests_total{")}
+    print(f"route labels: {sorted(routes)}")
+
+if __name__ == "__main__":
+    main()
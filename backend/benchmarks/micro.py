@@ -0,0 +1,242 @@
+"""
+Micro-benchmarks for hot helper functions
+
+Times small, frequently called helpers (distance, the payload builders
+behind the list endpoints, JWT handling, response serialization) with timeit and compares them against a
+stored baseline. A benchmark whose best time per call is more than
+--threshold slower than the baseline is reported as a regression, and the
+run exits with status 1, so this can gate CI on a fixed machine.
+
+Baselines depend on the machine: record one on the machine that compares
+against it (--save-baseline), and re-record after intended changes.
+
+The review and reply payload builders query the database; they run against a
+seeded SQLite database in /dev/shm (or a temp dir), so their times include
+SQLite round trips but no network.
+
+Usage (from backend/):
+    python -m benchmarks.micro                     # compare with the baseline
+    python -m benchmarks.micro -k review           # only matching benchmarks
+    python -m benchmarks.micro --save-baseline     # record a new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BASELINE = Path(__file__).resolve().parent / "data" / "micro_baseline.json"
+
+# name -> setup function returning the zero-argument callable to time
+BENCHMARKS = {}
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def _run_sync(coroutine):
+    """Result of a coroutine that never suspends (FastAPI's serialize_response for async endpoints)"""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+def renderer(response_model, response_class=None):
+    """
+    Function producing a response body as FastAPI does for an endpoint
+    declaring response_model, rendered with the app's default response class
+    """
+    from fastapi.responses import ORJSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+
+    response_class = response_class or ORJSONResponse
+    # FastAPI builds the field once per route
+    field = create_model_field(name="response", type_=response_model, mode="serialization")
+    return lambda content: response_class(_run_sync(serialize_response(field=field, response_content=content))).body
+
+def make_store(i: int):
+    from app.models.store import Store, StoreCategory
+
+    return Store(
+        id=f"store-{i}", name=f"Myeongdong Retail {i}", category=StoreCategory.RETAIL,
+        description="Cosmetics and souvenirs", address="Myeongdong, Seoul",
+        latitude=37.5636 + i * 1e-4, longitude=126.9826 - i * 1e-4, point_rate=1.5,
+        images=json.dumps([f"https://cdn.example.com/stores/{i}/{n}.jpg" for n in range(3)]),
+        opening_hours="10:00-22:00", contact="+82-2-000-0000",
+    )
+
+class ReviewFixture:
+    """A review with helpful votes and a small reply tree in a scratch SQLite database"""
+
+    def __init__(self):
+        from app.database import Base, SessionLocal, engine
+        from app.models.review import EntityType, Review, ReviewHelpful, ReviewReply
+        from app.models.user import User
+
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        now = datetime(2025, 1, 1)
+        users = [User(id=f"user-{i}", email=f"user{i}@example.com", name=f"User {i}", country="JP")
+                 for i in range(6)]
+        self.review = Review(id="review-0", user_id="user-0", entity_type=EntityType.STORE, entity_id="store-0",
+                             rating=5, comment="Great shop, quick tax refund.", created_at=now, updated_at=now)
+        helpful = [ReviewHelpful(review_id="review-0", user_id=f"user-{i}") for i in range(1, 6)]
+        # root -> two children -> one grandchild
+        replies = [
+            ReviewReply(id="reply-0", review_id="review-0", user_id="user-1", comment="Agreed!"),
+            ReviewReply(id="reply-1", review_id="review-0", user_id="user-2", parent_reply_id="reply-0", comment="Same here."),
+            ReviewReply(id="reply-2", review_id="review-0", user_id="user-3", parent_reply_id="reply-0", comment="Thanks."),
+            ReviewReply(id="reply-3", review_id="review-0", user_id="user-4", parent_reply_id="reply-1", comment="Nice."),
+        ]
+        self.db.add_all([*users, self.review, *helpful, *replies])
+        self.db.commit()
+
+_review_fixture = None
+
+def review_fixture() -> ReviewFixture:
+    global _review_fixture
+    if _review_fixture is None:
+        _review_fixture = ReviewFixture()
+    return _review_fixture
+
+def review_page(size: int) -> dict:
+    """Content of a review list page as get_reviews returns it (plain dicts)"""
+    now = datetime(2025, 1, 1)
+    reviews = [
+        {
+            "id": f"review-{i}", "user_id": f"user-{i}",
+            "user": {"id": f"user-{i}", "name": f"User {i}", "email": f"user{i}@example.com"},
+            "entity_type": "store", "entity_id": "store-0", "rating": 1 + i % 5,
+            "comment": "Friendly staff and quick service. Would definitely come back.",
+            "helpful_count": i, "user_has_marked_helpful": False, "reply_count": i % 3,
+            "created_at": now, "updated_at": now,
+        }
+        for i in range(size)
+    ]
+    return {"reviews": reviews, "total": 250, "page": 1, "page_size": size, "average_rating": 4.2,
+            "rating_distribution": {"1": 10, "2": 15, "3": 25, "4": 80, "5": 120}}
+
+@benchmark("calculate_distance")
+def _calculate_distance():
+    from app.routers.stores import calculate_distance
+    return lambda: calculate_distance(37.5636, 126.9826, 35.1587, 129.1604)
+
+@benchmark("store_payload")
+def _store_payload():
+    from app.routers.stores import store_payload
+    store = make_store(0)
+    return lambda: store_payload(store, 37.56, 126.98)
+
+@benchmark("review_payloads")
+def _review_payloads():
+    from app.routers.reviews import _review_payloads
+    fixture = review_fixture()
+    return lambda: _review_payloads([fixture.review], "user-1", fixture.db)
+
+@benchmark("reply_tree_payloads")
+def _reply_tree_payloads():
+    from app.routers.reviews import _reply_tree_payloads
+    fixture = review_fixture()
+    return lambda: _reply_tree_payloads(fixture.review.id, fixture.db)
+
+@benchmark("create_access_token")
+def _create_access_token():
+    from app.utils.auth import create_access_token
+    return lambda: create_access_token({"sub": "user-0"}, timedelta(minutes=30))
+
+@benchmark("decode_access_token")
+def _decode_access_token():
+    from app.utils.auth import create_access_token, decode_access_token
+    token = create_access_token({"sub": "user-0"}, timedelta(minutes=30))
+    return lambda: decode_access_token(token)
+
+@benchmark("generate_customer_id")
+def _generate_customer_id():
+    from app.models.user import generate_customer_id
+    return generate_customer_id
+
+@benchmark("serialize_store_list_20")
+def _serialize_store_list():
+    from fastapi.responses import ORJSONResponse
+    from app.routers.stores import store_payload
+    stores = [store_payload(make_store(i), 37.56, 126.98) for i in range(20)]
+    content = {"stores": stores, "total": 120, "page": 1, "page_size": 20}
+    return lambda: ORJSONResponse(content).body
+
+@benchmark("serialize_review_list_10")
+def _serialize_review_list():
+    from fastapi.responses import ORJSONResponse
+    content = review_page(10)
+    return lambda: ORJSONResponse(content).body
+
+def measure(function, rounds: int) -> dict:
+    """Best and median seconds per call over `rounds` rounds of ~0.2s each"""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat=rounds, number=number)]
+    return {"best_us": round(min(per_call) * 1e6, 3), "median_us": round(statistics.median(per_call) * 1e6, 3),
+            "calls_per_round": number}
+
+def machine() -> dict:
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "processor": platform.processor() or None, "cpus": os.cpu_count()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown of the best time that counts as a regression")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="record results as the new baseline")
+    args = parser.parse_args()
+
+    # Scratch database for the review fixtures, set before the app is imported
+    tmp_dir = tempfile.mkdtemp(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/micro.db"
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if baseline and not args.save_baseline and baseline.get("machine") != machine():
+        print(f"[Micro] Baseline recorded on {baseline.get('machine')}; comparisons may not be meaningful")
+
+    names = [name for name in BENCHMARKS if not args.pattern or args.pattern in name]
+    results, regressions = {}, []
+    print(f"{'benchmark':<28}{'best':>12}{'median':>12}{'baseline':>12}{'change':>9}")
+    for name in names:
+        results[name] = measure(BENCHMARKS[name](), args.rounds)
+        best = results[name]["best_us"]
+        previous = (baseline or {}).get("results", {}).get(name, {}).get("best_us")
+        change = ""
+        if previous:
+            ratio = best / previous - 1
+            change = f"{ratio:+.1%}"
+            if ratio > args.threshold:
+                regressions.append(name)
+                change += " !"
+        print(f"{name:<28}{best:>10.2f}us{results[name]['median_us']:>10.2f}us"
+              f"{(f'{previous:.2f}us' if previous else '-'):>12}{change:>9}")
+
+    if args.save_baseline:
+        merged = {**((baseline or {}).get("results", {})), **results}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": machine(),
+            "results": dict(sorted(merged.items())),
+        }, indent=2) + "\n")
+        print(f"[Micro] Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"[Micro] {len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
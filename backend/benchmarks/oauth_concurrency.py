@@ -0,0 +1,80 @@
+"""
+Concurrent social login benchmark
+
+Fires concurrent Google/Facebook/Kakao logins at the app in-process while
+the provider profile endpoints are served by a local stub with fixed latency.
+With a blocking HTTP call every login serialises on the event loop, so
+throughput is bounded by 1 / provider latency; with the shared async pool
+logins overlap.
+
+Usage (from backend/):
+    python -m benchmarks.oauth_concurrency --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.stubs import create_oauth_stub_app, free_port, serve_in_thread
+
+PROVIDERS = ("google", "facebook", "kakao")
+
+async def run(logins: int, concurrency: int):
+    import httpx
+    from app.main import app
+    from app.database import Base, engine
+    from app.services.http_client import provider_http
+
+    Base.metadata.create_all(bind=engine)
+    await provider_http.start()
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        async def login(i: int):
+            provider = PROVIDERS[i % len(PROVIDERS)]
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(f"/api/oauth/{provider}", params={"access_token": f"user{i}"})
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        elapsed = time.perf_counter() - started
+
+    await provider_http.close()
+
+    latencies.sort()
+    print(f"logins={logins} concurrency={concurrency} elapsed={elapsed:.2f}s "
+          f"throughput={logins / elapsed:.1f}/s")
+    print(f"p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--provider-latency", type=float, default=0.1, help="Stub latency in seconds")
+    args = parser.parse_args()
+
+    port = free_port()
+    serve_in_thread(create_oauth_stub_app(args.provider_latency), port)
+
+    # Point the app at the stub and a throwaway database before importing it
+    base = f"http://127.0.0.1:{port}"
+    os.environ["GOOGLE_USERINFO_URL"] = f"{base}/google/userinfo"
+    os.environ["FACEBOOK_ME_URL"] = f"{base}/facebook/me"
+    os.environ["KAKAO_ME_URL"] = f"{base}/kakao/me"
+    # tmpfs keeps SQLite fsyncs from dominating the measurement
+    tmp_dir = tempfile.mkdtemp(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmp_dir}/bench.db")
+
+    asyncio.run(run(args.logins, args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Response serialization benchmark for a large review page
+
+Renders 100 reviews, each with a nested reply tree, three ways:
+  models        Pydantic models built per row, validated again by
+                response_model and encoded with stdlib json (the previous path)
+  models+orjson the same, encoded with orjson (ORJSONResponse, now the default)
+  payload       plain dicts built from the rows and encoded with orjson,
+                skipping validation (what the review and store list endpoints do)
+
+Reports time per page and the peak memory allocated while rendering one
+page (tracemalloc). Row fetching is not included.
+
+Usage (from backend/):
+    python -m benchmarks.response_serialization --reviews 100
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from benchmarks.micro import renderer
+
+def make_rows(reviews: int, replies_per_review: int):
+    """Review rows and, per review, reply rows (a third of replies answer the previous one)"""
+    now = datetime(2025, 1, 1, 12, 30, 15, 123456)
+    review_rows, reply_rows = [], {}
+    for i in range(reviews):
+        review_id = f"review-{i:04d}-0000-0000-000000000000"
+        review_rows.append(SimpleNamespace(
+            id=review_id, user_id=f"user-{i}", name=f"Visitor {i}", email=f"visitor{i}@example.com",
+            entity_type="store", entity_id="store-0001", rating=1 + i % 5,
+            comment="Friendly staff and quick service. Tax refund was handled on the spot.",
+            helpful_count=i % 7, reply_count=replies_per_review,
+            created_at=now - timedelta(hours=i), updated_at=now - timedelta(hours=i),
+        ))
+        rows = []
+        for j in range(replies_per_review):
+            parent = rows[-1].id if rows and j % 3 == 2 else None
+            rows.append(SimpleNamespace(
+                id=f"{review_id}-reply-{j}", review_id=review_id, user_id=f"user-{j}", name=f"Visitor {j}",
+                email=f"visitor{j}@example.com", parent_reply_id=parent, comment="Thanks for the tip!",
+                created_at=now + timedelta(minutes=j), updated_at=now + timedelta(minutes=j),
+            ))
+        reply_rows[review_id] = rows
+    return review_rows, reply_rows
+
+def review_fields(row) -> dict:
+    return {
+        "id": row.id, "user_id": row.user_id, "user": {"id": row.user_id, "name": row.name, "email": row.email},
+        "entity_type": row.entity_type, "entity_id": row.entity_id, "rating": row.rating, "comment": row.comment,
+        "helpful_count": row.helpful_count, "user_has_marked_helpful": False, "reply_count": row.reply_count,
+        "created_at": row.created_at, "updated_at": row.updated_at,
+    }
+
+def reply_tree(rows, make):
+    """Nest reply rows under their parents; make(row, children) builds one node"""
+    children = {}
+    for row in rows:
+        children.setdefault(row.parent_reply_id, []).append(row)
+
+    def build(row):
+        return make(row, [build(child) for child in children.get(row.id, [])])
+
+    return [build(row) for row in children.get(None, [])]
+
+def reply_fields(row) -> dict:
+    return {
+        "id": row.id, "review_id": row.review_id, "user_id": row.user_id,
+        "user": {"id": row.user_id, "name": row.name, "email": row.email},
+        "parent_reply_id": row.parent_reply_id, "comment": row.comment,
+        "created_at": row.created_at, "updated_at": row.updated_at,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=100)
+    parser.add_argument("--replies", type=int, default=6, help="replies per review")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from app.schemas.review import ReplyResponse, ReviewWithRepliesResponse
+
+    review_rows, reply_rows = make_rows(args.reviews, args.replies)
+    render_json = renderer(List[ReviewWithRepliesResponse], JSONResponse)
+    render_orjson = renderer(List[ReviewWithRepliesResponse], ORJSONResponse)
+
+    def models():
+        return [
+            ReviewWithRepliesResponse(**review_fields(row), replies=reply_tree(
+                reply_rows[row.id], lambda reply, children: ReplyResponse(**reply_fields(reply), child_replies=children)))
+            for row in review_rows
+        ]
+
+    def payloads():
+        return [
+            {**review_fields(row), "replies": reply_tree(
+                reply_rows[row.id], lambda reply, children: {**reply_fields(reply), "child_replies": children})}
+            for row in review_rows
+        ]
+
+    variants = {
+        "models": lambda: render_json(models()),
+        "models+orjson": lambda: render_orjson(models()),
+        "payload": lambda: ORJSONResponse(payloads()).body,
+    }
+    bodies = {name: variant() for name, variant in variants.items()}
+    assert json.loads(bodies["models"]) == json.loads(bodies["payload"]) == json.loads(bodies["models+orjson"])
+
+    print(f"reviews={args.reviews} replies/review={args.replies} body={len(bodies['payload']) / 1024:.0f} KiB")
+    print(f"{'variant':<15}{'ms/page':>10}{'peak KiB':>10}{'speedup':>9}")
+    baseline = None
+    for name, variant in variants.items():
+        timer = timeit.Timer(variant)
+        number, _ = timer.autorange()
+        seconds = min(timer.repeat(repeat=args.rounds, number=number)) / number
+        tracemalloc.start()
+        variant()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        baseline = baseline or seconds
+        print(f"{name:<15}{seconds * 1000:>10.2f}{peak / 1024:>10.0f}{baseline / seconds:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
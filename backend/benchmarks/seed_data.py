@@ -0,0 +1,229 @@
+"""
+Synthetic data generator for load tests
+
+Seeds users, stores around Seoul and Busan shopping districts, store
+reviews, replies and helpful votes. Generation is deterministic: the same
+scale and seed always produce the same rows and IDs, so the load driver
+(benchmarks.load_test) can address seeded entities without querying the
+database. Review popularity is skewed (a few stores get most reviews), as
+in production.
+
+Scales:
+    10k  10,000 users, 1,000 stores, 10,000 reviews, 3,000 replies, 20,000 helpful votes
+    1m   1,000,000 users, 20,000 stores, 1,000,000 reviews, 300,000 replies, 1,000,000 helpful votes
+
+Every seeded user logs in as loadtest<N>@loadtest.example.com with
+password PASSWORD. The database is migrated to head first.
+
+Usage (from backend/):
+    DATABASE_URL=postgresql://... python -m benchmarks.seed_data --scale 10k
+    DATABASE_URL=sqlite:////dev/shm/load.db python -m benchmarks.seed_data --scale 10k --wipe
+"""
+import argparse
+import itertools
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+SCALES = {
+    "10k": {"users": 10_000, "stores": 1_000, "reviews": 10_000, "replies": 3_000, "helpful": 20_000},
+    "1m": {"users": 1_000_000, "stores": 20_000, "reviews": 1_000_000, "replies": 300_000, "helpful": 1_000_000},
+}
+
+PASSWORD = "loadtest-password"
+
+# (name, latitude, longitude, share of stores)
+DISTRICTS = [
+    ("Myeongdong, Seoul", 37.5636, 126.9826, 0.16),
+    ("Gangnam, Seoul", 37.4979, 127.0276, 0.14),
+    ("Hongdae, Seoul", 37.5563, 126.9236, 0.10),
+    ("Insadong, Seoul", 37.5740, 126.9850, 0.07),
+    ("Dongdaemun, Seoul", 37.5663, 127.0092, 0.08),
+    ("Itaewon, Seoul", 37.5345, 126.9946, 0.06),
+    ("Jamsil, Seoul", 37.5133, 127.1001, 0.07),
+    ("Haeundae, Busan", 35.1587, 129.1604, 0.11),
+    ("Seomyeon, Busan", 35.1578, 129.0600, 0.09),
+    ("Nampo-dong, Busan", 35.0983, 129.0300, 0.07),
+    ("Gwangalli, Busan", 35.1532, 129.1187, 0.05),
+]
+
+# Scatter of stores around a district centre, in degrees (~1 km)
+DISTRICT_SPREAD = 0.01
+
+CATEGORY_WEIGHTS = [("RESTAURANT", 0.45), ("RETAIL", 0.30), ("CULTURE", 0.10), ("DUTY_FREE", 0.08), ("TRANSPORT", 0.07)]
+
+COUNTRY_WEIGHTS = [("CN", 0.30), ("JP", 0.20), ("US", 0.12), ("TW", 0.08), ("VN", 0.06), ("TH", 0.05),
+                   ("HK", 0.05), ("PH", 0.04), ("SG", 0.03), ("DE", 0.03), ("FR", 0.02), ("GB", 0.02)]
+
+COMMENT_PHRASES = [
+    "Friendly staff and quick service.", "A bit crowded on weekends.", "Prices were reasonable.",
+    "Easy to find from the subway station.", "Tax refund was handled on the spot.",
+    "Menu in English was very helpful.", "Would definitely come back.", "Long queue but worth it.",
+    "Great place to pick up souvenirs.", "Points were added right after paying.",
+]
+
+# Reviews are spread over the last year
+HISTORY_DAYS = 365
+BATCH_SIZE = 5000
+NAMESPACE = uuid.UUID("7d9c5c4e-3f0a-4d5e-9a61-0c8f5b0e2a17")
+
+def user_id(i: int) -> str:
+    return str(uuid.uuid5(NAMESPACE, f"user-{i}"))
+
+def user_email(i: int) -> str:
+    return f"loadtest{i}@loadtest.example.com"
+
+def store_id(i: int) -> str:
+    return str(uuid.uuid5(NAMESPACE, f"store-{i}"))
+
+def review_id(i: int) -> str:
+    return str(uuid.uuid5(NAMESPACE, f"review-{i}"))
+
+def reply_id(i: int) -> str:
+    return str(uuid.uuid5(NAMESPACE, f"reply-{i}"))
+
+def store_popularity(stores: int) -> list:
+    """Cumulative Zipf-like weights for picking a store to review"""
+    return list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(stores)))
+
+def _timestamp(rng: random.Random, now: datetime) -> datetime:
+    return now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+
+def _comment(rng: random.Random) -> str:
+    return " ".join(rng.sample(COMMENT_PHRASES, rng.randint(1, 3)))
+
+def generate_users(rng: random.Random, count: int, hashed_password: str, now: datetime):
+    countries, weights = zip(*COUNTRY_WEIGHTS)
+    for i in range(count):
+        created = _timestamp(rng, now)
+        country = rng.choices(countries, weights)[0]
+        yield {
+            "id": user_id(i), "email": user_email(i), "hashed_password": hashed_password,
+            "name": f"Load Test {i}", "country": country, "nationality": country,
+            "preferred_language": "en", "customer_id": f"OMP-{country}-LT{i:07d}",
+            "provider": "email", "created_at": created, "updated_at": created,
+        }
+
+def generate_stores(rng: random.Random, count: int):
+    from app.models.store import StoreCategory
+
+    districts = [district[:3] for district in DISTRICTS]
+    district_weights = [district[3] for district in DISTRICTS]
+    categories, category_weights = zip(*CATEGORY_WEIGHTS)
+    for i in range(count):
+        district, latitude, longitude = rng.choices(districts, district_weights)[0]
+        category = StoreCategory[rng.choices(categories, category_weights)[0]]
+        yield {
+            "id": store_id(i), "name": f"{district.split(',')[0]} {category.value.replace('_', ' ').title()} {i}",
+            "category": category, "address": district,
+            "latitude": round(rng.gauss(latitude, DISTRICT_SPREAD), 6),
+            "longitude": round(rng.gauss(longitude, DISTRICT_SPREAD), 6),
+            "point_rate": rng.choice([1.0, 1.0, 1.5, 2.0, 3.0]),
+            "opening_hours": "10:00-22:00",
+        }
+
+def generate_reviews(rng: random.Random, counts: dict, now: datetime):
+    from app.models.review import EntityType
+
+    popularity = store_popularity(counts["stores"])
+    stores = range(counts["stores"])
+    seen = set()
+    for i in range(counts["reviews"]):
+        # One review per user and store (unique_user_entity_review)
+        while True:
+            user = rng.randrange(counts["users"])
+            store = rng.choices(stores, cum_weights=popularity)[0]
+            if (user, store) not in seen:
+                seen.add((user, store))
+                break
+        created = _timestamp(rng, now)
+        yield {
+            "id": review_id(i), "user_id": user_id(user), "entity_type": EntityType.STORE,
+            "entity_id": store_id(store), "rating": rng.choices(range(1, 6), [5, 7, 15, 35, 38])[0],
+            "comment": _comment(rng), "created_at": created, "updated_at": created,
+        }
+
+def generate_replies(rng: random.Random, counts: dict, now: datetime):
+    previous_review = None
+    for i in range(counts["replies"]):
+        # A fifth of replies answer the previous reply on the same review
+        if previous_review is not None and rng.random() < 0.2:
+            review, parent = previous_review, reply_id(i - 1)
+        else:
+            review, parent = rng.randrange(counts["reviews"]), None
+        previous_review = review
+        created = _timestamp(rng, now)
+        yield {
+            "id": reply_id(i), "review_id": review_id(review), "user_id": user_id(rng.randrange(counts["users"])),
+            "parent_reply_id": parent, "comment": _comment(rng), "created_at": created, "updated_at": created,
+        }
+
+def generate_helpful(rng: random.Random, counts: dict, now: datetime):
+    seen = set()
+    for i in range(counts["helpful"]):
+        while True:
+            user, review = rng.randrange(counts["users"]), rng.randrange(counts["reviews"])
+            if (user, review) not in seen:
+                seen.add((user, review))
+                break
+        yield {
+            "id": str(uuid.uuid5(NAMESPACE, f"helpful-{i}")), "review_id": review_id(review),
+            "user_id": user_id(user), "created_at": _timestamp(rng, now),
+        }
+
+def insert(engine, table, rows, total: int):
+    """Insert generated rows in batches, one transaction per batch"""
+    start = time.perf_counter()
+    done = 0
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+        with engine.begin() as connection:
+            connection.execute(table.insert(), batch)
+        done += len(batch)
+        print(f"\r[Seed] {table.name}: {done}/{total}", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"\r[Seed] {table.name}: {done} rows in {elapsed:.1f}s ({done / max(elapsed, 1e-9):,.0f} rows/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--wipe", action="store_true",
+                        help="delete ALL users, stores and reviews first (never point this at a real database)")
+    args = parser.parse_args()
+
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import delete
+    from app.database import engine
+    from app.models import Review, ReviewHelpful, ReviewReply, Store, User
+    from app.utils.auth import get_password_hash
+    from app.utils.schema_version import ALEMBIC_INI
+
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+
+    tables = [User.__table__, Store.__table__, Review.__table__, ReviewReply.__table__, ReviewHelpful.__table__]
+    if args.wipe:
+        with engine.begin() as connection:
+            for table in reversed(tables):
+                connection.execute(delete(table))
+
+    counts = SCALES[args.scale]
+    rng = random.Random(args.seed)
+    # Fixed reference time so reruns produce identical rows
+    now = datetime(2025, 1, 1)
+    # bcrypt is deliberately slow; every seeded user shares one hash
+    hashed_password = get_password_hash(PASSWORD)
+    print(f"[Seed] scale={args.scale} seed={args.seed} {counts}")
+
+    insert(engine, User.__table__, generate_users(rng, counts["users"], hashed_password, now), counts["users"])
+    insert(engine, Store.__table__, generate_stores(rng, counts["stores"]), counts["stores"])
+    insert(engine, Review.__table__, generate_reviews(rng, counts, now), counts["reviews"])
+    insert(engine, ReviewReply.__table__, generate_replies(rng, counts, now), counts["replies"])
+    insert(engine, ReviewHelpful.__table__, generate_helpful(rng, counts, now), counts["helpful"])
+
+if __name__ == "__main__":
+    main()
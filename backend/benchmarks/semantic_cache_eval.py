@@ -0,0 +1,89 @@
+"""
+Semantic cache precision/latency evaluation
+
+Loads the labelled question set in benchmarks/data/semantic_cache_eval.json,
+caches one question per group and asks the paraphrases (should hit that
+group), the near-miss questions and the unrelated questions (should not
+hit). Reports precision and recall for a sweep of similarity thresholds,
+then lookup latency with the index padded to --index-size entries.
+
+Usage (from backend/):
+    python -m benchmarks.semantic_cache_eval --index-size 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import string
+import time
+
+DATA = os.path.join(os.path.dirname(__file__), "data", "semantic_cache_eval.json")
+
+def evaluate(cache, data):
+    """Returns [(similarity, correct)] for every lookup that returned an answer, and the paraphrase count"""
+    for i, group in enumerate(data["groups"]):
+        cache.add("eval", group["language"], group["cached"], {"group": i})
+
+    hits = []
+    paraphrases = 0
+    for i, group in enumerate(data["groups"]):
+        for question in group["paraphrases"]:
+            paraphrases += 1
+            answer, score = cache.lookup("eval", group["language"], question)
+            if answer is not None:
+                hits.append((score, answer["group"] == i))
+        for question in group["different"]:
+            answer, score = cache.lookup("eval", group["language"], question)
+            if answer is not None:
+                hits.append((score, False))
+    for item in data["unrelated"]:
+        answer, score = cache.lookup("eval", item["language"], item["question"])
+        if answer is not None:
+            hits.append((score, False))
+    return hits, paraphrases
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index-size", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.services.semantic_cache import SemanticCache
+
+    with open(DATA, encoding="utf-8") as f:
+        data = json.load(f)
+
+    # Threshold 0 returns the best match for every lookup; filter per threshold
+    hits, paraphrases = evaluate(SemanticCache(threshold=0.0, ttl_seconds=3600), data)
+    print(f"{len(data['groups'])} cached questions, {paraphrases} paraphrases, "
+          f"{sum(len(g['different']) for g in data['groups']) + len(data['unrelated'])} negatives\n")
+    print("threshold  precision  recall  hits")
+    for threshold in (0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8):
+        returned = [correct for score, correct in hits if score >= threshold]
+        precision = sum(returned) / len(returned) if returned else 1.0
+        recall = sum(returned) / paraphrases
+        marker = "  <- configured" if abs(threshold - settings.CHATBOT_SEMANTIC_CACHE_THRESHOLD) < 1e-9 else ""
+        print(f"{threshold:9.2f}  {precision:9.1%}  {recall:6.1%}  {len(returned):4d}{marker}")
+
+    cache = SemanticCache(threshold=settings.CHATBOT_SEMANTIC_CACHE_THRESHOLD, ttl_seconds=3600,
+                          max_entries=args.index_size)
+    rng = random.Random(0)
+    for _ in range(args.index_size):
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(8)]
+        cache.add("eval", "en", " ".join(words), {"group": -1})
+    questions = [q for g in data["groups"] if g["language"] == "en" for q in g["paraphrases"]]
+
+    timings = []
+    for i in range(args.lookups):
+        start = time.perf_counter()
+        cache.lookup("eval", "en", questions[i % len(questions)])
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"\nlookup latency with {args.index_size} cached questions: "
+          f"p50 {statistics.median(timings) * 1e6:.0f} us, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.0f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Google Sheets row lookup benchmark
+
+Fills a fake sheet with N user rows and times updating batches of users
+two ways: fetching and scanning the whole user ID column for every batch
+(the previous behaviour) and addressing rows through the persisted row
+index. Also reports how many cells each approach reads from the Sheets API.
+
+Usage (from backend/):
+    python -m benchmarks.sheets_row_index --rows 100000 --batches 50 --batch-size 20
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batches", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmp_dir}/bench.db")
+
+    from app.database import Base, engine
+    from app.models.sheets_row_index import SheetsRowIndex  # noqa: F401
+    from app.services import google_sheets
+    from benchmarks.stubs import FakeSheets
+
+    Base.metadata.create_all(bind=engine)
+
+    fake = FakeSheets()
+    fake.rows.append(['User ID'])
+    fake.rows.extend([f"user-{i}", f"OMP-{i}", f"User {i}"] for i in range(args.rows))
+    sheets = google_sheets.GoogleSheetsService(service=fake)
+
+    start = time.perf_counter()
+    sheets.reconcile_row_index()
+    print(f"rows={args.rows} batches={args.batches} batch_size={args.batch_size} "
+          f"reconcile={(time.perf_counter() - start) * 1000:.0f}ms")
+
+    def column_scan_update(users):
+        """The pre-index update path: fetch column A and scan it per batch"""
+        result = fake.spreadsheets().values().get(spreadsheetId='', range='Sheet1!A:A').execute()
+        row_numbers = {row[0]: idx + 1 for idx, row in enumerate(result.get('values', [])) if row}
+        data = []
+        for user in users:
+            row_number = row_numbers[user['id']]
+            row = google_sheets._user_row(user, '')
+            data.append({'range': f'Sheet1!A{row_number}:N{row_number}', 'values': [row[:14]]})
+            data.append({'range': f'Sheet1!P{row_number}:R{row_number}', 'values': [row[15:]]})
+        fake.spreadsheets().values().batchUpdate(spreadsheetId='', body={'data': data}).execute()
+
+    def run(label, update):
+        timings = []
+        fake.calls.clear()
+        fake.cells_read = 0
+        for _ in range(args.batches):
+            users = [
+                {'id': f"user-{random.randrange(args.rows)}", 'name': 'Updated', 'preferred_language': 'ko'}
+                for _ in range(args.batch_size)
+            ]
+            start = time.perf_counter()
+            update(users)
+            timings.append(time.perf_counter() - start)
+        print(f"{label:>12}: median={statistics.median(timings) * 1000:.2f}ms "
+              f"max={max(timings) * 1000:.2f}ms cells_read/batch={fake.cells_read / args.batches:.0f} "
+              f"calls={fake.calls}")
+
+    run("column scan", column_scan_update)
+    run("row index", sheets.update_users)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Local stub servers for benchmarks
+Stands in for external providers so benchmarks never leave the machine
+"""
+import asyncio
+import socket
+import threading
+import time
+import uvicorn
+from fastapi import FastAPI, Request
+
+def create_oauth_stub_app(latency_seconds: float = 0.1) -> FastAPI:
+    """Stub Google/Facebook/Kakao profile endpoints with a fixed latency"""
+    stub = FastAPI()
+
+    def _user_from_token(token: str) -> str:
+        return token.replace("Bearer ", "") or "anonymous"
+
+    @stub.get("/google/userinfo")
+    async def google_userinfo(request: Request):
+        await asyncio.sleep(latency_seconds)
+        user = _user_from_token(request.headers.get("authorization", ""))
+        return {"sub": f"g-{user}", "email": f"{user}@gmail.test", "name": user, "picture": ""}
+
+    @stub.get("/facebook/me")
+    async def facebook_me(access_token: str = ""):
+        await asyncio.sleep(latency_seconds)
+        user = _user_from_token(access_token)
+        return {"id": f"fb-{user}", "email": f"{user}@facebook.test", "name": user}
+
+    @stub.get("/kakao/me")
+    async def kakao_me(request: Request):
+        await asyncio.sleep(latency_seconds)
+        user = _user_from_token(request.headers.get("authorization", ""))
+        return {
+            "id": f"k-{user}",
+            "kakao_account": {"email": f"{user}@kakao.test", "profile": {"nickname": user}}
+        }
+
+    return stub
+
+def create_llm_stub_app(latency_seconds: float = 0.5, reply: str = "Hello from the stub model.") -> FastAPI:
+    """
+    Stub Anthropic Messages and OpenAI Chat Completions endpoints
+
+    Non-streaming only; every call answers `reply` after a fixed latency.
+    Point ANTHROPIC_BASE_URL at the server root and OPENAI_BASE_URL at /v1.
+    """
+    stub = FastAPI()
+    stub.state.requests = 0
+
+    @stub.post("/v1/messages")
+    async def anthropic_messages(request: Request):
+        body = await request.json()
+        stub.state.requests += 1
+        await asyncio.sleep(latency_seconds)
+        return {
+            "id": f"msg_{stub.state.requests}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "stub"),
+            "content": [{"type": "text", "text": reply}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 100, "output_tokens": 20}
+        }
+
+    @stub.post("/v1/chat/completions")
+    async def openai_chat_completions(request: Request):
+        body = await request.json()
+        stub.state.requests += 1
+        await asyncio.sleep(latency_seconds)
+        return {
+            "id": f"chatcmpl-{stub.state.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+        }
+
+    return stub
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def serve_in_thread(app: FastAPI, port: int) -> uvicorn.Server:
+    """Run an ASGI app on 127.0.0.1:port in a daemon thread and wait until it accepts connections"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+class FakeSheets:
+    """
+    In-memory stand-in for the Sheets v4 client used by GoogleSheetsService
+
+    Supports the spreadsheets().values() calls the service makes and counts
+    API calls so benchmarks can report request volume.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.rows = []
+        self.calls = {}
+        self.cells_read = 0
+        self.latency_seconds = latency_seconds
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _request(self, name, result_fn):
+        fake = self
+
+        class _Request:
+            def execute(self):
+                fake.calls[name] = fake.calls.get(name, 0) + 1
+                if fake.latency_seconds:
+                    time.sleep(fake.latency_seconds)
+                return result_fn()
+
+        return _Request()
+
+    def get(self, spreadsheetId, range):
+        def result():
+            sheet_range = range.split('!')[1]
+            if sheet_range == 'A:A':
+                self.cells_read += len(self.rows)
+                return {'values': [[row[0]] if row else [] for row in self.rows]}
+            start, end = sheet_range.split(':')
+            first = int(''.join(filter(str.isdigit, start)) or 1)
+            last = int(''.join(filter(str.isdigit, end)) or len(self.rows))
+            values = self.rows[first - 1:last]
+            return {'values': values} if values else {}
+        return self._request('get', result)
+
+    def batchGet(self, spreadsheetId, ranges):
+        def result():
+            value_ranges = []
+            self.cells_read += len(ranges)
+            for sheet_range in ranges:
+                cell = sheet_range.split('!')[1]
+                row_number = int(cell[1:])
+                row = self.rows[row_number - 1] if row_number <= len(self.rows) else []
+                value_ranges.append({'range': sheet_range, 'values': [[row[0]]]} if row else {'range': sheet_range})
+            return {'valueRanges': value_ranges}
+        return self._request('batchGet', result)
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        def result():
+            first = len(self.rows) + 1
+            self.rows.extend(list(row) for row in body['values'])
+            return {'updates': {'updatedRange': f"Sheet1!A{first}:R{len(self.rows)}"}}
+        return self._request('append', result)
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        def result():
+            self._write(range, body['values'][0])
+            return {}
+        return self._request('update', result)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def result():
+            for item in body['data']:
+                self._write(item['range'], item['values'][0])
+            return {}
+        return self._request('batchUpdate', result)
+
+    def _write(self, sheet_range, values):
+        start = sheet_range.split('!')[1].split(':')[0]
+        column = ord(start[0]) - ord('A')
+        row_number = int(start[1:])
+        while len(self.rows) < row_number:
+            self.rows.append([])
+        row = self.rows[row_number - 1]
+        row.extend([''] * (column + len(values) - len(row)))
+        row[column:column + len(values)] = values
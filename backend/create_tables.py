@@ -1,19 +1,22 @@
 """
-Create database tables
+Create or upgrade database tables
+Applies the Alembic migrations (same as `alembic upgrade head`)
 """
-from app.database import engine, Base
-from app.models import user, point, store, mission
+from alembic import command
+from alembic.config import Config
+from app.utils.schema_version import ALEMBIC_INI
 
-print("Creating database tables...")
+print("Migrating database to the latest schema...")
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+command.upgrade(Config(str(ALEMBIC_INI)), "head")
 
-print("✅ Database tables created successfully!")
-print("Tables created:")
+print("✅ Database schema is up to date!")
+print("Tables:")
 print("  - users")
 print("  - point_balances")
 print("  - point_transactions")
 print("  - stores")
 print("  - eco_missions")
 print("  - user_missions")
+print("  - reviews, review_replies, review_helpful")
+print("  - sheets_outbox, sheets_row_index")
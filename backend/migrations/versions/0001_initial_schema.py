@@ -0,0 +1,293 @@
+"""initial schema
+
+Baseline for databases previously built with Base.metadata.create_all:
+tables that already exist are left alone, and the indexes from
+database/schema.sql are added where missing. On PostgreSQL this also
+installs the schema.sql triggers (point balance bookkeeping and
+updated_at on reviews).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 19:35:37.311435
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum columns store member names, so the triggers compare against names too
+POSTGRES_TRIGGERS = """
+CREATE OR REPLACE FUNCTION update_point_balance()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.type = 'EARN' OR NEW.type = 'CHARGE' THEN
+        UPDATE point_balances
+        SET balance = balance + NEW.amount,
+            last_updated = CURRENT_TIMESTAMP
+        WHERE user_id = NEW.user_id;
+    ELSIF NEW.type = 'SPEND' THEN
+        UPDATE point_balances
+        SET balance = balance - NEW.amount,
+            last_updated = CURRENT_TIMESTAMP
+        WHERE user_id = NEW.user_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_update_point_balance ON point_transactions;
+CREATE TRIGGER trigger_update_point_balance
+AFTER INSERT ON point_transactions
+FOR EACH ROW
+EXECUTE FUNCTION update_point_balance();
+
+CREATE OR REPLACE FUNCTION init_point_balance()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO point_balances (user_id, balance)
+    VALUES (NEW.id, 0)
+    ON CONFLICT (user_id) DO NOTHING;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_init_point_balance ON users;
+CREATE TRIGGER trigger_init_point_balance
+AFTER INSERT ON users
+FOR EACH ROW
+EXECUTE FUNCTION init_point_balance();
+
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_reviews_updated_at ON reviews;
+CREATE TRIGGER trigger_reviews_updated_at
+BEFORE UPDATE ON reviews
+FOR EACH ROW
+EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS trigger_review_replies_updated_at ON review_replies;
+CREATE TRIGGER trigger_review_replies_updated_at
+BEFORE UPDATE ON review_replies
+FOR EACH ROW
+EXECUTE FUNCTION update_updated_at_column()
+"""
+
+DROP_POSTGRES_TRIGGERS = """
+DROP TRIGGER IF EXISTS trigger_review_replies_updated_at ON review_replies;
+DROP TRIGGER IF EXISTS trigger_reviews_updated_at ON reviews;
+DROP TRIGGER IF EXISTS trigger_init_point_balance ON users;
+DROP TRIGGER IF EXISTS trigger_update_point_balance ON point_transactions;
+DROP FUNCTION IF EXISTS update_updated_at_column();
+DROP FUNCTION IF EXISTS init_point_balance();
+DROP FUNCTION IF EXISTS update_point_balance()
+"""
+
+
+def _existing_tables() -> set:
+    # Offline (--sql) runs cannot inspect the database and emit everything
+    if op.get_context().as_sql:
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _create_table(existing: set, name: str, *columns):
+    if name not in existing:
+        op.create_table(name, *columns)
+
+
+def upgrade() -> None:
+    existing = _existing_tables()
+
+    _create_table(existing, 'users',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('country', sa.String(), nullable=False),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('preferred_language', sa.String(), nullable=True),
+        sa.Column('customer_id', sa.String(), nullable=True),
+        sa.Column('passport_number', sa.String(), nullable=True),
+        sa.Column('date_of_birth', sa.String(), nullable=True),
+        sa.Column('nationality', sa.String(), nullable=True),
+        sa.Column('passport_expiry', sa.String(), nullable=True),
+        sa.Column('provider', sa.String(), nullable=True),
+        sa.Column('provider_id', sa.String(), nullable=True),
+        sa.Column('profile_picture', sa.String(), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True, if_not_exists=True)
+    op.create_index('ix_users_customer_id', 'users', ['customer_id'], unique=True, if_not_exists=True)
+
+    _create_table(existing, 'point_balances',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('balance', sa.Integer(), nullable=False),
+        sa.Column('last_updated', sa.DateTime(), nullable=True),
+        sa.CheckConstraint('balance >= 0', name='check_balance_non_negative'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    _create_table(existing, 'point_transactions',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('type', sa.Enum('EARN', 'SPEND', 'CHARGE', name='transactiontype'), nullable=False),
+        sa.Column('source', sa.Enum('PURCHASE', 'MISSION', 'CARD_CHARGE', 'REFUND', name='transactionsource'), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_point_transactions_user_id', 'point_transactions', ['user_id'], if_not_exists=True)
+    op.create_index('idx_point_transactions_created_at', 'point_transactions', [sa.text('created_at DESC')],
+                    if_not_exists=True)
+
+    _create_table(existing, 'stores',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('category', sa.Enum('DUTY_FREE', 'RESTAURANT', 'RETAIL', 'TRANSPORT', 'CULTURE', name='storecategory'), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('address', sa.String(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('point_rate', sa.Float(), nullable=True),
+        sa.Column('images', sa.Text(), nullable=True),
+        sa.Column('opening_hours', sa.String(), nullable=True),
+        sa.Column('contact', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_stores_category', 'stores', ['category'], if_not_exists=True)
+    op.create_index('idx_stores_location', 'stores', ['latitude', 'longitude'], if_not_exists=True)
+
+    _create_table(existing, 'eco_missions',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('type', sa.Enum('DAILY', 'WEEKLY', 'SPECIAL', name='missiontype'), nullable=False),
+        sa.Column('requirements', sa.Text(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    _create_table(existing, 'user_missions',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('mission_id', sa.String(), nullable=False),
+        sa.Column('status', sa.Enum('ACTIVE', 'COMPLETED', 'EXPIRED', name='missionstatus'), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['mission_id'], ['eco_missions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'mission_id', name='unique_user_mission')
+    )
+    op.create_index('idx_user_missions_user_id', 'user_missions', ['user_id'], if_not_exists=True)
+    op.create_index('idx_user_missions_status', 'user_missions', ['status'], if_not_exists=True)
+
+    _create_table(existing, 'reviews',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('entity_type', sa.Enum('MEDICAL_FACILITY', 'SDM_PACKAGE', 'STORE', name='entitytype'), nullable=False),
+        sa.Column('entity_id', sa.String(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'entity_type', 'entity_id', name='unique_user_entity_review')
+    )
+    op.create_index('ix_reviews_entity_id', 'reviews', ['entity_id'], if_not_exists=True)
+    op.create_index('idx_reviews_entity', 'reviews', ['entity_type', 'entity_id'], if_not_exists=True)
+    op.create_index('idx_reviews_user_id', 'reviews', ['user_id'], if_not_exists=True)
+    op.create_index('idx_reviews_created_at', 'reviews', [sa.text('created_at DESC')], if_not_exists=True)
+
+    _create_table(existing, 'review_replies',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('review_id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('parent_reply_id', sa.String(), nullable=True),
+        sa.Column('comment', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['parent_reply_id'], ['review_replies.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_review_replies_review_id', 'review_replies', ['review_id'], if_not_exists=True)
+    op.create_index('idx_review_replies_parent', 'review_replies', ['parent_reply_id'], if_not_exists=True)
+
+    _create_table(existing, 'review_helpful',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('review_id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'review_id', name='unique_user_review_helpful')
+    )
+    op.create_index('idx_review_helpful_review_id', 'review_helpful', ['review_id'], if_not_exists=True)
+
+    _create_table(existing, 'sheets_outbox',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('operation', sa.Enum('SYNC', 'UPDATE', name='outboxoperation'), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'DEAD', name='outboxstatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sheets_outbox_user_id', 'sheets_outbox', ['user_id'], if_not_exists=True)
+    op.create_index('ix_sheets_outbox_status_next_attempt', 'sheets_outbox', ['status', 'next_attempt_at'],
+                    if_not_exists=True)
+
+    _create_table(existing, 'sheets_row_index',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('row_number', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(POSTGRES_TRIGGERS)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(DROP_POSTGRES_TRIGGERS)
+
+    for table in ('sheets_row_index', 'sheets_outbox', 'review_helpful', 'review_replies', 'reviews',
+                  'user_missions', 'eco_missions', 'stores', 'point_transactions', 'point_balances', 'users'):
+        op.drop_table(table)
+
+    if op.get_context().dialect.name == 'postgresql':
+        for enum in ('outboxstatus', 'outboxoperation', 'entitytype', 'missionstatus', 'missiontype',
+                     'storecategory', 'transactionsource', 'transactiontype'):
+            op.execute(f'DROP TYPE IF EXISTS {enum}')
@@ -0,0 +1,31 @@
+"""sheets outbox claims
+
+Outbox rows are claimed with a lease (claimed_until) in a short transaction
+and sent to Google outside it, instead of holding FOR UPDATE locks across
+the Sheets API calls. A worker that dies mid-batch leaves its rows to be
+picked up again once the lease runs out.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 21:04:12.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sheets_outbox', sa.Column('claimed_until', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sheets_outbox', 'claimed_until')
@@ -0,0 +1,21 @@
+"""
+Test settings: a throwaway SQLite database, no Redis, and query budgets enforced
+
+Set before any app module is imported, so the engine and settings pick them up.
+"""
+import os
+import tempfile
+import pytest
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='omnipass-tests-')}/test.db"
+os.environ["REDIS_URL"] = ""
+os.environ["QUERY_BUDGET_ENFORCE"] = "true"
+
+@pytest.fixture(scope="session")
+def migrated_db():
+    """Bring the test database to the migrations' head (once per run)"""
+    from alembic import command
+    from alembic.config import Config
+    from app.utils.schema_version import ALEMBIC_INI
+
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
@@ -0,0 +1,60 @@
+"""
+Stored chatbot conversations can only be continued by the user who started them
+
+Run from backend/:
+    pytest tests/test_chatbot_conversations.py
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import chatbot as chatbot_router
+from app.utils.auth import create_access_token
+
+class FakeChatbot:
+    """Echoes the message and records the history each call received"""
+
+    provider = "fake"
+
+    def __init__(self):
+        self.histories = []
+
+    async def chat(self, user_message: str, language: str = "en", conversation_history: list = None):
+        self.histories.append(list(conversation_history or []))
+        return {"response": f"echo: {user_message}"}
+
+@pytest.fixture
+def fake_chatbot(monkeypatch):
+    fake = FakeChatbot()
+    monkeypatch.setattr(chatbot_router, "get_chatbot", lambda: fake)
+    return fake
+
+@pytest.fixture
+def client(fake_chatbot):
+    app = FastAPI()
+    app.include_router(chatbot_router.router, prefix="/api/chatbot")
+    return TestClient(app)
+
+def auth(user_id: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+
+def chat(client, message: str, conversation_id: str = None, headers: dict = None):
+    return client.post("/api/chatbot/chat", json={"message": message, "conversation_id": conversation_id},
+                       headers=headers or {})
+
+def test_owner_continues_conversation(client, fake_chatbot):
+    conversation_id = chat(client, "Hi, I am Minsu", headers=auth("user-a")).json()["conversation_id"]
+    response = chat(client, "What is my name?", conversation_id, headers=auth("user-a"))
+    assert response.status_code == 200
+    assert fake_chatbot.histories[-1][0] == {"role": "user", "content": "Hi, I am Minsu"}
+
+def test_other_user_gets_404(client, fake_chatbot):
+    conversation_id = chat(client, "Hi, I am Minsu", headers=auth("user-a")).json()["conversation_id"]
+    assert chat(client, "What is my name?", conversation_id, headers=auth("user-b")).status_code == 404
+    assert chat(client, "What is my name?", conversation_id).status_code == 404
+    # The history never reached the provider
+    assert len(fake_chatbot.histories) == 1
+
+def test_anonymous_conversation_is_not_claimable_by_a_user(client):
+    conversation_id = chat(client, "Hello").json()["conversation_id"]
+    assert chat(client, "Again", conversation_id).status_code == 200
+    assert chat(client, "Again", conversation_id, headers=auth("user-a")).status_code == 404
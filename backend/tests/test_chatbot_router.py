@@ -0,0 +1,148 @@
+"""
+ChatbotRouter failover and hedging against fake providers with injected latency
+
+Run from backend/:
+    pytest tests/test_chatbot_router.py
+"""
+import asyncio
+import time
+import pytest
+from app.services.chatbot_router import ChatbotRouter
+
+pytestmark = pytest.mark.asyncio
+
+class FakeProvider:
+    """Chatbot stand-in that sleeps `latency` seconds, then answers or fails"""
+
+    def __init__(self, name: str, latency: float = 0.0, error: bool = False,
+                 stream_tokens: tuple = ("Hello", " there"), stream_error_after: int = None):
+        self.provider = name
+        self.model = f"{name}-fake"
+        self.latency = latency
+        self.error = error
+        self.stream_tokens = stream_tokens
+        # Raise after yielding this many tokens (0: before the first one)
+        self.stream_error_after = stream_error_after
+        self.calls = 0
+        self.started_at = []
+        self.cancelled = 0
+
+    async def chat(self, user_message: str, language: str = "en", conversation_history: list = None):
+        self.calls += 1
+        self.started_at.append(time.perf_counter())
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            return {"response": "", "error": f"{self.provider} failed"}
+        return {"response": f"answer from {self.provider}"}
+
+    async def stream_chat(self, user_message: str, language: str = "en", conversation_history: list = None):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        for i, token in enumerate(self.stream_tokens):
+            if i == self.stream_error_after:
+                raise RuntimeError(f"{self.provider} stream failed")
+            yield token
+
+def warm_p95(router: ChatbotRouter, provider: str, latency: float, samples: int = 20):
+    for _ in range(samples):
+        router.stats[provider].record(latency, True)
+
+async def collect(stream) -> list:
+    return [token async for token in stream]
+
+async def test_fails_over_on_error():
+    primary, backup = FakeProvider("claude", error=True), FakeProvider("openai")
+    router = ChatbotRouter([primary, backup], attempt_timeout=1.0)
+
+    result = await router.chat("hi")
+
+    assert result["response"] == "answer from openai"
+    assert (primary.calls, backup.calls) == (1, 1)
+
+async def test_fails_over_on_timeout():
+    primary, backup = FakeProvider("claude", latency=5.0), FakeProvider("openai")
+    router = ChatbotRouter([primary, backup], attempt_timeout=0.05)
+
+    start = time.perf_counter()
+    result = await router.chat("hi")
+
+    assert result["response"] == "answer from openai"
+    assert time.perf_counter() - start < 1.0
+    assert primary.cancelled == 1
+
+async def test_returns_last_error_when_every_provider_fails():
+    router = ChatbotRouter([FakeProvider("claude", error=True), FakeProvider("openai", error=True)],
+                           attempt_timeout=1.0)
+
+    result = await router.chat("hi")
+
+    assert result["error"] == "openai failed"
+
+async def test_provider_in_cool_down_is_tried_last():
+    primary, backup = FakeProvider("claude", error=True), FakeProvider("openai")
+    router = ChatbotRouter([primary, backup], attempt_timeout=1.0)
+    for _ in range(5):
+        await router.chat("hi")
+    primary.calls = backup.calls = 0
+
+    await router.chat("hi")
+
+    assert (primary.calls, backup.calls) == (0, 1)
+
+async def test_hedge_fires_after_primary_p95_and_cancels_the_loser():
+    primary, backup = FakeProvider("claude", latency=2.0), FakeProvider("openai", latency=0.01)
+    router = ChatbotRouter([primary, backup], attempt_timeout=5.0, hedge=True, hedge_min_delay=0.01)
+    warm_p95(router, "claude", 0.1)
+
+    start = time.perf_counter()
+    result = await router.chat("hi")
+    # The losing call is cancelled without being awaited; let it unwind
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert result["response"] == "answer from openai"
+    hedge_delay = backup.started_at[0] - start
+    assert 0.1 <= hedge_delay < 0.5
+    assert time.perf_counter() - start < 1.0
+    assert primary.cancelled == 1
+
+async def test_hedge_not_fired_when_primary_answers_within_p95():
+    primary, backup = FakeProvider("claude", latency=0.01), FakeProvider("openai")
+    router = ChatbotRouter([primary, backup], attempt_timeout=5.0, hedge=True, hedge_min_delay=0.01)
+    warm_p95(router, "claude", 0.2)
+
+    result = await router.chat("hi")
+
+    assert result["response"] == "answer from claude"
+    assert backup.calls == 0
+
+async def test_stream_fails_over_before_first_token():
+    primary = FakeProvider("claude", stream_error_after=0)
+    backup = FakeProvider("openai", stream_tokens=("Hi", " from", " openai"))
+    router = ChatbotRouter([primary, backup], attempt_timeout=1.0)
+
+    assert await collect(router.stream_chat("hi")) == ["Hi", " from", " openai"]
+    assert (primary.calls, backup.calls) == (1, 1)
+
+async def test_stream_fails_over_when_first_token_times_out():
+    primary, backup = FakeProvider("claude", latency=5.0), FakeProvider("openai")
+    router = ChatbotRouter([primary, backup], attempt_timeout=0.05)
+
+    assert await collect(router.stream_chat("hi")) == ["Hello", " there"]
+
+async def test_stream_does_not_fail_over_after_first_token():
+    primary = FakeProvider("claude", stream_tokens=("Hel", "lo", "!"), stream_error_after=1)
+    backup = FakeProvider("openai")
+    router = ChatbotRouter([primary, backup], attempt_timeout=1.0)
+
+    received = []
+    with pytest.raises(RuntimeError, match="claude stream failed"):
+        async for token in router.stream_chat("hi"):
+            received.append(token)
+
+    assert received == ["Hel"]
+    assert backup.calls == 0
@@ -0,0 +1,168 @@
+"""
+Google ID token verification against a locally generated RSA key set
+
+The certs endpoint is an httpx.MockTransport, so no network is needed.
+
+Run from backend/:
+    pytest tests/test_google_id_token.py
+"""
+import time
+import httpx
+import pytest
+import pytest_asyncio
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from app.services import google_id_token, oauth_providers
+from app.services.google_id_token import InvalidIdToken, JWKSCache, verify_google_id_token
+from app.services.http_client import provider_http
+from app.services.oauth_providers import GoogleProvider, OAuthProviderError
+
+pytestmark = pytest.mark.asyncio
+
+CLIENT_ID = "web-client.apps.googleusercontent.com"
+JWKS_URL = "https://certs.test/oauth2/v3/certs"
+
+class SigningKey:
+    """An RSA key pair that signs tokens and publishes itself as a JWK"""
+
+    def __init__(self, kid: str):
+        self.kid = kid
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self.jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "use": "sig"}
+
+    def sign(self, **overrides) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": "minsu@example.com",
+            "email_verified": True,
+            "iat": now,
+            "exp": now + 3600,
+            **overrides
+        }
+        return jwt.encode(claims, self.private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+class CertsEndpoint:
+    """Serves the published keys, counting fetches; `down` makes it unreachable"""
+
+    def __init__(self, *keys: SigningKey):
+        self.keys = list(keys)
+        self.down = False
+        self.fetches = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.fetches += 1
+        if self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(
+            200,
+            json={"keys": [key.jwk for key in self.keys]},
+            headers={"cache-control": "public, max-age=21600"}
+        )
+
+@pytest.fixture(scope="module")
+def key_a():
+    return SigningKey("key-a")
+
+@pytest.fixture(scope="module")
+def key_b():
+    return SigningKey("key-b")
+
+@pytest_asyncio.fixture
+async def certs(monkeypatch, key_a):
+    endpoint = CertsEndpoint(key_a)
+    monkeypatch.setattr(provider_http, "client", httpx.AsyncClient(transport=httpx.MockTransport(endpoint.handler)))
+    monkeypatch.setattr(provider_http, "max_retries", 0)
+    monkeypatch.setattr(google_id_token, "google_jwks", JWKSCache(JWKS_URL))
+    yield endpoint
+    await provider_http.client.aclose()
+
+async def test_valid_token(certs, key_a):
+    claims = await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+    assert claims["email"] == "minsu@example.com"
+    assert certs.fetches == 1
+
+    # The key set is cached per its max-age
+    await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+    assert certs.fetches == 1
+
+async def test_wrong_audience(certs, key_a):
+    with pytest.raises(InvalidIdToken, match="another client"):
+        await verify_google_id_token(key_a.sign(aud="someone-else"), [CLIENT_ID])
+
+async def test_expired_token(certs, key_a):
+    now = int(time.time())
+    with pytest.raises(InvalidIdToken, match="expired"):
+        await verify_google_id_token(key_a.sign(iat=now - 7200, exp=now - 3600), [CLIENT_ID])
+
+async def test_unknown_kid_refetches_after_rotation(certs, key_a, key_b):
+    await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+    # Google publishes the new key, then starts signing with it
+    certs.keys.append(key_b)
+    claims = await verify_google_id_token(key_b.sign(), [CLIENT_ID])
+    assert claims["sub"] == "1234567890"
+    assert certs.fetches == 2
+
+async def test_unknown_kid_refetches_are_rate_limited(certs, key_a):
+    unpublished = SigningKey("key-unpublished")
+    for _ in range(3):
+        with pytest.raises(InvalidIdToken, match="Unknown signing key"):
+            await verify_google_id_token(unpublished.sign(), [CLIENT_ID])
+    # One initial fetch and one forced refetch, not one per login
+    assert certs.fetches == 2
+
+async def test_unverified_email_is_rejected(certs, key_a, monkeypatch):
+    monkeypatch.setattr(oauth_providers, "GOOGLE_CLIENT_IDS", [CLIENT_ID])
+    with pytest.raises(OAuthProviderError) as error:
+        await GoogleProvider().fetch_profile(key_a.sign(email_verified=False))
+    assert error.value.status_code == 400
+
+async def test_certs_endpoint_down_backs_off(certs, key_a):
+    cache = google_id_token.google_jwks
+    await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+
+    # Keys expire while the endpoint is down: the last good keys stay in use
+    certs.down = True
+    cache.expires_at = 0.0
+    for _ in range(5):
+        await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+    assert certs.fetches == 2
+    assert cache.retry_at > time.monotonic()
+
+    # Once the backoff has passed the next login fetches again
+    certs.down = False
+    cache.retry_at = 0.0
+    await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+    assert certs.fetches == 3
+    assert cache.expires_at > time.monotonic()
+
+async def test_certs_endpoint_down_on_first_fetch(certs, key_a):
+    certs.down = True
+    for _ in range(3):
+        with pytest.raises(InvalidIdToken, match="Unknown signing key"):
+            await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+    assert certs.fetches == 1
+
+async def test_empty_key_set_keeps_previous_keys(certs, key_a):
+    cache = google_id_token.google_jwks
+    await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+
+    certs.keys = []
+    cache.expires_at = 0.0
+    for _ in range(3):
+        await verify_google_id_token(key_a.sign(), [CLIENT_ID])
+    assert set(cache.keys) == {"key-a"}
+    assert certs.fetches == 2
+    assert cache.retry_at > time.monotonic()
@@ -0,0 +1,30 @@
+"""
+Login rate limiting keys
+
+Run from backend/:
+    pytest tests/test_login_rate_limit.py
+"""
+from starlette.responses import PlainTextResponse
+from starlette.testclient import TestClient
+from app.middleware import rate_limit as rate_limit_middleware
+from app.middleware.rate_limit import LoginRateLimitMiddleware
+from app.utils.rate_limit import SlidingWindowLimiter, email_limit_key, normalize_email
+
+def test_limiter_key_ignores_case():
+    assert email_limit_key(" Foo@Example.COM ") == email_limit_key("FOO@example.com") == "foo@example.com"
+
+def test_cache_key_keeps_local_part_case():
+    assert normalize_email(" Foo@Example.COM ") == "Foo@example.com"
+
+def test_email_budget_is_shared_across_case_variants(monkeypatch):
+    monkeypatch.setattr(rate_limit_middleware, "login_limiter", SlidingWindowLimiter(
+        prefix="test:login", rules={"email": (3, 60)}
+    ))
+    client = TestClient(LoginRateLimitMiddleware(PlainTextResponse("ok")))
+
+    statuses = [
+        client.post("/api/auth/login", json={"email": email, "password": "x"}).status_code
+        for email in ("foo@x.com", "Foo@x.com", "FOO@x.com", "fOo@X.com")
+    ]
+    assert statuses == [200, 200, 200, 429]
+    assert client.post("/api/auth/login", json={"email": "bar@x.com", "password": "x"}).status_code == 200
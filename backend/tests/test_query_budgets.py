@@ -0,0 +1,97 @@
+"""
+Endpoints declaring a @query_budget stay within it on seeded data
+
+QUERY_BUDGET_ENFORCE is on (see conftest.py), so an endpoint issuing more
+statements than its budget raises QueryBudgetExceeded and the request fails.
+
+Run from backend/:
+    pytest tests/test_query_budgets.py
+"""
+import random
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from benchmarks import seed_data
+
+COUNTS = {"users": 60, "stores": 20, "reviews": 300, "replies": 150, "helpful": 400}
+
+@pytest.fixture(scope="module")
+def client(migrated_db):
+    from app.database import engine
+    from app.main import app
+    from app.models import Review, ReviewHelpful, ReviewReply, Store, User
+
+    rng = random.Random(0)
+    now = datetime(2025, 1, 1)
+    seed_data.insert(engine, User.__table__, seed_data.generate_users(rng, COUNTS["users"], "x", now), COUNTS["users"])
+    seed_data.insert(engine, Store.__table__, seed_data.generate_stores(rng, COUNTS["stores"]), COUNTS["stores"])
+    seed_data.insert(engine, Review.__table__, seed_data.generate_reviews(rng, COUNTS, now), COUNTS["reviews"])
+    seed_data.insert(engine, ReviewReply.__table__, seed_data.generate_replies(rng, COUNTS, now), COUNTS["replies"])
+    seed_data.insert(engine, ReviewHelpful.__table__, seed_data.generate_helpful(rng, COUNTS, now), COUNTS["helpful"])
+
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="module")
+def review_with_replies(client) -> str:
+    """Review with the most replies, some of them nested"""
+    from app.database import SessionLocal
+    from app.models import ReviewReply
+
+    db = SessionLocal()
+    try:
+        review_id, count = db.query(ReviewReply.review_id, func.count(ReviewReply.id)).group_by(
+            ReviewReply.review_id).order_by(func.count(ReviewReply.id).desc()).first()
+    finally:
+        db.close()
+    assert count > 1
+    return review_id
+
+# The most reviewed store (reviews are Zipf-distributed by store rank)
+POPULAR_STORE = seed_data.store_id(0)
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/stores/", {}),
+    ("/api/stores/", {"category": "restaurant", "page_size": 100}),
+    ("/api/stores/", {"latitude": 37.5636, "longitude": 126.9826}),
+    ("/api/stores/nearby", {"latitude": 37.5636, "longitude": 126.9826, "radius": 50}),
+    (f"/api/stores/{POPULAR_STORE}", {"latitude": 37.5636, "longitude": 126.9826}),
+    ("/api/reviews/", {"entity_type": "store", "entity_id": POPULAR_STORE, "page_size": 100}),
+    ("/api/reviews/", {"entity_type": "store", "entity_id": POPULAR_STORE, "sort_by": "helpful"}),
+    ("/api/reviews/", {"entity_type": "store", "entity_id": POPULAR_STORE, "sort_by": "rating_high", "page": 2}),
+    ("/api/reviews/", {"entity_type": "store", "entity_id": "no-such-store"}),
+])
+def test_list_endpoints_within_budget(client, path, params):
+    response = client.get(path, params=params)
+
+    assert response.status_code == 200, response.text
+
+def test_review_detail_within_budget(client, review_with_replies):
+    response = client.get(f"/api/reviews/{review_with_replies}")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["replies"]
+
+def test_replies_within_budget(client, review_with_replies):
+    response = client.get(f"/api/reviews/{review_with_replies}/replies")
+
+    assert response.status_code == 200, response.text
+    assert response.json()
+
+def test_budgets_are_enforced(client, monkeypatch):
+    from app.routers.stores import get_stores
+    from app.utils.query_stats import QueryBudgetExceeded
+
+    monkeypatch.setattr(get_stores, "__query_budget__", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/api/stores/")
+
+def test_server_timing_only_for_admin_callers(client, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    assert "server-timing" not in client.get("/api/stores/").headers
+    assert "server-timing" not in client.get("/api/stores/", headers={"X-Admin-Key": "wrong"}).headers
+    timing = client.get("/api/stores/", headers={"X-Admin-Key": "test-admin-key"}).headers["server-timing"]
+    assert "db;" in timing
@@ -0,0 +1,143 @@
+"""
+Sheets outbox draining against a fake Sheets service
+
+Run from backend/:
+    pytest tests/test_sheets_outbox.py
+"""
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.database import SessionLocal, engine
+from app.models.sheets_outbox import SheetsOutbox, OutboxOperation, OutboxStatus
+from app.services import sheets_outbox
+from app.services.sheets_outbox import SheetsOutboxWorker
+
+class FakeSheets:
+    """Records the users written; `during_send` runs inside each API call"""
+
+    enabled = True
+
+    def __init__(self):
+        self.sent = []
+        self.error = None
+        self.during_send = None
+
+    def ensure_initialized(self) -> bool:
+        return True
+
+    def append_users(self, users: list) -> int:
+        return self._send(users)
+
+    def update_users(self, users: list) -> int:
+        return self._send(users)
+
+    def _send(self, users: list) -> int:
+        if self.during_send is not None:
+            self.during_send()
+        if self.error is not None:
+            raise self.error
+        self.sent.extend(user["id"] for user in users)
+        return len(users)
+
+@pytest.fixture
+def sheets(migrated_db, monkeypatch):
+    fake = FakeSheets()
+    monkeypatch.setattr(sheets_outbox, "sheets_service", fake)
+    yield fake
+    db = SessionLocal()
+    db.query(SheetsOutbox).delete()
+    db.commit()
+    db.close()
+
+def enqueue(user_id: str, operation=OutboxOperation.UPDATE, due: bool = True, **columns) -> int:
+    db = SessionLocal()
+    try:
+        row = SheetsOutbox(
+            user_id=user_id,
+            operation=operation,
+            payload=json.dumps({"id": user_id}),
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=-1 if due else 60),
+            **columns
+        )
+        db.add(row)
+        db.commit()
+        return row.id
+    finally:
+        db.close()
+
+def outbox_rows() -> dict:
+    db = SessionLocal()
+    try:
+        return {row.id: row for row in db.query(SheetsOutbox).all()}
+    finally:
+        db.close()
+
+def test_sends_and_deletes_due_rows(sheets):
+    enqueue("user-1")
+    enqueue("user-2", operation=OutboxOperation.SYNC)
+    assert SheetsOutboxWorker().drain_once() == 2
+    assert sorted(sheets.sent) == ["user-1", "user-2"]
+    assert outbox_rows() == {}
+
+def test_coalesces_later_writes_for_the_same_user(sheets):
+    enqueue("user-1")
+    enqueue("user-1", due=False)
+    enqueue("user-2", due=False)
+    assert SheetsOutboxWorker().drain_once() == 2
+    assert sheets.sent == ["user-1"]
+    assert [row.user_id for row in outbox_rows().values()] == ["user-2"]
+
+def test_sends_without_holding_a_connection_or_transaction(sheets):
+    row_id = enqueue("user-1")
+    seen = {}
+
+    def during_send():
+        seen["checked_out"] = engine.pool.checkedout()
+        # The claim is committed, so another worker sees it and leaves the user alone
+        seen["claimed_until"] = outbox_rows()[row_id].claimed_until
+        seen["other_worker_sent"] = SheetsOutboxWorker().drain_once()
+
+    sheets.during_send = during_send
+    assert SheetsOutboxWorker().drain_once() == 1
+    assert seen["checked_out"] == 0
+    assert seen["claimed_until"] > datetime.utcnow()
+    assert seen["other_worker_sent"] == 0
+    assert sheets.sent == ["user-1"]
+
+def test_failed_rows_are_released_and_rescheduled(sheets):
+    row_id = enqueue("user-1")
+    sheets.error = RuntimeError("quota exceeded")
+    assert SheetsOutboxWorker().drain_once() == 0
+
+    row = outbox_rows()[row_id]
+    assert row.status == OutboxStatus.PENDING
+    assert row.attempts == 1
+    assert row.claimed_until is None
+    assert row.next_attempt_at > datetime.utcnow()
+    assert "quota exceeded" in row.last_error
+
+def test_expired_claims_are_picked_up_again(sheets):
+    # Left behind by a worker that died mid-batch
+    enqueue("user-1", claimed_until=datetime.utcnow() - timedelta(seconds=1))
+    assert SheetsOutboxWorker().drain_once() == 1
+    assert sheets.sent == ["user-1"]
+
+def test_live_claims_are_skipped(sheets):
+    enqueue("user-1", claimed_until=datetime.utcnow() + timedelta(seconds=60))
+    enqueue("user-1")
+    assert SheetsOutboxWorker().drain_once() == 0
+    assert sheets.sent == []
+
+def test_rows_whose_claim_was_lost_are_left_alone(sheets):
+    row_id = enqueue("user-1")
+
+    def during_send():
+        # The lease ran out and another worker re-claimed the row
+        db = SessionLocal()
+        db.get(SheetsOutbox, row_id).claimed_until = datetime.utcnow() + timedelta(seconds=60)
+        db.commit()
+        db.close()
+
+    sheets.during_send = during_send
+    assert SheetsOutboxWorker().drain_once() == 0
+    assert row_id in outbox_rows()
@@ -0,0 +1,62 @@
+"""
+Persisted Sheets row index: upserts and concurrent rebuilds
+
+Run from backend/:
+    pytest tests/test_sheets_row_index.py
+"""
+import threading
+import pytest
+from app.database import SessionLocal
+from app.models.sheets_row_index import SheetsRowIndex
+from app.services.google_sheets import DatabaseRowIndex
+
+@pytest.fixture
+def row_index(migrated_db):
+    yield DatabaseRowIndex()
+    db = SessionLocal()
+    db.query(SheetsRowIndex).delete()
+    db.commit()
+    db.close()
+
+def stored() -> dict:
+    db = SessionLocal()
+    try:
+        return {row.user_id: row.row_number for row in db.query(SheetsRowIndex).all()}
+    finally:
+        db.close()
+
+def test_record_overwrites_existing_entries(row_index):
+    row_index.record({"user-1": 2, "user-2": 3})
+    row_index.record({"user-2": 7, "user-3": 8})
+    assert stored() == {"user-1": 2, "user-2": 7, "user-3": 8}
+
+def test_replace_updates_and_drops_missing_users(row_index):
+    row_index.record({"user-1": 2, "user-2": 3, "user-gone": 4})
+    row_index.replace({"user-1": 2, "user-2": 5, "user-3": 6})
+    assert stored() == {"user-1": 2, "user-2": 5, "user-3": 6}
+
+def test_replace_writes_large_sheets_in_chunks(row_index):
+    rows = {f"user-{i}": i + 2 for i in range(DatabaseRowIndex.UPSERT_CHUNK_SIZE * 2 + 1)}
+    row_index.replace(rows)
+    assert stored() == rows
+
+def test_concurrent_rebuilds_do_not_conflict(row_index):
+    rows = {f"user-{i}": i + 2 for i in range(500)}
+    errors = []
+
+    def rebuild():
+        try:
+            for _ in range(5):
+                row_index.replace(rows)
+                row_index.record({"user-0": 2})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=rebuild) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert stored() == rows
@@ -1,120 +1,223 @@
 -- OMNIPASS Database Schema
 -- PostgreSQL 14+
+--
+-- Generated from the Alembic migrations in backend/migrations; edit those, not this file.
+-- Regenerate from backend/:
+--   DATABASE_URL=postgresql://localhost/omnipass alembic upgrade head --sql > ../database/schema.sql
+-- Existing databases are upgraded with `alembic upgrade head`.
 
--- Create extensions
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
-
--- Users table
-CREATE TABLE IF NOT EXISTS users (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    email VARCHAR(255) UNIQUE NOT NULL,
-    hashed_password VARCHAR(255),  -- Nullable for OAuth users
-    name VARCHAR(100) NOT NULL,
-    country VARCHAR(100) NOT NULL,
-    phone VARCHAR(20),
-    preferred_language VARCHAR(10) DEFAULT 'en',
-    customer_id VARCHAR(50) UNIQUE,
-    passport_number VARCHAR(50),
-    date_of_birth VARCHAR(20),
-    nationality VARCHAR(100),
-    passport_expiry VARCHAR(20),
-    provider VARCHAR(20) DEFAULT 'email',  -- email, google, facebook, kakao
-    provider_id VARCHAR(255),  -- OAuth provider's user ID
-    profile_picture TEXT,  -- Profile picture URL from OAuth
-    last_login TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+BEGIN;
+
+CREATE TABLE alembic_version (
+    version_num VARCHAR(32) NOT NULL, 
+    CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num)
 );
 
--- Point balances table
-CREATE TABLE IF NOT EXISTS point_balances (
-    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
-    balance INTEGER DEFAULT 0 NOT NULL CHECK (balance >= 0),
-    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+-- Running upgrade  -> 0001
+
+CREATE TABLE users (
+    id VARCHAR NOT NULL, 
+    email VARCHAR NOT NULL, 
+    hashed_password VARCHAR, 
+    name VARCHAR NOT NULL, 
+    country VARCHAR NOT NULL, 
+    phone VARCHAR, 
+    preferred_language VARCHAR, 
+    customer_id VARCHAR, 
+    passport_number VARCHAR, 
+    date_of_birth VARCHAR, 
+    nationality VARCHAR, 
+    passport_expiry VARCHAR, 
+    provider VARCHAR, 
+    provider_id VARCHAR, 
+    profile_picture VARCHAR, 
+    last_login TIMESTAMP WITHOUT TIME ZONE, 
+    created_at TIMESTAMP WITHOUT TIME ZONE, 
+    updated_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (id)
 );
 
--- Point transactions table
-CREATE TABLE IF NOT EXISTS point_transactions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    amount INTEGER NOT NULL,
-    type VARCHAR(20) NOT NULL CHECK (type IN ('earn', 'spend', 'charge')),
-    source VARCHAR(50) NOT NULL CHECK (source IN ('purchase', 'mission', 'card_charge', 'refund')),
-    description TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_customer_id ON users (customer_id);
+
+CREATE TABLE point_balances (
+    user_id VARCHAR NOT NULL, 
+    balance INTEGER NOT NULL, 
+    last_updated TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (user_id), 
+    CONSTRAINT check_balance_non_negative CHECK (balance >= 0), 
+    FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TYPE transactiontype AS ENUM ('EARN', 'SPEND', 'CHARGE');
+
+CREATE TYPE transactionsource AS ENUM ('PURCHASE', 'MISSION', 'CARD_CHARGE', 'REFUND');
+
+CREATE TABLE point_transactions (
+    id VARCHAR NOT NULL, 
+    user_id VARCHAR NOT NULL, 
+    amount INTEGER NOT NULL, 
+    type transactiontype NOT NULL, 
+    source transactionsource NOT NULL, 
+    description VARCHAR, 
+    created_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (id), 
+    FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_point_transactions_user_id ON point_transactions (user_id);
+
+CREATE INDEX IF NOT EXISTS idx_point_transactions_created_at ON point_transactions (created_at DESC);
+
+CREATE TYPE storecategory AS ENUM ('DUTY_FREE', 'RESTAURANT', 'RETAIL', 'TRANSPORT', 'CULTURE');
+
+CREATE TABLE stores (
+    id VARCHAR NOT NULL, 
+    name VARCHAR NOT NULL, 
+    category storecategory NOT NULL, 
+    description VARCHAR, 
+    address VARCHAR NOT NULL, 
+    latitude FLOAT NOT NULL, 
+    longitude FLOAT NOT NULL, 
+    point_rate FLOAT, 
+    images TEXT, 
+    opening_hours VARCHAR, 
+    contact VARCHAR, 
+    PRIMARY KEY (id)
 );
 
--- Stores table
-CREATE TABLE IF NOT EXISTS stores (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    name VARCHAR(255) NOT NULL,
-    category VARCHAR(50) NOT NULL CHECK (category IN ('duty_free', 'restaurant', 'retail', 'transport', 'culture')),
-    description TEXT,
-    address TEXT NOT NULL,
-    latitude DOUBLE PRECISION NOT NULL,
-    longitude DOUBLE PRECISION NOT NULL,
-    point_rate DOUBLE PRECISION DEFAULT 1.0,
-    images TEXT[],
-    opening_hours TEXT,
-    contact VARCHAR(100)
+CREATE INDEX IF NOT EXISTS idx_stores_category ON stores (category);
+
+CREATE INDEX IF NOT EXISTS idx_stores_location ON stores (latitude, longitude);
+
+CREATE TYPE missiontype AS ENUM ('DAILY', 'WEEKLY', 'SPECIAL');
+
+CREATE TABLE eco_missions (
+    id VARCHAR NOT NULL, 
+    title VARCHAR NOT NULL, 
+    description TEXT NOT NULL, 
+    points INTEGER NOT NULL, 
+    type missiontype NOT NULL, 
+    requirements TEXT, 
+    expires_at TIMESTAMP WITHOUT TIME ZONE, 
+    created_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (id)
 );
 
--- Eco missions table
-CREATE TABLE IF NOT EXISTS eco_missions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    title VARCHAR(255) NOT NULL,
-    description TEXT NOT NULL,
-    points INTEGER NOT NULL,
-    type VARCHAR(20) NOT NULL CHECK (type IN ('daily', 'weekly', 'special')),
-    requirements TEXT[],
-    expires_at TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+CREATE TYPE missionstatus AS ENUM ('ACTIVE', 'COMPLETED', 'EXPIRED');
+
+CREATE TABLE user_missions (
+    id VARCHAR NOT NULL, 
+    user_id VARCHAR NOT NULL, 
+    mission_id VARCHAR NOT NULL, 
+    status missionstatus NOT NULL, 
+    progress INTEGER, 
+    completed_at TIMESTAMP WITHOUT TIME ZONE, 
+    created_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (id), 
+    FOREIGN KEY(mission_id) REFERENCES eco_missions (id) ON DELETE CASCADE, 
+    FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE, 
+    CONSTRAINT unique_user_mission UNIQUE (user_id, mission_id)
 );
 
--- User missions table
-CREATE TABLE IF NOT EXISTS user_missions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    mission_id UUID NOT NULL REFERENCES eco_missions(id) ON DELETE CASCADE,
-    status VARCHAR(20) DEFAULT 'active' CHECK (status IN ('active', 'completed', 'expired')),
-    progress INTEGER DEFAULT 0,
-    completed_at TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(user_id, mission_id)
+CREATE INDEX IF NOT EXISTS idx_user_missions_user_id ON user_missions (user_id);
+
+CREATE INDEX IF NOT EXISTS idx_user_missions_status ON user_missions (status);
+
+CREATE TYPE entitytype AS ENUM ('MEDICAL_FACILITY', 'SDM_PACKAGE', 'STORE');
+
+CREATE TABLE reviews (
+    id VARCHAR NOT NULL, 
+    user_id VARCHAR NOT NULL, 
+    entity_type entitytype NOT NULL, 
+    entity_id VARCHAR NOT NULL, 
+    rating INTEGER NOT NULL, 
+    comment TEXT NOT NULL, 
+    created_at TIMESTAMP WITHOUT TIME ZONE, 
+    updated_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (id), 
+    CONSTRAINT check_rating_range CHECK (rating >= 1 AND rating <= 5), 
+    FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE, 
+    CONSTRAINT unique_user_entity_review UNIQUE (user_id, entity_type, entity_id)
 );
 
--- Payment methods table
-CREATE TABLE IF NOT EXISTS payment_methods (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    type VARCHAR(20) NOT NULL CHECK (type IN ('credit_card', 'debit_card')),
-    last4 VARCHAR(4) NOT NULL,
-    brand VARCHAR(50) NOT NULL,
-    expiry_month INTEGER NOT NULL,
-    expiry_year INTEGER NOT NULL,
-    is_default BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+CREATE INDEX IF NOT EXISTS ix_reviews_entity_id ON reviews (entity_id);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_entity ON reviews (entity_type, entity_id);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_user_id ON reviews (user_id);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_created_at ON reviews (created_at DESC);
+
+CREATE TABLE review_replies (
+    id VARCHAR NOT NULL, 
+    review_id VARCHAR NOT NULL, 
+    user_id VARCHAR NOT NULL, 
+    parent_reply_id VARCHAR, 
+    comment TEXT NOT NULL, 
+    created_at TIMESTAMP WITHOUT TIME ZONE, 
+    updated_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (id), 
+    FOREIGN KEY(parent_reply_id) REFERENCES review_replies (id) ON DELETE CASCADE, 
+    FOREIGN KEY(review_id) REFERENCES reviews (id) ON DELETE CASCADE, 
+    FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
--- Create indexes for better query performance
-CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_point_transactions_user_id ON point_transactions(user_id);
-CREATE INDEX idx_point_transactions_created_at ON point_transactions(created_at DESC);
-CREATE INDEX idx_stores_category ON stores(category);
-CREATE INDEX idx_stores_location ON stores(latitude, longitude);
-CREATE INDEX idx_user_missions_user_id ON user_missions(user_id);
-CREATE INDEX idx_user_missions_status ON user_missions(status);
+CREATE INDEX IF NOT EXISTS idx_review_replies_review_id ON review_replies (review_id);
+
+CREATE INDEX IF NOT EXISTS idx_review_replies_parent ON review_replies (parent_reply_id);
+
+CREATE TABLE review_helpful (
+    id VARCHAR NOT NULL, 
+    review_id VARCHAR NOT NULL, 
+    user_id VARCHAR NOT NULL, 
+    created_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (id), 
+    FOREIGN KEY(review_id) REFERENCES reviews (id) ON DELETE CASCADE, 
+    FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE, 
+    CONSTRAINT unique_user_review_helpful UNIQUE (user_id, review_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_review_helpful_review_id ON review_helpful (review_id);
+
+CREATE TYPE outboxoperation AS ENUM ('SYNC', 'UPDATE');
+
+CREATE TYPE outboxstatus AS ENUM ('PENDING', 'DEAD');
+
+CREATE TABLE sheets_outbox (
+    id SERIAL NOT NULL, 
+    user_id VARCHAR NOT NULL, 
+    operation outboxoperation NOT NULL, 
+    payload TEXT NOT NULL, 
+    status outboxstatus NOT NULL, 
+    attempts INTEGER NOT NULL, 
+    next_attempt_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, 
+    last_error TEXT, 
+    created_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_sheets_outbox_user_id ON sheets_outbox (user_id);
+
+CREATE INDEX IF NOT EXISTS ix_sheets_outbox_status_next_attempt ON sheets_outbox (status, next_attempt_at);
+
+CREATE TABLE sheets_row_index (
+    user_id VARCHAR NOT NULL, 
+    row_number INTEGER NOT NULL, 
+    updated_at TIMESTAMP WITHOUT TIME ZONE, 
+    PRIMARY KEY (user_id)
+);
 
--- Create trigger to automatically update point balance
 CREATE OR REPLACE FUNCTION update_point_balance()
 RETURNS TRIGGER AS $$
 BEGIN
-    IF NEW.type = 'earn' OR NEW.type = 'charge' THEN
+    IF NEW.type = 'EARN' OR NEW.type = 'CHARGE' THEN
         UPDATE point_balances
         SET balance = balance + NEW.amount,
             last_updated = CURRENT_TIMESTAMP
         WHERE user_id = NEW.user_id;
-    ELSIF NEW.type = 'spend' THEN
+    ELSIF NEW.type = 'SPEND' THEN
         UPDATE point_balances
         SET balance = balance - NEW.amount,
             last_updated = CURRENT_TIMESTAMP
@@ -124,68 +227,28 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trigger_update_point_balance ON point_transactions;
 CREATE TRIGGER trigger_update_point_balance
 AFTER INSERT ON point_transactions
 FOR EACH ROW
 EXECUTE FUNCTION update_point_balance();
 
--- Create trigger to initialize point balance for new users
 CREATE OR REPLACE FUNCTION init_point_balance()
 RETURNS TRIGGER AS $$
 BEGIN
     INSERT INTO point_balances (user_id, balance)
-    VALUES (NEW.id, 0);
+    VALUES (NEW.id, 0)
+    ON CONFLICT (user_id) DO NOTHING;
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trigger_init_point_balance ON users;
 CREATE TRIGGER trigger_init_point_balance
 AFTER INSERT ON users
 FOR EACH ROW
 EXECUTE FUNCTION init_point_balance();
 
--- Reviews table - Polymorphic association pattern
-CREATE TABLE IF NOT EXISTS reviews (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    entity_type VARCHAR(50) NOT NULL CHECK (entity_type IN ('medical_facility', 'sdm_package', 'store')),
-    entity_id VARCHAR(255) NOT NULL,
-    rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
-    comment TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    CONSTRAINT unique_user_entity UNIQUE (user_id, entity_type, entity_id)
-);
-
--- Review replies table - For nested comments
-CREATE TABLE IF NOT EXISTS review_replies (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    review_id UUID NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
-    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    parent_reply_id UUID REFERENCES review_replies(id) ON DELETE CASCADE,
-    comment TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- Review helpful votes table
-CREATE TABLE IF NOT EXISTS review_helpful (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    review_id UUID NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
-    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    CONSTRAINT unique_user_review_helpful UNIQUE (user_id, review_id)
-);
-
--- Indexes for reviews performance
-CREATE INDEX idx_reviews_entity ON reviews(entity_type, entity_id);
-CREATE INDEX idx_reviews_user_id ON reviews(user_id);
-CREATE INDEX idx_reviews_created_at ON reviews(created_at DESC);
-CREATE INDEX idx_review_replies_review_id ON review_replies(review_id);
-CREATE INDEX idx_review_replies_parent ON review_replies(parent_reply_id);
-CREATE INDEX idx_review_helpful_review_id ON review_helpful(review_id);
-
--- Trigger to update updated_at timestamp for reviews
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
 BEGIN
@@ -194,12 +257,25 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trigger_reviews_updated_at ON reviews;
 CREATE TRIGGER trigger_reviews_updated_at
 BEFORE UPDATE ON reviews
 FOR EACH ROW
 EXECUTE FUNCTION update_updated_at_column();
 
+DROP TRIGGER IF EXISTS trigger_review_replies_updated_at ON review_replies;
 CREATE TRIGGER trigger_review_replies_updated_at
 BEFORE UPDATE ON review_replies
 FOR EACH ROW
 EXECUTE FUNCTION update_updated_at_column();
+
+INSERT INTO alembic_version (version_num) VALUES ('0001') RETURNING alembic_version.version_num;
+
+-- Running upgrade 0001 -> 0002
+
+ALTER TABLE sheets_outbox ADD COLUMN claimed_until TIMESTAMP WITHOUT TIME ZONE;
+
+UPDATE alembic_version SET version_num='0002' WHERE alembic_version.version_num = '0001';
+
+COMMIT;
+
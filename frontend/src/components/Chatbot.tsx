@@ -1,6 +1,7 @@
 'use client';
 
 import { useState, useRef, useEffect } from 'react';
+import axios from 'axios';
 import { chatbotApi } from '@/lib/api/chatbot';
 
 interface Message {
@@ -31,7 +32,7 @@ export default function Chatbot() {
   const [messages, setMessages] = useState<Message[]>([]);
   const [inputText, setInputText] = useState('');
   const [isTyping, setIsTyping] = useState(false);
-  const [conversationHistory, setConversationHistory] = useState<Array<{ role: 'user' | 'assistant'; content: string }>>([]);
+  const [conversationId, setConversationId] = useState<string | undefined>(undefined);
   const [currentLanguage, setCurrentLanguage] = useState<string>('en');
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
@@ -78,28 +79,14 @@ export default function Chatbot() {
     setIsTyping(true);
 
     try {
-      // Convert messages to conversation history format for API
-      const apiHistory = conversationHistory.map(msg => ({
-        role: msg.role,
-        content: msg.content,
-      }));
-
-      // Add current user message to history
-      apiHistory.push({
-        role: 'user',
-        content: userMessageText,
-      });
-
-      // Call Claude API
+      // The server keeps the conversation history; send only the new message
       const response = await chatbotApi.chat({
         message: userMessageText,
         language: currentLanguage,
-        conversation_history: apiHistory,
+        conversation_id: conversationId,
       });
 
-      // Update conversation history
-      const updatedHistory = response.conversation_history || [];
-      setConversationHistory(updatedHistory);
+      setConversationId(response.conversation_id);
 
       // Add bot response to messages
       const botMessage: Message = {
@@ -111,6 +98,10 @@ export default function Chatbot() {
       setMessages((prev) => [...prev, botMessage]);
     } catch (error) {
       console.error('Chatbot API error:', error);
+      // The conversation expired on the server; the next message starts a new one
+      if (axios.isAxiosError(error) && error.response?.status === 404) {
+        setConversationId(undefined);
+      }
       const errorMessage: Message = {
         id: (Date.now() + 1).toString(),
         text: '죄송합니다. 응답을 받는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.\n\nSorry, there was an error getting a response. Please try again later.',
@@ -3,18 +3,13 @@ import apiClient from './client';
 export interface ChatRequest {
   message: string;
   language?: string;
-  conversation_history?: Array<{
-    role: 'user' | 'assistant';
-    content: string;
-  }>;
+  // 서버에 저장된 대화 이어가기 (없으면 새 대화)
+  conversation_id?: string;
 }
 
 export interface ChatResponse {
   response: string;
-  conversation_history: Array<{
-    role: 'user' | 'assistant';
-    content: string;
-  }>;
+  conversation_id: string;
 }
 
 export interface TourismRequest {